@@ -1,9 +1,49 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 
 from exceptions import setup_exception_handlers
+from integrations.process_pool import shutdown_process_pool
 from middleware import setup_middleware
 from routes import setup_routes
+from services.few_shot_example_store import FewShotExampleStore
+from services.letter_renderer import prepare_letters_dir
+from services.recommendation_service import RETRIEVAL_QUERIES
+from services.vector_store_service import VectorStoreService
 from settings import settings
+from utils.tokens import get_tokenizer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Create process-wide resources once and release them on shutdown.
+    """
+
+    prepare_letters_dir()
+    app.state.vector_store_service = VectorStoreService()
+    # Runs in the background: a slow embeddings model must not delay the
+    # startup, queries not warmed yet are embedded on first use.
+    warm_up = asyncio.create_task(
+        app.state.vector_store_service.warm_query_embeddings(RETRIEVAL_QUERIES)
+    )
+    app.state.few_shot_example_store = FewShotExampleStore(
+        examples_dir=settings.few_shot.examples_dir,
+        check_interval_seconds=settings.few_shot.check_interval_seconds,
+        embeddings=app.state.vector_store_service.embeddings,
+    )
+    await app.state.few_shot_example_store.reload()
+    await asyncio.to_thread(get_tokenizer)
+    try:
+        yield
+    finally:
+        warm_up.cancel()
+        with suppress(asyncio.CancelledError):
+            await warm_up
+        await app.state.vector_store_service.aclose()
+        shutdown_process_pool()
 
 
 def build_app() -> FastAPI:
@@ -13,6 +53,7 @@ def build_app() -> FastAPI:
         "title": settings.project.title,
         "description": settings.project.description,
         "version": settings.project.release_version,
+        "lifespan": lifespan,
     }
     app = FastAPI(**app_params)
 
@@ -221,3 +221,23 @@ class BaseApiException(Exception):
             args = args[1:]
 
         super().__init__(*args, **kwargs)
+
+
+class ResumeFileNotFound(Exception):
+    """Файл резюме не найден."""
+
+
+class UnsupportedResume(Exception):
+    """Неподдерживаемый тип файла резюме."""
+
+
+class ResumeTooLarge(Exception):
+    """Файл резюме превышает допустимый размер."""
+
+
+class ResumeExtractionTimeout(Exception):
+    """Извлечение текста резюме не уложилось в отведенное время."""
+
+
+class EmbeddingModelNotFound(Exception):
+    """Файлы локальной модели эмбеддингов не найдены."""
@@ -0,0 +1,28 @@
+from threading import Lock
+
+
+class CacheMetrics:
+    """Counters of cache hits and misses."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hits: int = 0, misses: int = 0) -> None:
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+embedding_cache_metrics = CacheMetrics()
+llm_cache_metrics = CacheMetrics()
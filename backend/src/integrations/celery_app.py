@@ -0,0 +1,18 @@
+from celery import Celery
+
+from settings import settings
+
+celery_app = Celery(
+    "text-generation-assistant",
+    broker=settings.worker.broker_url,
+    backend=settings.worker.result_backend,
+    include=["tasks.resume"],
+)
+celery_app.conf.update(
+    task_always_eager=settings.worker.task_always_eager,
+    task_store_eager_result=True,
+    task_track_started=True,
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    result_expires=settings.worker.result_expires_seconds,
+)
@@ -0,0 +1,107 @@
+import time
+from threading import Lock
+
+from sqlalchemy import Engine, event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+from sqlalchemy.util.queue import AsyncAdaptedQueue
+
+
+class PoolMetrics:
+    """Counters of connection pool checkouts and their wait time."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def record_wait(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool: AsyncAdaptedQueuePool) -> dict:
+        with self._lock:
+            return {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "checked_in": pool.checkedin(),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": (
+                    round(self.wait_seconds_total * 1000 / self.checkouts, 3)
+                    if self.checkouts
+                    else 0.0
+                ),
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class _TimedAsyncAdaptedQueue(AsyncAdaptedQueue):
+    """
+    Queue of idle pool connections recording how long checkouts wait on it.
+
+    Only the wait for an idle connection is timed; opening a new connection
+    happens outside of the queue and isn't counted.
+    """
+
+    def get(self, block: bool = True, timeout: float | None = None):
+        started = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - started)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool recording checkouts and their wait into ``pool_metrics``."""
+
+    _queue_class = _TimedAsyncAdaptedQueue
+
+    def connect(self) -> PoolProxiedConnection:
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_metrics.record_timeout()
+            raise
+
+        pool_metrics.record_checkout()
+
+        return connection
+
+
+class StatementCounter:
+    """
+    Context manager counting SQL statements sent through an engine.
+
+    Every cursor execution is one database round-trip, so the count shows
+    how many round-trips a block of code makes.
+    """
+
+    def __init__(self, engine: AsyncEngine | Engine) -> None:
+        self.engine = getattr(engine, "sync_engine", engine)
+        self.count = 0
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+    def __enter__(self) -> "StatementCounter":
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
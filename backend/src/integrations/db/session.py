@@ -2,9 +2,34 @@ from typing import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
+from integrations.db.metrics import InstrumentedAsyncQueuePool
 from settings import settings
 
-engine = create_async_engine(settings.database_url, echo=True, future=True)
+
+def get_engine_options() -> dict:
+    """
+    Engine options shared by every engine of the application.
+    """
+
+    return {
+        "echo": settings.database.echo,
+        "future": True,
+        "pool_pre_ping": settings.database.pool_pre_ping,
+        "pool_recycle": settings.database.pool_recycle_seconds,
+        "connect_args": {
+            "prepared_statement_cache_size": settings.database.statement_cache_size
+        },
+    }
+
+
+engine = create_async_engine(
+    settings.database_url,
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_size=settings.database.pool_size,
+    max_overflow=settings.database.max_overflow,
+    pool_timeout=settings.database.pool_timeout_seconds,
+    **get_engine_options(),
+)
 
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
@@ -17,3 +42,12 @@ async def get_session() -> AsyncGenerator:
         except Exception:
             await session.rollback()
             raise
+
+
+def get_session_factory() -> async_sessionmaker:
+    """
+    Session factory for code that needs several independent sessions,
+    e.g. to run queries concurrently.
+    """
+
+    return async_session
@@ -0,0 +1,196 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+
+from langchain_core.embeddings import Embeddings
+
+from integrations.cache_metrics import CacheMetrics, embedding_cache_metrics
+from logger import logger
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+class SQLiteEmbeddingStore:
+    """
+    Persistent content-addressed embedding store with LRU eviction.
+
+    Vectors are keyed by (model name, SHA-256 of the normalized text) and kept
+    as float32 blobs. When the number of rows exceeds ``max_entries`` the least
+    recently accessed rows are evicted.
+    """
+
+    def __init__(self, path: str, max_entries: int) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_embedding_cache_accessed_at "
+            "ON embedding_cache (accessed_at)"
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(_normalize(text).encode("utf-8")).hexdigest()
+
+    def get_many(self, model: str, hashes: list[str]) -> dict[str, list[float]]:
+        """
+        Fetch cached vectors and mark them as recently used.
+
+        :param model: Embedding model name
+        :param hashes: Text hashes to look up
+        :return: Mapping of found hashes to vectors
+        """
+
+        if not hashes:
+            return {}
+
+        unique = list(dict.fromkeys(hashes))
+        placeholders = ",".join("?" * len(unique))
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT text_hash, vector FROM embedding_cache "
+                f"WHERE model = ? AND text_hash IN ({placeholders})",
+                [model, *unique],
+            ).fetchall()
+            if rows:
+                now = time.time()
+                self._connection.executemany(
+                    "UPDATE embedding_cache SET accessed_at = ? "
+                    "WHERE model = ? AND text_hash = ?",
+                    [(now, model, text_hash) for text_hash, _ in rows],
+                )
+                self._connection.commit()
+
+        return {text_hash: array("f", blob).tolist() for text_hash, blob in rows}
+
+    def set_many(self, model: str, vectors: dict[str, list[float]]) -> None:
+        """
+        Store vectors and evict the least recently used rows over the limit.
+
+        :param model: Embedding model name
+        :param vectors: Mapping of text hashes to vectors
+        :return:
+        """
+
+        if not vectors:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embedding_cache "
+                "(model, text_hash, vector, accessed_at) VALUES (?, ?, ?, ?)",
+                [
+                    (model, text_hash, array("f", vector).tobytes(), now)
+                    for text_hash, vector in vectors.items()
+                ],
+            )
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM embedding_cache"
+            ).fetchone()
+            if count > self.max_entries:
+                self._connection.execute(
+                    "DELETE FROM embedding_cache WHERE rowid IN ("
+                    "SELECT rowid FROM embedding_cache "
+                    "ORDER BY accessed_at LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self._connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that only sends cache misses to the underlying model.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        store: SQLiteEmbeddingStore,
+        model: str,
+        metrics: CacheMetrics = embedding_cache_metrics,
+    ) -> None:
+        self.embeddings = embeddings
+        self.store = store
+        self.model = model
+        self.metrics = metrics
+
+    def _lookup(self, texts: list[str]) -> tuple[list[str], dict[str, list[float]]]:
+        hashes = [self.store.text_hash(text) for text in texts]
+        cached = self.store.get_many(self.model, hashes)
+
+        return hashes, cached
+
+    def _collect(
+        self, texts: list[str], hashes: list[str], cached: dict[str, list[float]]
+    ) -> tuple[list[str], list[str]]:
+        # Texts repeated within the batch are embedded once.
+        missing: dict[str, str] = {}
+        for text, text_hash in zip(texts, hashes):
+            if text_hash not in cached and text_hash not in missing:
+                missing[text_hash] = text
+
+        hits = len(texts) - len(missing)
+        self.metrics.record(hits=hits, misses=len(missing))
+        logger.debug("Embedding cache lookup.", hits=hits, misses=len(missing))
+
+        return list(missing), list(missing.values())
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        hashes, cached = self._lookup(texts)
+        missing_hashes, missing_texts = self._collect(texts, hashes, cached)
+
+        if missing_texts:
+            fresh = dict(
+                zip(missing_hashes, self.embeddings.embed_documents(missing_texts))
+            )
+            self.store.set_many(self.model, fresh)
+            cached.update(fresh)
+
+        return [cached[text_hash] for text_hash in hashes]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        hashes, cached = await asyncio.to_thread(self._lookup, texts)
+        missing_hashes, missing_texts = self._collect(texts, hashes, cached)
+
+        if missing_texts:
+            fresh = dict(
+                zip(
+                    missing_hashes,
+                    await self.embeddings.aembed_documents(missing_texts),
+                )
+            )
+            await asyncio.to_thread(self.store.set_many, self.model, fresh)
+            cached.update(fresh)
+
+        return [cached[text_hash] for text_hash in hashes]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return await self.embeddings.aembed_query(text)
@@ -0,0 +1,193 @@
+import re
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import httpx
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+
+from exceptions import EmbeddingModelNotFound
+from settings import VectorStore
+from utils.bm25 import tokenize
+
+ONNX_MODEL_NAME = "all-MiniLM-L6-v2"
+# Files chromadb needs in the model directory, it downloads them if any is missing.
+ONNX_MODEL_FILES = (
+    "config.json",
+    "model.onnx",
+    "special_tokens_map.json",
+    "tokenizer_config.json",
+    "tokenizer.json",
+    "vocab.txt",
+)
+DEFAULT_OPENAI_MODEL = "text-embedding-ada-002"
+# Chroma collection of langchain's Chroma store, which held every resume
+# before collections were named after the embeddings model.
+LEGACY_COLLECTION_NAME = "langchain"
+# Chroma collection names are 3-63 characters of [a-zA-Z0-9._-].
+_COLLECTION_NAME_PATTERN = re.compile(r"[^a-zA-Z0-9._-]+")
+
+
+@lru_cache(maxsize=65536)
+def _hash_feature(feature: str) -> int:
+    return zlib.crc32(feature.encode("utf-8"))
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Deterministic feature-hashing embeddings computed locally with NumPy.
+
+    Word unigrams and bigrams are hashed into ``dimensions`` signed buckets,
+    weighted by sublinear term frequency and L2-normalized, a batch at a time.
+    Needs no model files or network. Similarity is lexical, so it suits tests,
+    offline development and latency-bound deployments rather than paraphrases.
+    """
+
+    def __init__(self, dimensions: int = 1024, batch_size: int = 256) -> None:
+        self.dimensions = dimensions
+        self.batch_size = batch_size
+
+    @staticmethod
+    def _get_hashes(text: str) -> list[int]:
+        tokens = tokenize(text)
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        return [_hash_feature(feature) for feature in features]
+
+    def _embed_batch(self, texts: list[str]) -> np.ndarray:
+        rows: list[int] = []
+        hashes: list[int] = []
+        for row, text in enumerate(texts):
+            text_hashes = self._get_hashes(text)
+            hashes.extend(text_hashes)
+            rows.extend([row] * len(text_hashes))
+
+        hash_array = np.asarray(hashes, dtype=np.uint32)
+        buckets = np.asarray(rows, dtype=np.int64) * self.dimensions + (
+            hash_array % self.dimensions
+        )
+        # The top bit signs the feature, so collisions cancel out on average.
+        signs = np.where(hash_array >> 31, -1.0, 1.0)
+        counts = np.bincount(
+            buckets, weights=signs, minlength=len(texts) * self.dimensions
+        ).reshape(len(texts), self.dimensions)
+
+        vectors = np.sign(counts) * np.log1p(np.abs(counts))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return (vectors / np.where(norms == 0, 1.0, norms)).astype(np.float32)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+
+        return np.concatenate(
+            [
+                self._embed_batch(texts[start : start + self.batch_size])
+                for start in range(0, len(texts), self.batch_size)
+            ]
+        ).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+
+class OnnxEmbeddings(Embeddings):
+    """
+    all-MiniLM-L6-v2 sentence embeddings run on CPU with ONNX Runtime.
+
+    Uses the model of chromadb, batched by chromadb. The model files are read
+    from ``model_dir`` when given and never downloaded, otherwise chromadb
+    downloads them once to its cache directory on first use.
+
+    :raises EmbeddingModelNotFound: A model file is missing from ``model_dir``
+    """
+
+    def __init__(self, model_dir: Optional[str] = None) -> None:
+        from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+        self.model = ONNXMiniLM_L6_V2(preferred_providers=["CPUExecutionProvider"])
+        if model_dir is not None:
+            path = Path(model_dir)
+            missing = [name for name in ONNX_MODEL_FILES if not (path / name).is_file()]
+            if missing:
+                raise EmbeddingModelNotFound(
+                    f"ONNX model {ONNX_MODEL_NAME} not found in {path}, "
+                    f"missing: {', '.join(missing)}."
+                )
+            self.model.DOWNLOAD_PATH = path.parent
+            self.model.EXTRACTED_FOLDER_NAME = path.name
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+
+        return np.asarray(self.model(texts), dtype=np.float32).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+
+def get_embedding_model_id(config: VectorStore) -> str:
+    """
+    Identity of the configured embeddings model.
+
+    Vectors of different models are never comparable, so the identity keys
+    the embedding cache and names the Chroma collection.
+    """
+
+    if config.embedding_provider == "hashing":
+        return f"hashing-{config.hashing_dimensions}"
+    if config.embedding_provider == "onnx":
+        return f"onnx-{ONNX_MODEL_NAME}"
+
+    return config.embedding_model
+
+
+def get_collection_name(config: VectorStore) -> str:
+    """
+    Chroma collection of the configured model, unless set explicitly.
+
+    The default OpenAI model keeps the legacy collection, so resumes indexed
+    before per-model collections stay searchable.
+    """
+
+    if config.collection_name:
+        return config.collection_name
+    if (
+        config.embedding_provider == "openai"
+        and config.embedding_model == DEFAULT_OPENAI_MODEL
+    ):
+        return LEGACY_COLLECTION_NAME
+
+    model_id = _COLLECTION_NAME_PATTERN.sub("-", get_embedding_model_id(config))
+    return f"resume_chunks_{model_id}"[:63].rstrip("._-")
+
+
+def create_embeddings(
+    config: VectorStore,
+    http_client: Optional[httpx.Client] = None,
+    http_async_client: Optional[httpx.AsyncClient] = None,
+) -> Embeddings:
+    """
+    Embeddings of the configured provider, without caching.
+
+    :param config: Vector store settings
+    :param http_client: Pooled client for remote providers
+    :param http_async_client: Pooled async client for remote providers
+    """
+
+    if config.embedding_provider == "hashing":
+        return HashingEmbeddings(
+            dimensions=config.hashing_dimensions,
+            batch_size=config.embedding_batch_size,
+        )
+    if config.embedding_provider == "onnx":
+        return OnnxEmbeddings(model_dir=config.onnx_model_dir)
+
+    return OpenAIEmbeddings(
+        model=config.embedding_model,
+        http_client=http_client,
+        http_async_client=http_async_client,
+    )
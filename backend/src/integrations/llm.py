@@ -0,0 +1,9 @@
+from baml_client.async_client import BamlAsyncClient, b
+
+
+def get_llm_client() -> BamlAsyncClient:
+    """
+    Dependency returning the BAML client, overridable with a fake in tests.
+    """
+
+    return b
@@ -0,0 +1,236 @@
+import asyncio
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, Type, TypeVar
+
+from baml_client.inlinedbaml import get_baml_files
+from pydantic import BaseModel, ValidationError
+
+from integrations.cache_metrics import CacheMetrics, llm_cache_metrics
+from logger import logger
+from settings import settings
+
+T = TypeVar("T", bound=BaseModel)
+
+# Top-level BAML declarations; blocks end with a closing brace at line start.
+_DECLARATION_PATTERN = re.compile(
+    r"^(?:class|enum|function|client<llm>|retry_policy)\s+(\w+)\b.*?^}"
+    r'|^template_string\s+(\w+)\b.*?"#\s*$',
+    re.MULTILINE | re.DOTALL,
+)
+_IDENTIFIER_PATTERN = re.compile(r"\b\w+\b")
+_CLIENT_PATTERN = re.compile(r"^\s*client\s+\"?([\w./-]+)\"?", re.MULTILINE)
+
+
+@lru_cache
+def get_prompt_fingerprint(function_name: str) -> tuple[str, str]:
+    """
+    Hash of the sources a function's prompt is rendered from.
+
+    Besides the function block, the prompt depends on the classes and enums
+    ``ctx.output_format`` renders, template strings and the client with its
+    retry policy and fallback clients. Those are collected by following the
+    names each declaration references, so edits to unrelated functions keep
+    cached results valid.
+
+    :param function_name: BAML function name
+    :return: Pair of the client name and the sources hash
+    """
+
+    declarations = {
+        match.group(1) or match.group(2): match.group(0)
+        for content in get_baml_files().values()
+        for match in _DECLARATION_PATTERN.finditer(content)
+    }
+    source = declarations.get(function_name)
+    if source is None or not source.startswith("function"):
+        raise ValueError(f"BAML function {function_name} not found.")
+
+    used = {function_name}
+    pending = [function_name]
+    while pending:
+        for name in _IDENTIFIER_PATTERN.findall(declarations[pending.pop()]):
+            if name in declarations and name not in used:
+                used.add(name)
+                pending.append(name)
+
+    client = _CLIENT_PATTERN.search(source)
+    digest = hashlib.sha256()
+    for name in sorted(used):
+        digest.update(name.encode("utf-8") + b"\0" + declarations[name].encode("utf-8"))
+
+    return (client.group(1) if client else "default"), digest.hexdigest()
+
+
+class LLMResultCache:
+    """
+    Persistent cache of structured LLM function results.
+
+    Results are keyed by (function name, prompt source hash, client, input
+    hash), expire after ``ttl_seconds`` and the least recently used rows are
+    evicted above ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: int,
+        max_entries: int,
+        metrics: CacheMetrics = llm_cache_metrics,
+    ) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_result_cache (
+                key TEXT PRIMARY KEY,
+                function_name TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_llm_result_cache_accessed_at "
+            "ON llm_result_cache (accessed_at)"
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def make_key(function_name: str, text: str) -> str:
+        client, prompt_hash = get_prompt_fingerprint(function_name)
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+        return hashlib.sha256(
+            f"{function_name}\0{prompt_hash}\0{client}\0{text_hash}".encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, created_at FROM llm_result_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, created_at = row
+            if created_at + self.ttl_seconds < now:
+                self._connection.execute(
+                    "DELETE FROM llm_result_cache WHERE key = ?", (key,)
+                )
+                self._connection.commit()
+                return None
+
+            self._connection.execute(
+                "UPDATE llm_result_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._connection.commit()
+
+        return value
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM llm_result_cache WHERE key = ?", (key,)
+            )
+            self._connection.commit()
+
+    def set(self, key: str, function_name: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_result_cache "
+                "(key, function_name, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, function_name, value, now, now),
+            )
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM llm_result_cache"
+            ).fetchone()
+            if count > self.max_entries:
+                self._connection.execute(
+                    "DELETE FROM llm_result_cache WHERE key IN ("
+                    "SELECT key FROM llm_result_cache ORDER BY accessed_at LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self._connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    async def get_or_call(
+        self,
+        function_name: str,
+        text: str,
+        call: Callable[[], Awaitable[T]],
+        result_type: Type[T],
+        bypass: bool = False,
+    ) -> T:
+        """
+        Return a cached result or call the LLM function and cache its result.
+
+        :param function_name: BAML function name
+        :param text: Function input
+        :param call: Coroutine factory performing the actual call
+        :param result_type: Pydantic type of the result
+        :param bypass: Skip the cache lookup and refresh the cached result
+        :return:
+        """
+
+        key = self.make_key(function_name, text)
+        if not bypass:
+            cached = await asyncio.to_thread(self.get, key)
+            if cached is not None:
+                try:
+                    result = result_type.model_validate_json(cached)
+                except ValidationError as exc:
+                    # Written for an older result schema, treated as a miss.
+                    logger.warning(
+                        "LLM cache entry invalid, evicting.",
+                        function=function_name,
+                        error=str(exc),
+                    )
+                    await asyncio.to_thread(self.delete, key)
+                else:
+                    self.metrics.record(hits=1)
+                    logger.debug("LLM cache hit.", function=function_name)
+                    return result
+
+        self.metrics.record(misses=1)
+        logger.debug("LLM cache miss.", function=function_name)
+        result = await call()
+        await asyncio.to_thread(self.set, key, function_name, result.model_dump_json())
+
+        return result
+
+
+_llm_result_cache: Optional[LLMResultCache] = None
+
+
+def get_llm_result_cache() -> Optional[LLMResultCache]:
+    """
+    Process-wide LLM result cache, or None when caching is disabled.
+    """
+
+    global _llm_result_cache
+    if _llm_result_cache is None and settings.llm_cache.enabled:
+        _llm_result_cache = LLMResultCache(
+            path=settings.llm_cache.path,
+            ttl_seconds=settings.llm_cache.ttl_seconds,
+            max_entries=settings.llm_cache.max_entries,
+        )
+
+    return _llm_result_cache
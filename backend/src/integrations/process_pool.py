@@ -0,0 +1,85 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, TypeVar
+
+from logger import logger
+from settings import settings
+
+T = TypeVar("T")
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Process pool for CPU-bound work, shared by the whole process.
+
+    Returns None when the pool is disabled or the current process is daemonic
+    (e.g. a Celery prefork child), in which case callers fall back to the
+    default thread pool.
+    """
+
+    global _process_pool
+    if settings.extraction.max_workers <= 0 or multiprocessing.current_process().daemon:
+        return None
+
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=settings.extraction.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    return _process_pool
+
+
+def get_worker_count() -> int:
+    """Number of workers CPU-bound work is spread over."""
+
+    return max(settings.extraction.max_workers, 1)
+
+
+def shutdown_process_pool() -> None:
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+def recycle_process_pool() -> None:
+    """
+    Replace the pool with a fresh one, e.g. after a task timed out.
+
+    A timed out future can't be cancelled once running, so new work goes to
+    a new pool instead of queueing behind it. The old pool is shut down
+    without waiting: pending work is cancelled and its workers exit once
+    their running tasks finish.
+    """
+
+    global _process_pool
+    pool, _process_pool = _process_pool, None
+    if pool is None:
+        return
+
+    pool.shutdown(wait=False, cancel_futures=True)
+    get_process_pool()
+    logger.warning("Process pool recycled.")
+
+
+async def run_cpu_bound(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run CPU-bound work in the process pool, off the event loop.
+
+    Work interrupted by a broken or recycled pool is retried once on a new
+    pool.
+    """
+
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    try:
+        return await loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        if pool is _process_pool:
+            recycle_process_pool()
+        return await loop.run_in_executor(get_process_pool(), func, *args)
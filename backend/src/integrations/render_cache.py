@@ -0,0 +1,115 @@
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional
+
+from settings import settings
+
+
+class DiskRenderCache:
+    """
+    Size-bounded directory of rendered artifacts.
+
+    Entries are files named after their key. Hits refresh the file mtime and
+    the least recently used files are evicted once the directory grows above
+    ``max_bytes``. The directory size is tallied in memory and only rescanned
+    when the tally crosses the limit, which also corrects for entries written
+    by other processes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / key
+
+    def get(self, key: str) -> Optional[Path]:
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+
+        return path
+
+    def put(self, key: str, write: Callable[[BinaryIO], None]) -> Path:
+        """
+        Store an artifact produced by ``write`` and return its path.
+
+        The artifact is written to a temporary file and atomically renamed, so
+        concurrent readers never see a partially written entry.
+        """
+
+        path = self.path_for(key)
+        tmp_path = self.directory / f".{key}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as file:
+                write(file)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        size = path.stat().st_size
+        with self._lock:
+            if self._size is None:
+                self._size = sum(entry[1] for entry in self._scan())
+            else:
+                self._size += size
+            if self._size > self.max_bytes:
+                self._evict(keep=path)
+
+        return path
+
+    def delete_prefix(self, prefix: str) -> None:
+        for path in self.directory.glob(f"{prefix}*"):
+            path.unlink(missing_ok=True)
+
+    def _scan(self) -> list[tuple[float, int, str]]:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(".") or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        return entries
+
+    def _evict(self, keep: Path) -> None:
+        """Remove the least recently used entries until the cache fits."""
+
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == str(keep):
+                continue
+            Path(path).unlink(missing_ok=True)
+            total -= size
+        self._size = total
+
+
+_render_cache: Optional[DiskRenderCache] = None
+
+
+def get_render_cache() -> DiskRenderCache:
+    """
+    Process-wide cache of rendered letters.
+    """
+
+    global _render_cache
+    if _render_cache is None:
+        _render_cache = DiskRenderCache(
+            directory=settings.letter.render_cache_dir,
+            max_bytes=settings.letter.render_cache_max_mb * 1024 * 1024,
+        )
+
+    return _render_cache
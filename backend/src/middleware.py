@@ -1,12 +1,58 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from services.resume_service import get_size_limit_message
+from settings import settings
+
+RESUME_UPLOAD_PATH = "/api/v1/files/resume"
+# Room for the multipart boundaries and part headers around the file.
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+
+class ResumeUploadSizeLimitMiddleware:
+    """
+    Reject resume uploads whose declared Content-Length exceeds the limit.
+
+    Multipart bodies are parsed, and spooled to disk, before the handler
+    runs, so oversized uploads are refused before reading the body. Bodies
+    without a Content-Length are still cut off while being saved.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] == "http"
+            and scope["method"] == "POST"
+            and scope["path"].rstrip("/") == RESUME_UPLOAD_PATH
+        ):
+            max_size = (
+                settings.resume.max_file_size_mb * 1024 * 1024
+                + MULTIPART_OVERHEAD_BYTES
+            )
+            content_length = dict(scope["headers"]).get(b"content-length")
+            if content_length and content_length.isdigit():
+                if int(content_length) > max_size:
+                    response = JSONResponse(
+                        {"detail": get_size_limit_message()},
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                    )
+                    await response(scope, receive, send)
+                    return
+
+        await self.app(scope, receive, send)
 
 
 def setup_middleware(app: FastAPI) -> None:
+    app.add_middleware(ResumeUploadSizeLimitMiddleware)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag"],
     )
@@ -0,0 +1,29 @@
+"""Add letter content
+
+Revision ID: 3f8b2d6e9a1c
+Revises: 7c1e9a4f2b3d
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = "3f8b2d6e9a1c"
+down_revision = "7c1e9a4f2b3d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "file_generated_letter",
+        sa.Column("content", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("file_generated_letter", "content")
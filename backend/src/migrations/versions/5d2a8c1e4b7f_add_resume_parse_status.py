@@ -0,0 +1,31 @@
+"""Add resume parse status
+
+Revision ID: 5d2a8c1e4b7f
+Revises: 3f8b2d6e9a1c
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = "5d2a8c1e4b7f"
+down_revision = "3f8b2d6e9a1c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "file_resume",
+        sa.Column(
+            "parse_status", sqlmodel.sql.sqltypes.AutoString(length=16), nullable=True
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("file_resume", "parse_status")
@@ -0,0 +1,39 @@
+"""Add keyset pagination indexes
+
+Revision ID: 7c1e9a4f2b3d
+Revises: 156374340d5d
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "7c1e9a4f2b3d"
+down_revision = "156374340d5d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_file_resume_created_at_id",
+        "file_resume",
+        ["created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_file_generated_letter_resume_id_created_at_id",
+        "file_generated_letter",
+        ["resume_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_file_generated_letter_resume_id_created_at_id",
+        table_name="file_generated_letter",
+    )
+    op.drop_index("ix_file_resume_created_at_id", table_name="file_resume")
@@ -0,0 +1,28 @@
+"""Add resume parse claim time
+
+Revision ID: 8b4e1f7c2a9d
+Revises: 5d2a8c1e4b7f
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "8b4e1f7c2a9d"
+down_revision = "5d2a8c1e4b7f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "file_resume",
+        sa.Column("parse_claimed_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("file_resume", "parse_claimed_at")
@@ -1,6 +1,8 @@
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 
 from models.mixins import TimeStampMixin
@@ -8,11 +10,16 @@ from models.mixins import TimeStampMixin
 
 class FileResume(SQLModel, TimeStampMixin, table=True):
     __tablename__ = "file_resume"
+    __table_args__ = (Index("ix_file_resume_created_at_id", "created_at", "id"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     file_id: UUID = Field(nullable=False, unique=True)
     filename: str = Field(nullable=False, max_length=255)
     file_extension: str = Field(nullable=False, max_length=10)
+    # Background parsing state: queued, processing, done or failed.
+    parse_status: Optional[str] = Field(default=None, nullable=True, max_length=16)
+    # When parsing was queued or started; stale claims can be taken over.
+    parse_claimed_at: Optional[datetime] = Field(default=None, nullable=True)
 
     ner_entities: list["NEREntity"] = Relationship(
         back_populates="resume", cascade_delete=True
@@ -30,6 +37,14 @@ class FileResume(SQLModel, TimeStampMixin, table=True):
 
 class FileGeneratedLetter(SQLModel, TimeStampMixin, table=True):
     __tablename__ = "file_generated_letter"
+    __table_args__ = (
+        Index(
+            "ix_file_generated_letter_resume_id_created_at_id",
+            "resume_id",
+            "created_at",
+            "id",
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     letter_id: UUID = Field(nullable=False, unique=True)
@@ -38,5 +53,6 @@ class FileGeneratedLetter(SQLModel, TimeStampMixin, table=True):
     )
     filename: str = Field(nullable=False, max_length=255)
     file_extension: str = Field(nullable=False, max_length=10)
+    content: Optional[str] = Field(default=None, nullable=True)
 
     resume: Optional["FileResume"] = Relationship(back_populates="generated_letters")
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, Type, Union, Sequence
+from typing import Any, AsyncIterator, Dict, Optional, Type, Union, Sequence
 
 from pydantic.main import BaseModel
-from sqlalchemy import Column, insert, update, delete, RowMapping
+from sqlalchemy import Column, insert, update, delete, RowMapping, bindparam, tuple_
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.engine import CursorResult, Result, Row
 from sqlalchemy.exc import NoResultFound
@@ -13,6 +13,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import SQLModel, select
 from sqlmodel.sql.expression import SelectOfScalar
 
+from utils.pagination import decode_cursor, encode_cursor
+
 
 class BaseRepository(ABC):
     """
@@ -45,6 +47,21 @@ class BaseRepository(ABC):
 
         return getattr(self.model, attr)
 
+    @staticmethod
+    def _values(model: Union[Dict, BaseModel]) -> Dict:
+        """
+        Значения для вставки записи.
+
+        :param model: Данные модели
+        :return:
+        """
+
+        return (
+            model
+            if isinstance(model, dict)
+            else model.model_dump(exclude={"id"}, exclude_none=True)
+        )
+
     def _select(self, **kwargs: Any) -> SelectOfScalar:
         """
         Формирование выборки с условиями.
@@ -102,6 +119,65 @@ class BaseRepository(ABC):
 
         return cursor.scalars().all()
 
+    async def find_page_by(
+        self,
+        *,
+        limit: int,
+        cursor: Optional[str] = None,
+        **kwargs: Any,
+    ) -> tuple[Sequence[Any], Optional[str]]:
+        """
+        Постраничная выборка по ключу (created_at, id) от новых к старым.
+
+        :param limit: Размер страницы
+        :param cursor: Курсор предыдущей страницы
+        :param kwargs: Условия для выборки
+        :return: Записи страницы и курсор следующей страницы
+        """
+
+        created_at, primary_key = self.get_attr("created_at"), self.get_attr("id")
+        query = self._select(**kwargs)
+        if cursor:
+            query = query.where(
+                tuple_(created_at, primary_key) < tuple_(*decode_cursor(cursor))
+            )
+
+        query = query.order_by(created_at.desc(), primary_key.desc()).limit(limit + 1)
+        cursor_result = await self.session.execute(query)
+        rows = cursor_result.scalars().all()
+
+        if len(rows) <= limit:
+            return rows, None
+
+        last = rows[limit - 1]
+        return rows[:limit], encode_cursor(last.created_at, last.id)
+
+    async def stream_all_by(
+        self,
+        *,
+        order_by: Optional[Any] = None,
+        batch_size: int = 500,
+        **kwargs: Any,
+    ) -> AsyncIterator[Any]:
+        """
+        Потоковое чтение всех объектов по заданным параметрам.
+
+        :param order_by: Сортировка (по умолчанию - ID)
+        :param batch_size: Количество строк, получаемых из БД за раз
+        :param kwargs: Условия для выборки
+        :return:
+        """
+
+        order_by = order_by if order_by is not None else self.get_attr("id")
+        query = (
+            self._select(**kwargs)
+            .order_by(order_by)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream_scalars(query)
+        async for row in result:
+            yield row
+
     async def create_model(self, model: Union[Dict, BaseModel]) -> Optional[int]:
         """
         Создание записи.
@@ -110,11 +186,7 @@ class BaseRepository(ABC):
         :return:
         """
 
-        values = (
-            model
-            if isinstance(model, dict)
-            else model.model_dump(exclude={"id"}, exclude_none=True)
-        )
+        values = self._values(model)
         cursor: Result = await self.session.execute(
             insert(self.model).values(**values).returning(self.get_attr("id"))
         )
@@ -123,6 +195,29 @@ class BaseRepository(ABC):
 
         return result.id if result else None
 
+    async def create_many(
+        self, models: Sequence[Union[Dict, BaseModel]], batch_size: int = 1000
+    ) -> list[int]:
+        """
+        Создание нескольких записей многострочным INSERT.
+
+        :param models: Данные моделей для создания
+        :param batch_size: Максимальное количество строк в одном запросе
+        :return: Идентификаторы созданных записей
+        """
+
+        rows = [self._values(model) for model in models]
+        ids: list[int] = []
+        for start in range(0, len(rows), batch_size):
+            cursor: Result = await self.session.execute(
+                insert(self.model)
+                .values(rows[start : start + batch_size])
+                .returning(self.get_attr("id"))
+            )
+            ids.extend(cursor.scalars().all())
+
+        return ids
+
     async def update_model(self, primary_key: int, **kwargs: Any) -> Optional[int]:
         """
         Обновление записи.
@@ -144,14 +239,74 @@ class BaseRepository(ABC):
 
         return result.rowcount if result else None
 
+    async def update_all_by_ids(
+        self, primary_keys: Sequence[int], **kwargs: Any
+    ) -> int:
+        """
+        Обновление нескольких записей одинаковыми значениями одним запросом.
+
+        :param primary_keys: Первичные ключи
+        :param kwargs: Атрибуты и их значения
+        :return: Количество обновленных записей
+        """
+
+        if not primary_keys:
+            return 0
+
+        kwargs["updated_at"] = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        statement = (
+            update(self.model)
+            .where(self.get_attr("id").in_(primary_keys))
+            .values(**kwargs)
+        )
+
+        result: CursorResult = await self.session.execute(statement)  # type: ignore
+
+        return result.rowcount or 0
+
+    async def update_many(self, rows: Sequence[Dict]) -> list[int]:
+        """
+        Обновление нескольких записей разными значениями одним запросом.
+
+        Каждая строка содержит первичный ключ ``id`` и одинаковый набор
+        обновляемых атрибутов. Выполняется один ``UPDATE ... WHERE id = ...``
+        в режиме executemany. Драйвер не поддерживает RETURNING в этом режиме,
+        поэтому возвращаются первичные ключи переданных строк.
+
+        :param rows: Значения атрибутов с первичными ключами
+        :return: Идентификаторы обновленных записей
+        """
+
+        if not rows:
+            return []
+
+        table = self.model.__table__
+        updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        names = [name for name in rows[0] if name != "id"] + ["updated_at"]
+
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values({name: bindparam(f"b_{name}") for name in names})
+        )
+        await self.session.execute(
+            statement,
+            [
+                {
+                    f"b_{name}": value
+                    for name, value in {**row, "updated_at": updated_at}.items()
+                }
+                for row in rows
+            ],
+        )
+
+        return [row["id"] for row in rows]
+
     async def upsert_model(
         self, model: Union[dict, BaseModel], conflict_fields: list[str]
     ) -> Optional[int]:
-        values = (
-            model
-            if isinstance(model, dict)
-            else model.model_dump(exclude={"id"}, exclude_none=True)
-        )
+        values = self._values(model)
 
         insert_stmt = pg_insert(self.model).values(**values)
         update_dict = {k: v for k, v in values.items() if k not in conflict_fields}
@@ -166,6 +321,50 @@ class BaseRepository(ABC):
 
         return row.id if row else None
 
+    async def upsert_many(
+        self,
+        models: Sequence[Union[dict, BaseModel]],
+        conflict_fields: list[str],
+        batch_size: int = 1000,
+    ) -> list[int]:
+        """
+        Вставка или обновление нескольких записей одним запросом.
+
+        При повторе ключа конфликта в переданных данных используется последняя запись.
+
+        :param models: Данные моделей
+        :param conflict_fields: Поля уникального ограничения
+        :param batch_size: Максимальное количество строк в одном запросе
+        :return: Идентификаторы записей
+        """
+
+        rows = {
+            tuple(row[field] for field in conflict_fields): row
+            for row in map(self._values, models)
+        }
+        if not rows:
+            return []
+
+        unique_rows = list(rows.values())
+        update_columns = dict.fromkeys(
+            name for row in unique_rows for name in row if name not in conflict_fields
+        )
+
+        ids: list[int] = []
+        for start in range(0, len(unique_rows), batch_size):
+            insert_stmt = pg_insert(self.model).values(
+                unique_rows[start : start + batch_size]
+            )
+            upsert_stmt = insert_stmt.on_conflict_do_update(
+                index_elements=conflict_fields,
+                set_={name: insert_stmt.excluded[name] for name in update_columns},
+            ).returning(self.get_attr("id"))
+
+            result = await self.session.execute(upsert_stmt)
+            ids.extend(result.scalars().all())
+
+        return ids
+
     async def delete_by(self, **kwargs: Any) -> None:
         """
         Удаление записи по переданному условию.
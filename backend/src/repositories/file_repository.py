@@ -1,11 +1,75 @@
+from datetime import datetime, timedelta, timezone
 from typing import Type
+from uuid import UUID
+
+from sqlalchemy import or_, update
 
 from models.file import FileResume
 from repositories.base_repository import BaseRepository
 
+PARSE_QUEUED = "queued"
+PARSE_PROCESSING = "processing"
+PARSE_DONE = "done"
+PARSE_FAILED = "failed"
+
 
 class FileResumeRepository(BaseRepository):
 
     @property
     def model(self) -> Type[FileResume]:
         return FileResume
+
+    async def claim_parse(self, file_id: UUID, timeout_seconds: float) -> bool:
+        """
+        Атомарная постановка разбора резюме в очередь.
+
+        Статус меняется условным ``UPDATE``, поэтому из нескольких
+        конкурентных запросов разбор ставит в очередь только один. Разбор,
+        находящийся в очереди или в работе дольше ``timeout_seconds``,
+        считается потерянным и может быть поставлен снова.
+
+        :param file_id: Идентификатор файла резюме
+        :param timeout_seconds: Время, после которого захват устаревает
+        :return: True, если разбор не был в очереди или в работе
+        """
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        statement = (
+            update(FileResume)
+            .where(
+                FileResume.file_id == file_id,
+                or_(
+                    FileResume.parse_status.is_(None),
+                    FileResume.parse_status.not_in([PARSE_QUEUED, PARSE_PROCESSING]),
+                    FileResume.parse_claimed_at.is_(None),
+                    FileResume.parse_claimed_at
+                    < now - timedelta(seconds=timeout_seconds),
+                ),
+            )
+            .values(parse_status=PARSE_QUEUED, parse_claimed_at=now, updated_at=now)
+            .returning(FileResume.id)
+        )
+        result = await self.session.execute(statement)
+
+        return result.scalar_one_or_none() is not None
+
+    async def set_parse_status(self, file_id: UUID, parse_status: str) -> None:
+        """
+        Обновление статуса разбора резюме.
+
+        Начало обработки обновляет время захвата, так что таймаут отсчитывается
+        от старта задачи.
+
+        :param file_id: Идентификатор файла резюме
+        :param parse_status: Новый статус
+        :return:
+        """
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        values = {"parse_status": parse_status, "updated_at": now}
+        if parse_status == PARSE_PROCESSING:
+            values["parse_claimed_at"] = now
+
+        await self.session.execute(
+            update(FileResume).where(FileResume.file_id == file_id).values(**values)
+        )
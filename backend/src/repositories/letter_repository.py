@@ -1,4 +1,7 @@
-from typing import Type
+from typing import Optional, Type
+from uuid import UUID
+
+from sqlalchemy import Row, select
 
 from models.file import FileGeneratedLetter
 from repositories.base_repository import BaseRepository
@@ -9,3 +12,17 @@ class FileGeneratedLetterRepository(BaseRepository):
     @property
     def model(self) -> Type[FileGeneratedLetter]:
         return FileGeneratedLetter
+
+    async def find_updated_at(self, letter_id: UUID | str) -> Optional[Row]:
+        """
+        Время изменения письма без загрузки его текста.
+
+        :param letter_id: Идентификатор письма
+        :return: Строка ``(updated_at,)`` или None, если письма нет
+        """
+
+        result = await self.session.execute(
+            select(self.model.updated_at).where(self.model.letter_id == letter_id)
+        )
+
+        return result.first()
@@ -1,6 +1,10 @@
-from typing import Type
+from typing import Sequence, Type
+from uuid import UUID
 
-from models.ner import NEREntity
+from sqlalchemy import Row, func, select
+from sqlalchemy.dialects.postgresql import JSONB
+
+from models.ner import NEREntity, NEREntityResearch, NEREntitySelection
 from repositories.base_repository import BaseRepository
 
 
@@ -9,3 +13,40 @@ class NERRepository(BaseRepository):
     @property
     def model(self) -> Type[NEREntity]:
         return NEREntity
+
+    async def find_context_by_resumes(
+        self, resume_ids: Sequence[UUID]
+    ) -> Sequence[Row]:
+        """
+        Load facts and entity research of several resumes in one query.
+
+        Research is aggregated per resume into an ``{entity: research}`` map.
+
+        :param resume_ids: Resume identifiers
+        :return: Rows of ``(resume_id, facts, research)``
+        """
+
+        research = (
+            select(
+                func.jsonb_object_agg(
+                    NEREntitySelection.entity, NEREntityResearch.research, type_=JSONB
+                )
+            )
+            .select_from(NEREntityResearch)
+            .join(
+                NEREntitySelection,
+                NEREntitySelection.id == NEREntityResearch.entity_id,
+            )
+            .where(NEREntityResearch.resume_id == NEREntity.resume_id)
+            .correlate(NEREntity)
+            .scalar_subquery()
+        )
+        query = (
+            select(NEREntity.resume_id, NEREntity.facts, research.label("research"))
+            .where(NEREntity.resume_id.in_(resume_ids))
+            .distinct(NEREntity.resume_id)
+            .order_by(NEREntity.resume_id, NEREntity.id)
+        )
+        result = await self.session.execute(query)
+
+        return result.all()
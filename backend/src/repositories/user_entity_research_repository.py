@@ -1,10 +1,11 @@
-from typing import Type, Sequence
+from typing import Optional, Type, Sequence
 
 from pydantic import UUID5
+from sqlalchemy import Row
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
-from models.ner import NEREntityResearch
+from models.ner import NEREntityResearch, NEREntitySelection
 from repositories.base_repository import BaseRepository
 
 
@@ -25,3 +26,27 @@ class NEREntityResearchRepository(BaseRepository):
         result = await self.session.execute(query)
 
         return result.scalars().all()
+
+    async def find_entity_research_by_resume(
+        self, resume_id: UUID5, limit: Optional[int] = None, offset: int = 0
+    ) -> Sequence[Row]:
+        """
+        Load ``(entity, research)`` pairs of a resume with a single join.
+
+        :param resume_id: Resume identifier
+        :param limit: Page size, all rows when omitted
+        :param offset: Page offset
+        :return:
+        """
+
+        query = (
+            select(NEREntitySelection.entity, self.model.research)
+            .join(NEREntitySelection, NEREntitySelection.id == self.model.entity_id)
+            .where(self.model.resume_id == resume_id)
+            .order_by(self.model.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        result = await self.session.execute(query)
+
+        return result.all()
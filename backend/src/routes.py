@@ -1,6 +1,13 @@
 from fastapi import FastAPI
 
-from transport.handlers import recommendation, files, user_entity, research
+from transport.handlers import (
+    recommendation,
+    files,
+    user_entity,
+    research,
+    metrics,
+    admin,
+)
 
 
 # from transport.handlers.files import tag_files
@@ -30,3 +37,11 @@ def setup_routes(app: FastAPI) -> None:
         prefix="/api/v1/research",
         # tags=[tag_files]
     )
+    app.include_router(
+        metrics.router,
+        prefix="/api/v1/metrics",
+    )
+    app.include_router(
+        admin.router,
+        prefix="/api/v1/admin",
+    )
@@ -1,5 +1,14 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class FileUploadResponse(BaseModel):
     file_id: str
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: str
+    result: Optional[dict] = None
+    error: Optional[str] = None
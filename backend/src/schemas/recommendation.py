@@ -35,3 +35,10 @@ class RecommendationDetails(BaseModel):
 class RecommendationRequest(BaseModel):
     personalities: Personalities
     recommendation: RecommendationDetails
+
+
+class LetterFormat(str, Enum):
+    docx = "docx"
+    pdf = "pdf"
+    md = "md"
+    txt = "txt"
@@ -0,0 +1,118 @@
+"""
+Round-trips and latency of per-row versus bulk repository writes.
+
+Saves entity selections of a synthetic resume one row at a time and with the
+bulk repository methods, then upserts their research and marks them
+researched, reporting statements and milliseconds per operation. Everything
+runs in one transaction that is rolled back. Point DATABASE_URL at a local
+Postgres:
+
+    python -m scripts.bulk_write_benchmark --entities 500
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from integrations.db.metrics import StatementCounter
+from integrations.db.session import engine
+from logger import logger
+from models import FileResume, NEREntitySelection
+from repositories.user_entity_repository import NEREntitySelectionRepository
+from repositories.user_entity_research_repository import (
+    NEREntityResearchRepository,
+)
+
+
+async def measure(name: str, operation) -> tuple[dict, object]:
+    with StatementCounter(engine) as counter:
+        started = time.perf_counter()
+        result = await operation
+        elapsed = time.perf_counter() - started
+
+    return {
+        "operation": name,
+        "statements": counter.count,
+        "ms": round(elapsed * 1000, 1),
+    }, result
+
+
+async def run(session: AsyncSession, entities: int) -> list[dict]:
+    resume_id = uuid.uuid4()
+    session.add(FileResume(file_id=resume_id, filename="cv", file_extension="pdf"))
+    await session.flush()
+
+    selection_repository = NEREntitySelectionRepository(session)
+    research_repository = NEREntityResearchRepository(session)
+    selections = [
+        NEREntitySelection(
+            resume_id=resume_id, entity=f"Entity {idx}", entity_type="ORG"
+        )
+        for idx in range(entities)
+    ]
+
+    async def create_per_row() -> list[int]:
+        return [await selection_repository.create_model(row) for row in selections]
+
+    async def upsert_per_row(ids: list[int]) -> list[int]:
+        return [
+            await research_repository.upsert_model(
+                row, conflict_fields=["resume_id", "entity_id"]
+            )
+            for row in research_rows(ids)
+        ]
+
+    def research_rows(ids: list[int]) -> list[dict]:
+        return [
+            {"resume_id": resume_id, "entity_id": entity_id, "research": "..."}
+            for entity_id in ids
+        ]
+
+    reports = []
+    report, _ = await measure("create_model per row", create_per_row())
+    reports.append(report)
+    report, ids = await measure(
+        "create_many", selection_repository.create_many(selections)
+    )
+    reports.append(report)
+    report, _ = await measure("upsert_model per row", upsert_per_row(ids))
+    reports.append(report)
+    report, _ = await measure(
+        "upsert_many",
+        research_repository.upsert_many(
+            research_rows(ids), conflict_fields=["resume_id", "entity_id"]
+        ),
+    )
+    reports.append(report)
+    report, _ = await measure(
+        "update_all_by_ids",
+        selection_repository.update_all_by_ids(ids, researched=True),
+    )
+    reports.append(report)
+
+    return reports
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, default=500)
+    args = parser.parse_args()
+
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            session = AsyncSession(bind=connection)
+            for report in await run(session, args.entities):
+                logger.info(
+                    "Bulk write benchmark finished.", entities=args.entities, **report
+                )
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
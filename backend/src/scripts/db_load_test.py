@@ -0,0 +1,73 @@
+"""
+Concurrent load test of the database engine and connection pool.
+
+Runs a representative repository query through the application engine and
+reports latency percentiles together with pool checkout metrics. Point
+DATABASE_URL at a local Postgres, e.g. the compose ``db`` service:
+
+    python -m scripts.db_load_test --concurrency 50 --requests 5000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from integrations.db.metrics import pool_metrics
+from integrations.db.session import async_session, engine
+from logger import logger
+from repositories.file_repository import FileResumeRepository
+
+
+async def _run_query() -> float:
+    started = time.perf_counter()
+    async with async_session() as session:
+        await FileResumeRepository(session).find_all_by(limit=20)
+
+    return time.perf_counter() - started
+
+
+async def run(concurrency: int, requests: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def worker() -> float:
+        async with semaphore:
+            return await _run_query()
+
+    started = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*(worker() for _ in range(requests))))
+    elapsed = time.perf_counter() - started
+    # quantiles() needs two samples; a single latency is every percentile.
+    quantiles = (
+        statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    )
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p95_ms": round(quantiles[94] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+        "pool": pool_metrics.snapshot(engine.pool),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    if args.requests < 1:
+        parser.error("--requests must be at least 1")
+
+    try:
+        report = await run(args.concurrency, args.requests)
+    finally:
+        await engine.dispose()
+
+    logger.info("Database load test finished.", **report)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""
+Throughput benchmark of the embeddings provider.
+
+Embeds synthetic resume-sized chunks in batches with the configured provider,
+bypassing the embedding cache, and reports chunks per second and the latency
+of a single query:
+
+    VECTOR_STORE__EMBEDDING_PROVIDER=hashing python -m scripts.embedding_benchmark --chunks 5000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from integrations.embeddings.providers import create_embeddings, get_embedding_model_id
+from logger import logger
+from settings import settings
+
+WORDS = (
+    "led designed built migrated optimised mentored shipped automated python "
+    "kubernetes postgresql react terraform aws spark airflow pytorch latency "
+    "pipelines services team customers revenue platform reliability analytics "
+    "architecture microservices deployment monitoring security quarterly"
+).split()
+
+
+def make_chunks(count: int, chunk_size: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    chunks = []
+    for _ in range(count):
+        words: list[str] = []
+        while sum(len(word) + 1 for word in words) < chunk_size:
+            words.append(rng.choice(WORDS))
+        chunks.append(" ".join(words))
+
+    return chunks
+
+
+async def run(chunks: list[str], batch_size: int, queries: int) -> dict:
+    embeddings = create_embeddings(settings.vector_store)
+
+    # Warm up: model loading and connection setup are not measured.
+    await embeddings.aembed_documents(chunks[:1])
+
+    started = time.perf_counter()
+    for start in range(0, len(chunks), batch_size):
+        await embeddings.aembed_documents(chunks[start : start + batch_size])
+    elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for query in chunks[:queries]:
+        await embeddings.aembed_query(query)
+    query_elapsed = time.perf_counter() - started
+
+    return {
+        "provider": settings.vector_store.embedding_provider,
+        "model": get_embedding_model_id(settings.vector_store),
+        "chunks": len(chunks),
+        "batch_size": batch_size,
+        "chunks_per_second": round(len(chunks) / elapsed, 1),
+        "query_latency_ms": round(query_elapsed / queries * 1000, 2),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.vector_store.embedding_batch_size
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=settings.vector_store.chunk_size
+    )
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    chunks = make_chunks(args.chunks, args.chunk_size)
+    report = await run(chunks, args.batch_size, min(args.queries, len(chunks)))
+
+    logger.info("Embedding benchmark finished.", **report)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+"""
+Latency of loading the research results of a resume.
+
+Seeds a synthetic resume with researched entities and loads its
+``{entity: research}`` map by selectin-loading research models with their
+selections, as before, and with the projected join, all at once and a page at
+a time. Reports statements and milliseconds per load. Everything runs in one
+transaction that is rolled back. Point DATABASE_URL at a local Postgres:
+
+    python -m scripts.entity_research_benchmark --entities 1000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from integrations.db.metrics import StatementCounter
+from integrations.db.session import engine
+from logger import logger
+from models import FileResume, NEREntitySelection
+from repositories.user_entity_repository import NEREntitySelectionRepository
+from repositories.user_entity_research_repository import (
+    NEREntityResearchRepository,
+)
+
+
+async def seed(session: AsyncSession, entities: int) -> uuid.UUID:
+    resume_id = uuid.uuid4()
+    session.add(FileResume(file_id=resume_id, filename="cv", file_extension="pdf"))
+    await session.flush()
+
+    ids = await NEREntitySelectionRepository(session).create_many(
+        [
+            NEREntitySelection(
+                resume_id=resume_id,
+                entity=f"Entity {idx}",
+                entity_type="ORG",
+                researched=True,
+            )
+            for idx in range(entities)
+        ]
+    )
+    await NEREntityResearchRepository(session).upsert_many(
+        [
+            {"resume_id": resume_id, "entity_id": entity_id, "research": "..." * 100}
+            for entity_id in ids
+        ],
+        conflict_fields=["resume_id", "entity_id"],
+    )
+
+    return resume_id
+
+
+async def measure(name: str, session: AsyncSession, load, repeat: int) -> dict:
+    elapsed = 0.0
+    with StatementCounter(engine) as counter:
+        for _ in range(repeat):
+            # Loaded models must not be served from the identity map.
+            session.expunge_all()
+            started = time.perf_counter()
+            result = await load()
+            elapsed += time.perf_counter() - started
+
+    return {
+        "load": name,
+        "entities_loaded": len(result),
+        "statements": counter.count // repeat,
+        "ms": round(elapsed / repeat * 1000, 2),
+    }
+
+
+async def run(session: AsyncSession, entities: int, repeat: int) -> list[dict]:
+    resume_id = await seed(session, entities)
+    repository = NEREntityResearchRepository(session)
+
+    async def load_selectin() -> dict[str, str]:
+        researches = await repository.find_all_with_selection_by_resume(resume_id)
+        return {r.selection.entity: r.research for r in researches}
+
+    async def load_projected(limit: int | None = None) -> dict[str, str]:
+        rows = await repository.find_entity_research_by_resume(resume_id, limit=limit)
+        return {row.entity: row.research for row in rows}
+
+    return [
+        await measure("selectinload models", session, load_selectin, repeat),
+        await measure("projected join", session, load_projected, repeat),
+        await measure(
+            "projected join, page of 100",
+            session,
+            lambda: load_projected(limit=100),
+            repeat,
+        ),
+    ]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            session = AsyncSession(bind=connection)
+            for report in await run(session, args.entities, args.repeat):
+                logger.info(
+                    "Entity research benchmark finished.",
+                    entities=args.entities,
+                    **report,
+                )
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
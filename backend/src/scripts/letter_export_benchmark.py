@@ -0,0 +1,87 @@
+"""
+Throughput benchmark of letter rendering.
+
+Renders synthetic letters in every format through the disk render cache with
+the given concurrency and reports letters per second, first rendering and
+then serving the cached files. The cache lives in a temporary directory that
+is removed afterwards:
+
+    python -m scripts.letter_export_benchmark --concurrency 8 --letters 500
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from functools import partial
+
+from integrations.render_cache import DiskRenderCache
+from logger import logger
+from schemas.recommendation import LetterFormat
+from services.letter_renderer import load_template, render_letter
+
+PARAGRAPH = (
+    "It is my pleasure to recommend the candidate, whose work on distributed "
+    "systems has consistently exceeded expectations and shaped the team. "
+) * 4
+
+
+async def run(
+    cache: DiskRenderCache,
+    letter_format: LetterFormat,
+    concurrency: int,
+    letters: int,
+    paragraphs: int,
+) -> dict:
+    letter_text = "\n\n".join([PARAGRAPH] * paragraphs)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def render(idx: int) -> None:
+        async with semaphore:
+            await asyncio.to_thread(
+                cache.put,
+                f"{idx}.{letter_format.value}",
+                partial(render_letter, letter_text, letter_format),
+            )
+
+    async def hit(idx: int) -> None:
+        async with semaphore:
+            assert cache.get(f"{idx}.{letter_format.value}") is not None
+
+    started = time.perf_counter()
+    await asyncio.gather(*(render(idx) for idx in range(letters)))
+    rendered = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await asyncio.gather(*(hit(idx) for idx in range(letters)))
+    cached = time.perf_counter() - started
+
+    return {
+        "format": letter_format.value,
+        "letters": letters,
+        "concurrency": concurrency,
+        "paragraphs": paragraphs,
+        "rendered_per_second": round(letters / rendered, 1),
+        "cached_per_second": round(letters / cached, 1),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--letters", type=int, default=500)
+    parser.add_argument("--paragraphs", type=int, default=6)
+    args = parser.parse_args()
+
+    load_template()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = DiskRenderCache(cache_dir, max_bytes=1024 * 1024 * 1024)
+        for letter_format in LetterFormat:
+            report = await run(
+                cache, letter_format, args.concurrency, args.letters, args.paragraphs
+            )
+            logger.info("Letter export benchmark finished.", **report)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
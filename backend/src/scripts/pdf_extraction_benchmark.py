@@ -0,0 +1,91 @@
+"""
+Latency benchmark of resume PDF text extraction.
+
+Extracts text from a synthetic multi-page PDF, once in the process pool and
+once inline on the default thread pool, and reports seconds per document
+along with the worst event loop stall observed while extracting:
+
+    python -m scripts.pdf_extraction_benchmark --pages 60 --documents 10
+"""
+
+import argparse
+import asyncio
+import io
+import time
+
+from integrations.process_pool import shutdown_process_pool
+from logger import logger
+from services.letter_renderer import render_pdf
+from services.resume_parser_service import ResumeParserService
+from settings import settings
+
+PARAGRAPH = (
+    "Led migration of payment services to Kubernetes, cutting deployment time "
+    "from hours to minutes and mentoring four engineers along the way. "
+) * 6
+
+
+def make_pdf(pages: int) -> bytes:
+    file = io.BytesIO()
+    # Roughly six paragraphs fill an A4 page of the letter layout.
+    render_pdf([PARAGRAPH] * (pages * 6), file)
+    return file.getvalue()
+
+
+async def _measure_loop_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    lag = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag = max(lag, time.perf_counter() - started - interval)
+
+    return lag
+
+
+async def run(pdf: bytes, documents: int, max_workers: int) -> dict:
+    settings.extraction.max_workers = max_workers
+    service = ResumeParserService()
+
+    # Warm up: worker start-up is not measured.
+    await service._extract_text(pdf, ".pdf")
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_loop_lag(stop))
+    started = time.perf_counter()
+    for _ in range(documents):
+        await service._extract_text(pdf, ".pdf")
+    elapsed = time.perf_counter() - started
+    stop.set()
+    loop_lag = await lag_task
+    shutdown_process_pool()
+
+    return {
+        "mode": "process_pool" if max_workers > 0 else "inline",
+        "max_workers": max_workers,
+        "seconds_per_document": round(elapsed / documents, 3),
+        "loop_lag_ms_max": round(loop_lag * 1000, 1),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=60)
+    parser.add_argument("--documents", type=int, default=10)
+    parser.add_argument(
+        "--max-workers", type=int, default=max(settings.extraction.max_workers, 1)
+    )
+    args = parser.parse_args()
+
+    pdf = make_pdf(args.pages)
+    for max_workers in (args.max_workers, 0):
+        report = await run(pdf, args.documents, max_workers)
+        logger.info(
+            "PDF extraction benchmark finished.",
+            pages=args.pages,
+            documents=args.documents,
+            **report,
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
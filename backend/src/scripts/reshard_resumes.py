@@ -0,0 +1,73 @@
+"""
+Move resumes from the flat upload directory into the sharded layout.
+
+    python -m scripts.reshard_resumes [--dry-run]
+"""
+
+import argparse
+import os
+import uuid
+from pathlib import Path
+
+from logger import logger
+from settings import settings
+
+
+def reshard(upload_dir: Path, dry_run: bool = False) -> int:
+    """
+    Move ``<upload_dir>/<file_id>.<ext>`` files to ``<upload_dir>/ab/cd/``.
+
+    Files not named ``<uuid>.<allowed extension>`` aren't uploads, e.g. text
+    caches or stray files, and are left in place with a warning.
+
+    :param upload_dir: Resume upload directory
+    :param dry_run: Only report files that would be moved
+    :return: Number of moved files
+    """
+
+    with os.scandir(upload_dir) as entries:
+        names = [
+            entry.name
+            for entry in entries
+            if entry.is_file() and not entry.name.startswith(".")
+        ]
+
+    moved = 0
+    for name in names:
+        if not is_resume_file_name(name):
+            logger.warning("Skipping unexpected file.", name=name)
+            continue
+
+        target_dir = upload_dir / name[:2] / name[2:4]
+        if not dry_run:
+            target_dir.mkdir(parents=True, exist_ok=True)
+            os.replace(upload_dir / name, target_dir / name)
+        moved += 1
+
+    return moved
+
+
+def is_resume_file_name(name: str) -> bool:
+    """Whether the name is ``<uuid>.<ext>`` with an allowed extension."""
+
+    stem, _, extension = name.rpartition(".")
+    if extension not in settings.resume.allowed_extensions:
+        return False
+
+    try:
+        return str(uuid.UUID(stem)) == stem
+    except ValueError:
+        return False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    moved = reshard(Path(settings.resume.upload_dir), dry_run=args.dry_run)
+    logger.info("Resumes resharded.", moved=moved, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Latency benchmark of resume path lookups on a large upload directory.
+
+Creates ``--files`` empty resumes in the legacy flat layout of a temporary
+directory and times lookups by a directory scan, as ``get_file_path`` did
+before the sharded layout, then reshards them and times
+``ResumeService.get_file_path`` cold (path cache cleared) and warm:
+
+    python -m scripts.resume_path_benchmark --files 100000 --lookups 1000
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from logger import logger
+from scripts.reshard_resumes import reshard
+from services import resume_service
+from services.resume_service import ResumeService
+from settings import settings
+from utils.lru_cache import LRUCache
+
+
+def make_files(upload_dir: Path, files: int) -> list[str]:
+    file_ids = [
+        str(uuid.UUID(int=random.getrandbits(128), version=5)) for _ in range(files)
+    ]
+    for idx, file_id in enumerate(file_ids):
+        extension = ("pdf", "docx", "txt")[idx % 3]
+        (upload_dir / f"{file_id}.{extension}").touch()
+
+    return file_ids
+
+
+def scan_lookup(upload_dir: Path, file_id: str) -> Path | None:
+    for file in upload_dir.iterdir():
+        if file.stem == file_id:
+            return file
+
+    return None
+
+
+async def timed_lookups(service: ResumeService, file_ids: list[str]) -> float:
+    started = time.perf_counter()
+    for file_id in file_ids:
+        assert await service.get_file_path(file_id) is not None
+    return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=1000)
+    parser.add_argument(
+        "--scan-lookups",
+        type=int,
+        default=20,
+        help="Directory scans are slow, so fewer of them are timed",
+    )
+    args = parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as upload_dir:
+        upload_path = Path(upload_dir)
+        file_ids = make_files(upload_path, args.files)
+        lookup_ids = random.sample(file_ids, min(args.lookups, args.files))
+
+        scan_ids = lookup_ids[: args.scan_lookups]
+        started = time.perf_counter()
+        for file_id in scan_ids:
+            assert scan_lookup(upload_path, file_id) is not None
+        scan_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        moved = reshard(upload_path)
+        reshard_elapsed = time.perf_counter() - started
+
+        settings.resume.upload_dir = upload_dir
+        resume_service._file_path_cache = LRUCache(settings.resume.path_cache_size)
+        service = ResumeService(session=None)
+        cold_elapsed = await timed_lookups(service, lookup_ids)
+        warm_elapsed = await timed_lookups(service, lookup_ids)
+
+    logger.info(
+        "Resume path benchmark finished.",
+        files=args.files,
+        scan_lookup_ms=round(scan_elapsed / len(scan_ids) * 1000, 3),
+        reshard_seconds=round(reshard_elapsed, 2),
+        moved=moved,
+        sharded_cold_lookup_ms=round(cold_elapsed / len(lookup_ids) * 1000, 4),
+        sharded_warm_lookup_ms=round(warm_elapsed / len(lookup_ids) * 1000, 4),
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""
+Per-request overhead of a fresh versus the app-scoped vector store.
+
+Compares building a VectorStoreService for every request, as handlers did
+before the lifespan-managed instance, with reusing one instance. Each
+"request" lists the chunks of a resume, which touches Chroma but not the
+embeddings backend. The store lives in a temporary directory:
+
+    python -m scripts.vector_store_benchmark --requests 200
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from logger import logger
+from services.vector_store_service import VectorStoreService
+from settings import settings
+
+RESUME_ID = "vector-store-benchmark"
+
+
+async def _request(service: VectorStoreService) -> None:
+    await service.get_documents(RESUME_ID, limit=10)
+
+
+async def run_fresh(requests: int) -> dict:
+    started = time.perf_counter()
+    for _ in range(requests):
+        service = VectorStoreService()
+        await _request(service)
+        await service.aclose()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "mode": "fresh_per_request",
+        "per_request_ms": round(elapsed / requests * 1000, 3),
+    }
+
+
+async def run_shared(requests: int) -> dict:
+    service = VectorStoreService()
+    started = time.perf_counter()
+    for _ in range(requests):
+        await _request(service)
+    elapsed = time.perf_counter() - started
+    await service.aclose()
+
+    return {
+        "mode": "app_scoped",
+        "per_request_ms": round(elapsed / requests * 1000, 3),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        settings.vector_store.persist_directory = os.path.join(data_dir, "chroma")
+        settings.vector_store.embedding_cache_path = os.path.join(
+            data_dir, "embedding_cache.sqlite3"
+        )
+        service = VectorStoreService()
+        await service.add_document(
+            "Led migration of payment services to Kubernetes. " * 40,
+            {"resume_id": RESUME_ID, "type": "resume_text"},
+        )
+        await service.aclose()
+
+        for run in (run_fresh, run_shared):
+            report = await run(args.requests)
+            logger.info(
+                "Vector store benchmark finished.", requests=args.requests, **report
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
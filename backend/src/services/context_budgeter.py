@@ -0,0 +1,205 @@
+import re
+from typing import Iterable, Optional
+
+from services.few_shot_example_store import EXAMPLES_SEPARATOR
+from settings import PromptBudget
+from utils.tokens import Tokenizer
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def _shingles(text: str, size: int = 3) -> set[tuple[str, ...]]:
+    words = _WORD_PATTERN.findall(text.lower())
+    return {tuple(words[i : i + size]) for i in range(max(len(words) - size + 1, 1))}
+
+
+class ContextBudgeter:
+    """
+    Fits prompt inputs of the letter generation into token budgets.
+
+    Every input has its own budget from :class:`settings.PromptBudget`, named
+    ``<input>_tokens``. Within an input the lowest-ranked material is dropped
+    first: trailing retrieved chunks, older experience entries, later few-shot
+    examples and the longest research texts. Token counts before and after are
+    collected in :attr:`report`.
+    """
+
+    def __init__(self, config: PromptBudget, tokenizer: Tokenizer) -> None:
+        self.config = config
+        self.tokenizer = tokenizer
+        self.tokens_before: dict[str, int] = {}
+        self.tokens_after: dict[str, int] = {}
+
+    @property
+    def report(self) -> dict:
+        before = sum(self.tokens_before.values())
+        after = sum(self.tokens_after.values())
+        return {
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "tokens_saved": before - after,
+        }
+
+    def _budget(self, name: str) -> Optional[int]:
+        if not self.config.enabled:
+            return None
+
+        return getattr(self.config, f"{name}_tokens")
+
+    def _record(self, name: str, before: int, after: int) -> None:
+        self.tokens_before[name] = before
+        self.tokens_after[name] = after
+
+    @staticmethod
+    def _render_experience(experience: dict) -> str:
+        """Experience entry as rendered by the GenerateRecommendationLetter prompt."""
+
+        return (
+            f"- {experience.get('job_title')} at {experience.get('company')} "
+            f"({experience.get('start_date')} – {experience.get('end_date')})\n"
+            f"Responsibilities: {', '.join(experience.get('responsibilities') or [])}"
+        )
+
+    def fit_facts(self, name: str, facts: Optional[dict]) -> Optional[dict]:
+        """
+        Fit the summary and experience of resume facts into the budget.
+
+        The summary keeps at most half of the budget. Experience entries are
+        kept in order, most recent first, while they fit; if even the first
+        one doesn't, its trailing responsibilities are dropped, and the entry
+        itself when it still doesn't fit without any.
+        """
+
+        if not facts:
+            return facts
+
+        summary = facts.get("summary") or ""
+        experiences = facts.get("experience") or []
+        before = self.tokenizer.count(summary) + sum(
+            self.tokenizer.count(self._render_experience(item)) for item in experiences
+        )
+        budget = self._budget(name)
+        if budget is None or before <= budget:
+            self._record(name, before, before)
+            return facts
+
+        summary = self.tokenizer.truncate(summary, budget // 2)
+        remaining = budget - self.tokenizer.count(summary)
+        kept = []
+        for experience in experiences:
+            cost = self.tokenizer.count(self._render_experience(experience))
+            if cost > remaining:
+                if not kept:
+                    experience = dict(experience)
+                    responsibilities = list(experience.get("responsibilities") or [])
+                    while responsibilities and cost > remaining:
+                        responsibilities.pop()
+                        experience["responsibilities"] = responsibilities
+                        cost = self.tokenizer.count(self._render_experience(experience))
+                    if cost <= remaining:
+                        kept.append(experience)
+                        remaining -= cost
+                break
+            kept.append(experience)
+            remaining -= cost
+
+        self._record(name, before, budget - remaining)
+        return {
+            **facts,
+            "summary": summary or None,
+            "experience": kept if facts.get("experience") is not None else None,
+        }
+
+    def fit_chunks(
+        self, name: str, chunks: list[str], known_texts: Iterable[str] = ()
+    ) -> list[str]:
+        """
+        Fit retrieved chunks, ordered by relevance, into the budget.
+
+        Chunks whose word trigrams mostly occur in ``known_texts`` (the entity
+        research put in the prompt anyway) or in a more relevant chunk are
+        dropped, then the least relevant chunks are dropped until the rest
+        fits. The most relevant chunk is truncated if it alone exceeds it.
+        """
+
+        before = sum(self.tokenizer.count(chunk) for chunk in chunks)
+        budget = self._budget(name)
+        if budget is None:
+            self._record(name, before, before)
+            return chunks
+
+        seen = set().union(*(_shingles(text) for text in known_texts))
+        kept, total = [], 0
+        for chunk in chunks:
+            shingles = _shingles(chunk)
+            if len(shingles & seen) >= self.config.dedupe_threshold * len(shingles):
+                continue
+            seen |= shingles
+
+            cost = self.tokenizer.count(chunk)
+            if total + cost > budget:
+                if not kept:
+                    chunk = self.tokenizer.truncate(chunk, budget)
+                    kept.append(chunk)
+                    total += self.tokenizer.count(chunk)
+                break
+            kept.append(chunk)
+            total += cost
+
+        self._record(name, before, total)
+        return kept
+
+    def fit_research(self, name: str, research: dict[str, str]) -> dict[str, str]:
+        """
+        Fit entity research texts into the budget.
+
+        Research has no relevance order, so the budget is shared fairly:
+        texts shorter than an equal share are kept whole and the longest ones
+        are truncated to the share left for them.
+        """
+
+        counts = {
+            entity: self.tokenizer.count(text) for entity, text in research.items()
+        }
+        before = sum(counts.values())
+        budget = self._budget(name)
+        if budget is None or before <= budget:
+            self._record(name, before, before)
+            return research
+
+        fitted, remaining = {}, budget
+        by_length = sorted(research, key=counts.__getitem__)
+        for idx, entity in enumerate(by_length):
+            share = remaining // (len(by_length) - idx)
+            fitted[entity] = self.tokenizer.truncate(research[entity], share)
+            remaining -= min(counts[entity], share)
+
+        self._record(name, before, budget - remaining)
+        return {entity: fitted[entity] for entity in research if fitted[entity]}
+
+    def fit_examples(self, name: str, examples: str) -> str:
+        """
+        Fit joined few-shot examples into the budget, dropping later ones.
+
+        The first example is truncated if it alone exceeds the budget.
+        """
+
+        before = self.tokenizer.count(examples)
+        budget = self._budget(name)
+        if budget is None or before <= budget:
+            self._record(name, before, before)
+            return examples
+
+        kept, total = [], 0
+        for example in examples.split(EXAMPLES_SEPARATOR):
+            cost = self.tokenizer.count(example)
+            if total + cost > budget:
+                if not kept:
+                    kept.append(self.tokenizer.truncate(example, budget))
+                    total = self.tokenizer.count(kept[0])
+                break
+            kept.append(example)
+            total += cost
+
+        self._record(name, before, total)
+        return EXAMPLES_SEPARATOR.join(kept)
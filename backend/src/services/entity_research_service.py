@@ -1,20 +1,36 @@
-from baml_client.async_client import b
+import asyncio
+from typing import Optional
+
+from baml_client.async_client import BamlAsyncClient
 from fastapi import Depends
 from pydantic import UUID5
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from integrations.db.session import get_session
+from integrations.llm import get_llm_client
+from logger import logger
 from models.ner import NEREntityResearch
 from repositories.user_entity_repository import NEREntitySelectionRepository
 from repositories.user_entity_research_repository import NEREntityResearchRepository
-from services.vector_store_service import VectorStoreService
+from services.vector_store_service import (
+    VectorStoreService,
+    get_vector_store_service,
+)
+from settings import settings
 
 
 class EntityResearchService:
-    def __init__(self, session: AsyncSession = Depends(get_session)):
+    def __init__(
+        self,
+        session: AsyncSession = Depends(get_session),
+        vector_store_service: VectorStoreService = Depends(get_vector_store_service),
+        llm_client: BamlAsyncClient = Depends(get_llm_client),
+    ):
+        self.session = session
         self.ner_research_repository = NEREntityResearchRepository(session)
         self.selection_repository = NEREntitySelectionRepository(session)
-        self.vector_store_service = VectorStoreService()
+        self.vector_store_service = vector_store_service
+        self.llm_client = llm_client
 
     async def research_entities(self, resume_id: UUID5) -> dict[str, str]:
         """Research unresearched selected entities."""
@@ -28,46 +44,103 @@ class EntityResearchService:
 
         to_research = [s for s in all_selections if not s.researched]
         entity_map = {sel.entity: sel.id for sel in to_research}
-        research_results = {}
 
         if entity_map:
-            new_research_output = await b.ResearchEntities(list(entity_map.keys()))
-
-            for entity, result in new_research_output.items():
-                selection_id = entity_map.get(entity)
-                if not selection_id:
-                    continue
-
-                await self.ner_research_repository.upsert_model(
-                    NEREntityResearch(
-                        resume_id=resume_id,
-                        entity_id=selection_id,
-                        research=result,
-                    ),
-                    conflict_fields=["resume_id", "entity_id"],
+            await self._research(resume_id, entity_map)
+
+        return await self.get_research(resume_id)
+
+    async def get_research(
+        self, resume_id: UUID5, limit: Optional[int] = None, offset: int = 0
+    ) -> dict[str, str]:
+        """Researched entities of a resume, optionally paginated."""
+
+        rows = await self.ner_research_repository.find_entity_research_by_resume(
+            resume_id, limit=limit, offset=offset
+        )
+
+        return {row.entity: row.research for row in rows}
+
+    async def _research(self, resume_id: UUID5, entity_map: dict[str, int]) -> None:
+        """
+        Research entities in bounded batches running concurrently.
+
+        Each batch is stored and committed as soon as it completes, so a slow
+        or failing batch doesn't hold back the others. Failed batches are
+        logged and skipped, so their entities stay unresearched and are
+        picked up by the next call.
+        """
+
+        entities = list(entity_map)
+        batch_size = settings.research.batch_size
+        semaphore = asyncio.Semaphore(settings.research.max_concurrency)
+        # Batches share the request session, which can't run queries concurrently.
+        store_lock = asyncio.Lock()
+
+        async def research_batch(batch: list[str]) -> None:
+            try:
+                async with semaphore:
+                    output = await self.llm_client.ResearchEntities(batch)
+            except Exception as exc:
+                logger.error(
+                    "Entity research batch failed.", entities=batch, error=str(exc)
                 )
+                return
 
-                await self.selection_repository.update_model(
-                    selection_id, researched=True
+            results = {
+                entity: result for entity, result in output.items() if entity in batch
+            }
+            async with store_lock:
+                await self._store_research(resume_id, entity_map, results)
+                await self.session.commit()
+
+        await asyncio.gather(
+            *(
+                research_batch(entities[i : i + batch_size])
+                for i in range(0, len(entities), batch_size)
+            )
+        )
+
+    async def _store_research(
+        self,
+        resume_id: UUID5,
+        entity_map: dict[str, int],
+        research_results: dict[str, str],
+    ) -> None:
+        research_results = {
+            entity: result
+            for entity, result in research_results.items()
+            if entity in entity_map
+        }
+        if not research_results:
+            return
+
+        await self.ner_research_repository.upsert_many(
+            [
+                NEREntityResearch(
+                    resume_id=resume_id,
+                    entity_id=entity_map[entity],
+                    research=result,
                 )
-                research_results[entity] = result
+                for entity, result in research_results.items()
+            ],
+            conflict_fields=["resume_id", "entity_id"],
+        )
 
-                await self.vector_store_service.add_document(
-                    text=result,
-                    metadata={
+        await self.selection_repository.update_all_by_ids(
+            [entity_map[entity] for entity in research_results], researched=True
+        )
+
+        await self.vector_store_service.add_documents(
+            [
+                (
+                    result,
+                    {
                         "resume_id": str(resume_id),
                         "type": "entity_research",
                         "entity": entity,
                     },
                 )
-
-        all_researches = await self.ner_research_repository.find_all_by(
-            resume_id=resume_id, limit=10
+                for entity, result in research_results.items()
+            ]
         )
-
-        full_results: dict[str, str] = {}
-        for r in all_researches:
-            if r.selection:
-                full_results[r.selection.entity] = r.research
-
-        return full_results
@@ -0,0 +1,182 @@
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from fastapi import Request
+from langchain_core.embeddings import Embeddings
+
+from logger import logger
+from schemas.recommendation import RecommendationType
+
+EXAMPLES_SEPARATOR = "\n\n---\n\n"
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize vectors along the last axis, leaving zero vectors as is."""
+
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+class FewShotExamples:
+    """Examples of one recommendation type as read from disk."""
+
+    def __init__(self, signature: tuple, examples: list[str]) -> None:
+        self.signature = signature
+        self.examples = examples
+        self.joined = EXAMPLES_SEPARATOR.join(examples)
+        self.vectors: Optional[np.ndarray] = None
+
+
+class FewShotExampleStore:
+    """
+    App-scoped store of few-shot letter examples.
+
+    Examples are read once at startup and kept pre-joined per recommendation
+    type. File modification times are checked at most every
+    ``check_interval_seconds`` and changed types are re-read; :meth:`reload`
+    forces a full reload. With an embeddings model the store can select the
+    ``k`` examples most similar to a query.
+    """
+
+    def __init__(
+        self,
+        examples_dir: str,
+        check_interval_seconds: float,
+        embeddings: Optional[Embeddings] = None,
+    ) -> None:
+        self.examples_dir = Path(examples_dir)
+        self.check_interval_seconds = check_interval_seconds
+        self.embeddings = embeddings
+        self._examples: dict[str, FewShotExamples] = {}
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _get_type_dir(self, recommendation_type: str) -> Path:
+        return self.examples_dir / recommendation_type
+
+    def _get_signature(self, recommendation_type: str) -> tuple:
+        try:
+            entries = os.scandir(self._get_type_dir(recommendation_type))
+        except FileNotFoundError:
+            return ()
+
+        with entries:
+            return tuple(
+                sorted(
+                    (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+                    for entry in entries
+                    if entry.name.endswith(".txt") and entry.is_file()
+                )
+            )
+
+    def _read(self, recommendation_type: str) -> FewShotExamples:
+        signature = self._get_signature(recommendation_type)
+        type_dir = self._get_type_dir(recommendation_type)
+        examples = [
+            (type_dir / name).read_text(encoding="utf-8").strip()
+            for name, _, _ in signature
+        ]
+
+        return FewShotExamples(signature, examples)
+
+    def _read_changed(
+        self, loaded: dict[str, FewShotExamples]
+    ) -> dict[str, FewShotExamples]:
+        """Read the recommendation types that differ on disk from ``loaded``."""
+
+        changed = {}
+        for recommendation_type in RecommendationType:
+            current = loaded.get(recommendation_type.value)
+            signature = self._get_signature(recommendation_type.value)
+            if current is None or current.signature != signature:
+                changed[recommendation_type.value] = self._read(
+                    recommendation_type.value
+                )
+
+        return changed
+
+    async def reload(self) -> dict[str, int]:
+        """
+        Re-read examples of all recommendation types.
+
+        The previous examples are served until the new ones are read.
+
+        :return: Number of examples per recommendation type
+        """
+
+        async with self._lock:
+            examples = await asyncio.to_thread(self._read_changed, {})
+            self._examples = examples
+            self._checked_at = time.monotonic()
+
+        counts = {name: len(item.examples) for name, item in examples.items()}
+        logger.info("Few-shot examples loaded.", counts=counts)
+
+        return counts
+
+    async def _refresh(self) -> None:
+        if time.monotonic() - self._checked_at < self.check_interval_seconds:
+            return
+
+        async with self._lock:
+            if time.monotonic() - self._checked_at < self.check_interval_seconds:
+                return
+            changed = await asyncio.to_thread(self._read_changed, self._examples)
+            self._examples = {**self._examples, **changed}
+            self._checked_at = time.monotonic()
+
+        if changed:
+            logger.info("Few-shot examples changed on disk.", types=list(changed))
+
+    async def get(
+        self, recommendation_type: str, query: Optional[str] = None, k: int = 0
+    ) -> str:
+        """
+        Examples of the recommendation type joined for the prompt.
+
+        :param recommendation_type: Recommendation type value
+        :param query: Text to rank examples against, used when ``k`` is set
+        :param k: Number of most similar examples to return, 0 for all
+        :return: Examples separated by ``---``, in file name order
+        """
+
+        await self._refresh()
+        examples = self._examples.get(recommendation_type)
+        if examples is None:
+            return ""
+        if not k or not query or self.embeddings is None or k >= len(examples.examples):
+            return examples.joined
+
+        return EXAMPLES_SEPARATOR.join(
+            examples.examples[idx]
+            for idx in await self._select_similar(examples, query, k)
+        )
+
+    async def _select_similar(
+        self, examples: FewShotExamples, query: str, k: int
+    ) -> list[int]:
+        if examples.vectors is None:
+            vectors = np.asarray(
+                await self.embeddings.aembed_documents(examples.examples),
+                dtype=np.float32,
+            )
+            examples.vectors = _normalize(vectors)
+
+        query_vector = np.asarray(
+            await self.embeddings.aembed_query(query), dtype=np.float32
+        )
+        scores = examples.vectors @ _normalize(query_vector)
+
+        return sorted(np.argsort(-scores)[:k].tolist())
+
+
+def get_few_shot_example_store(request: Request) -> FewShotExampleStore:
+    """
+    Dependency returning the few-shot example store created in the lifespan.
+    """
+
+    return request.app.state.few_shot_example_store
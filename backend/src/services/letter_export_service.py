@@ -1,80 +1,151 @@
-import io
+import asyncio
 import uuid
+from functools import partial
 from pathlib import Path
+from typing import AsyncIterator, Optional
 
-from docx import Document
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from integrations.db.session import get_session
+from integrations.render_cache import get_render_cache
 from models import FileGeneratedLetter
 from repositories.letter_repository import FileGeneratedLetterRepository
+from schemas.recommendation import LetterFormat
+from services.letter_renderer import (
+    get_render_version,
+    read_legacy_docx,
+    render_letter,
+)
+from settings import settings
 
 
 class LetterExportService:
     def __init__(
         self,
-        letters_dir: str = "./uploads/letters",
         session: AsyncSession = Depends(get_session),
     ):
-        self.letters_dir = Path(letters_dir)
-        self.letters_dir.mkdir(parents=True, exist_ok=True)
+        # Holds DOCX files of letters saved before their text was stored.
+        # Created once at startup, see services.letter_renderer.prepare_letters_dir.
+        self.letters_dir = Path(settings.letter.output_dir)
         self.letter_repository = FileGeneratedLetterRepository(session)
+        self.render_cache = get_render_cache()
 
     async def get_file_path(self, file_id: str) -> Path:
+        """Path of a DOCX letter saved before letter text was stored."""
         return self.letters_dir / f"{file_id}.docx"
 
-    async def create_file(self, letter_text: str) -> str:
-        document = Document()
-        paragraph_texts = [p.strip() for p in letter_text.split("\n\n") if p.strip()]
-        total_paragraphs = len(paragraph_texts)
+    async def create_letter(
+        self, letter_text: str, resume_id: str, filename: str
+    ) -> str:
+        """
+        Store the letter text and return the letter id.
 
-        for idx, paragraph_text in enumerate(paragraph_texts):
-            paragraph = document.add_paragraph(paragraph_text)
+        Files are rendered on demand by :meth:`render`, DOCX being the default
+        download format.
+        """
 
-            if not (idx < 2 or idx == total_paragraphs - 1):
-                paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
-
-        file_buffer = io.BytesIO()
-        document.save(file_buffer)
-        file_content = file_buffer.getvalue()
-
-        file_id = str(uuid.uuid4())
-        file_path = await self.get_file_path(file_id)
-        with open(file_path, "wb") as f:
-            f.write(file_content)
-
-        return file_id
-
-    async def save_file_metadata(
-        self, letter_id: str, resume_id: str, filename: str, file_extension: str
-    ) -> None:
+        letter_id = uuid.uuid4()
         model = FileGeneratedLetter(
             letter_id=letter_id,
             resume_id=resume_id,
             filename=filename,
-            file_extension=file_extension,
+            file_extension=LetterFormat.docx.value,
+            content=letter_text,
         )
         await self.letter_repository.create_model(model)
 
-    async def list_letters_by_resume(self, resume_id: str) -> list[dict]:
-        letters = await self.letter_repository.find_all_by(
-            limit=100,
+        return str(letter_id)
+
+    @staticmethod
+    def _get_render_key(letter_id: str, letter_format: LetterFormat) -> str:
+        version = get_render_version(letter_format)
+        return f"{letter_id}.{version}.{letter_format.value}"
+
+    async def get_etag(
+        self, letter_id: str, letter_format: LetterFormat
+    ) -> Optional[str]:
+        """
+        Entity tag of a rendered letter, or None if the letter doesn't exist.
+
+        The tag depends on the letter id, its modification time, the format
+        and the renderer version, so only the modification time is loaded.
+        """
+
+        row = await self.letter_repository.find_updated_at(letter_id)
+        if row is None:
+            return None
+
+        key = self._get_render_key(letter_id, letter_format)
+        if row.updated_at is not None:
+            key = f"{key}.{row.updated_at:%Y%m%d%H%M%S%f}"
+
+        return f'"{key}"'
+
+    async def render(
+        self, letter_id: str, letter_format: LetterFormat
+    ) -> Optional[Path]:
+        """
+        Path of the letter rendered in the requested format, or None if the
+        letter doesn't exist.
+
+        Renders are kept in the disk render cache, so repeat downloads don't
+        render again.
+        """
+
+        key = self._get_render_key(letter_id, letter_format)
+        if path := self.render_cache.get(key):
+            return path
+
+        letter_text = await self._get_letter_text(letter_id)
+        if letter_text is None:
+            return None
+
+        return await asyncio.to_thread(
+            self.render_cache.put,
+            key,
+            partial(render_letter, letter_text, letter_format),
+        )
+
+    async def _get_letter_text(self, letter_id: str) -> Optional[str]:
+        letters = await self.letter_repository.find_all_by(letter_id=letter_id, limit=1)
+        if not letters:
+            return None
+        if letters[0].content is not None:
+            return letters[0].content
+
+        legacy_path = await self.get_file_path(letter_id)
+        if legacy_path.exists():
+            return await asyncio.to_thread(read_legacy_docx, legacy_path)
+
+        return None
+
+    async def list_letters_by_resume(
+        self, resume_id: str, limit: int = 100, cursor: Optional[str] = None
+    ) -> tuple[list[dict], Optional[str]]:
+        letters, next_cursor = await self.letter_repository.find_page_by(
+            limit=limit, cursor=cursor, resume_id=resume_id
+        )
+
+        return [self._serialize(letter) for letter in letters], next_cursor
+
+    async def stream_letters_by_resume(self, resume_id: str) -> AsyncIterator[dict]:
+        async for letter in self.letter_repository.stream_all_by(
             resume_id=resume_id,
             order_by=self.letter_repository.get_attr("created_at").desc(),
-        )
-        return [
-            {
-                "letter_id": str(letter.letter_id),
-                "filename": letter.filename,
-                "file_extension": letter.file_extension,
-                "created_at": (
-                    letter.created_at.isoformat() if letter.created_at else None
-                ),
-            }
-            for letter in letters
-        ]
+        ):
+            yield self._serialize(letter)
+
+    @staticmethod
+    def _serialize(letter: FileGeneratedLetter) -> dict:
+        return {
+            "letter_id": str(letter.letter_id),
+            "filename": letter.filename,
+            "file_extension": letter.file_extension,
+            "created_at": (
+                letter.created_at.isoformat() if letter.created_at else None
+            ),
+        }
 
     async def delete_letter(self, letter_id: uuid.UUID) -> None:
         letter_record = await self.letter_repository.find_all_by(
@@ -83,6 +154,7 @@ class LetterExportService:
         if letter_record and letter_record[0]:
             await self.letter_repository.delete_by(id=letter_record[0].id)
 
+        self.render_cache.delete_prefix(f"{letter_id}.")
         file_path = await self.get_file_path(str(letter_id))
         if file_path and file_path.exists():
             file_path.unlink()
@@ -0,0 +1,332 @@
+import hashlib
+import io
+import re
+import zipfile
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+import docx
+from docx import Document
+
+from schemas.recommendation import LetterFormat
+from settings import settings
+
+DEFAULT_TEMPLATE_PATH = Path(docx.__file__).parent / "templates" / "default.docx"
+OFFICE_DOCUMENT_RELATIONSHIP = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+)
+
+# Bump when the output of a renderer changes, so that cached renders are
+# invalidated. DOCX renders are additionally versioned by the template.
+RENDERER_VERSION = "2"
+
+# Characters not allowed in XML 1.0 documents, even escaped: C0 controls other
+# than tab, line feed and carriage return, surrogates, U+FFFE and U+FFFF.
+_XML_INVALID_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+MEDIA_TYPES = {
+    LetterFormat.docx: "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    LetterFormat.pdf: "application/pdf",
+    LetterFormat.md: "text/markdown; charset=utf-8",
+    LetterFormat.txt: "text/plain; charset=utf-8",
+}
+
+
+class DocxTemplate:
+    """
+    DOCX package loaded once and reused for every rendered letter.
+
+    Styles, numbering, theme and the rest of the package are compressed once
+    into a static archive. Rendering copies it and appends only the main
+    document part, instead of parsing and re-serialising the whole template
+    with python-docx.
+    """
+
+    def __init__(self, data: bytes):
+        self.version = hashlib.sha256(data).hexdigest()[:16]
+        package = io.BytesIO()
+        with zipfile.ZipFile(io.BytesIO(data)) as source, zipfile.ZipFile(
+            package, "w", zipfile.ZIP_DEFLATED
+        ) as archive:
+            document_part = self._find_document_part(source)
+            for info in source.infolist():
+                if info.filename == document_part:
+                    self.document_info = info
+                    document_xml = source.read(info).decode("utf-8")
+                else:
+                    archive.writestr(info, source.read(info))
+        self.package = package.getvalue()
+
+        # New paragraphs go after the template body, before its section properties.
+        body_end = document_xml.rfind("<w:sectPr")
+        if body_end == -1:
+            body_end = document_xml.rindex("</w:body>")
+        self.head, self.tail = document_xml[:body_end], document_xml[body_end:]
+
+    @staticmethod
+    def _find_document_part(archive: zipfile.ZipFile) -> str:
+        relationships = ElementTree.fromstring(archive.read("_rels/.rels"))
+        for relationship in relationships:
+            if relationship.get("Type") == OFFICE_DOCUMENT_RELATIONSHIP:
+                return relationship.get("Target").lstrip("/")
+
+        raise ValueError("DOCX template has no main document part.")
+
+    @staticmethod
+    def _paragraph_xml(text: str, justify: bool) -> str:
+        properties = '<w:pPr><w:jc w:val="both"/></w:pPr>' if justify else ""
+        lines = "<w:br/>".join(
+            f'<w:t xml:space="preserve">{escape(line)}</w:t>'
+            for line in _XML_INVALID_CHARS.sub("", text).split("\n")
+        )
+        return f"<w:p>{properties}<w:r>{lines}</w:r></w:p>"
+
+    def render(self, paragraph_texts: list[str], file: BinaryIO) -> None:
+        """
+        Write a DOCX with the given paragraphs appended to the template body.
+
+        Every paragraph except the first two and the last one is justified.
+        """
+
+        body = "".join(
+            self._paragraph_xml(
+                paragraph_text, justify=is_justified(idx, paragraph_texts)
+            )
+            for idx, paragraph_text in enumerate(paragraph_texts)
+        )
+
+        buffer = io.BytesIO(self.package)
+        with zipfile.ZipFile(buffer, "a", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(
+                self.document_info, f"{self.head}{body}{self.tail}".encode("utf-8")
+            )
+        file.write(buffer.getbuffer())
+
+
+@lru_cache
+def load_template(template_path: Optional[str] = None) -> DocxTemplate:
+    """
+    Load the DOCX template once per process.
+
+    The template carries the styles of generated letters. Without a
+    configured path the template bundled with python-docx is used, the same
+    one ``docx.Document()`` starts from.
+    """
+
+    return DocxTemplate(Path(template_path or DEFAULT_TEMPLATE_PATH).read_bytes())
+
+
+def split_paragraphs(letter_text: str) -> list[str]:
+    return [p.strip() for p in letter_text.split("\n\n") if p.strip()]
+
+
+def is_justified(idx: int, paragraph_texts: list[str]) -> bool:
+    """The greeting, the opening line and the signature keep left alignment."""
+
+    return not (idx < 2 or idx == len(paragraph_texts) - 1)
+
+
+# Helvetica advance widths (1/1000 em) of WinAnsi characters other than 556.
+_HELVETICA_WIDTHS = {
+    **dict.fromkeys(b" !,./:;[\\]Ift", 278),
+    **dict.fromkeys(b"()-`r", 333),
+    **dict.fromkeys(b"+<=>~", 584),
+    **dict.fromkeys(b"ABEKPSVXY", 667),
+    **dict.fromkeys(b"CDHNRUw", 722),
+    **dict.fromkeys(b"GOQ", 778),
+    **dict.fromkeys(b"FTZ", 611),
+    **dict.fromkeys(b"Mm", 833),
+    **dict.fromkeys(b"Jcksvxyz", 500),
+    **dict.fromkeys(b"ijl", 222),
+    **dict.fromkeys(b"{}", 334),
+    ord('"'): 355,
+    ord("'"): 191,
+    ord("%"): 889,
+    ord("&"): 667,
+    ord("*"): 389,
+    ord("@"): 1015,
+    ord("W"): 944,
+    ord("^"): 469,
+    ord("|"): 260,
+    0x85: 1000,  # ellipsis
+    0x91: 222,  # quoteleft
+    0x92: 222,  # quoteright
+    0x93: 333,  # quotedblleft
+    0x94: 333,  # quotedblright
+    0x95: 350,  # bullet
+    0x97: 1000,  # emdash
+}
+
+PDF_PAGE_WIDTH, PDF_PAGE_HEIGHT = 595.28, 841.89  # A4
+PDF_MARGIN = 72.0
+PDF_FONT_SIZE = 11.0
+PDF_LEADING = 15.0
+PDF_PARAGRAPH_SPACING = 8.0
+
+
+def _pdf_text_width(text: bytes) -> float:
+    return sum(_HELVETICA_WIDTHS.get(char, 556) for char in text) * PDF_FONT_SIZE / 1000
+
+
+def _pdf_wrap(line: str, max_width: float) -> list[bytes]:
+    """Greedily wrap a line into WinAnsi encoded lines that fit ``max_width``."""
+
+    space_width = _pdf_text_width(b" ")
+    words = line.encode("cp1252", errors="replace").split()
+    lines, current, current_width = [], [], 0.0
+    for word in words:
+        word_width = _pdf_text_width(word)
+        if current and current_width + space_width + word_width > max_width:
+            lines.append(b" ".join(current))
+            current, current_width = [], 0.0
+        current_width += word_width + (space_width if current else 0)
+        current.append(word)
+    lines.append(b" ".join(current))
+
+    return lines
+
+
+def _pdf_escape(text: bytes) -> bytes:
+    return text.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def render_pdf(paragraph_texts: list[str], file: BinaryIO) -> None:
+    """
+    Write a single-font A4 PDF.
+
+    Uses the standard Helvetica font with WinAnsi encoding, so no font files
+    or external services are needed. Characters outside of Windows-1252 are
+    replaced with ``?``; letters are generated in English.
+    """
+
+    text_width = PDF_PAGE_WIDTH - 2 * PDF_MARGIN
+    top = PDF_PAGE_HEIGHT - PDF_MARGIN - PDF_FONT_SIZE
+    pages: list[list[bytes]] = [[]]
+    y = top
+    for idx, paragraph_text in enumerate(paragraph_texts):
+        justify = is_justified(idx, paragraph_texts)
+        for line in paragraph_text.split("\n"):
+            wrapped = _pdf_wrap(line, text_width)
+            for line_idx, chunk in enumerate(wrapped):
+                if y < PDF_MARGIN:
+                    pages.append([])
+                    y = top
+                word_spacing = 0.0
+                spaces = chunk.count(b" ")
+                if justify and spaces and line_idx < len(wrapped) - 1:
+                    word_spacing = (text_width - _pdf_text_width(chunk)) / spaces
+                pages[-1].append(
+                    b"%.3f Tw 1 0 0 1 %.2f %.2f Tm (%s) Tj"
+                    % (word_spacing, PDF_MARGIN, y, _pdf_escape(chunk))
+                )
+                y -= PDF_LEADING
+        y -= PDF_PARAGRAPH_SPACING
+
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and its content per page.
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (b" ".join(b"%d 0 R" % page_id for page_id in page_ids), len(pages)),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+        b"/Encoding /WinAnsiEncoding >>",
+    ]
+    for page_id, page_lines in zip(page_ids, pages):
+        content = zlib.compress(
+            b"BT /F1 %.1f Tf\n%s\nET" % (PDF_FONT_SIZE, b"\n".join(page_lines))
+        )
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (PDF_PAGE_WIDTH, PDF_PAGE_HEIGHT, page_id + 1)
+        )
+        objects.append(
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream"
+            % (len(content), content)
+        )
+
+    buffer = io.BytesIO()
+    buffer.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for object_id, body in enumerate(objects, start=1):
+        offsets.append(buffer.tell())
+        buffer.write(b"%d 0 obj\n%s\nendobj\n" % (object_id, body))
+    xref_offset = buffer.tell()
+    buffer.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    buffer.writelines(b"%010d 00000 n \n" % offset for offset in offsets)
+    buffer.write(
+        b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, xref_offset)
+    )
+    file.write(buffer.getbuffer())
+
+
+_MARKDOWN_SPECIAL = re.compile(r"([\\`*_\[\]<>])")
+_MARKDOWN_LINE_START = re.compile(r"^(#|[-+]\s|\d+[.)]\s)")
+
+
+def render_markdown(paragraph_texts: list[str], file: BinaryIO) -> None:
+    """Write paragraphs as Markdown, escaping characters that would format."""
+
+    paragraphs = []
+    for paragraph_text in paragraph_texts:
+        lines = [
+            _MARKDOWN_LINE_START.sub(r"\\\1", _MARKDOWN_SPECIAL.sub(r"\\\1", line))
+            for line in paragraph_text.split("\n")
+        ]
+        paragraphs.append("  \n".join(lines))
+    file.write(("\n\n".join(paragraphs) + "\n").encode("utf-8"))
+
+
+def render_text(paragraph_texts: list[str], file: BinaryIO) -> None:
+    file.write(("\n\n".join(paragraph_texts) + "\n").encode("utf-8"))
+
+
+def render_docx(paragraph_texts: list[str], file: BinaryIO) -> None:
+    load_template(settings.letter.template_path).render(paragraph_texts, file)
+
+
+RENDERERS: dict[LetterFormat, Callable[[list[str], BinaryIO], None]] = {
+    LetterFormat.docx: render_docx,
+    LetterFormat.pdf: render_pdf,
+    LetterFormat.md: render_markdown,
+    LetterFormat.txt: render_text,
+}
+
+
+def get_render_version(letter_format: LetterFormat) -> str:
+    if letter_format == LetterFormat.docx:
+        template = load_template(settings.letter.template_path)
+        return f"{RENDERER_VERSION}-{template.version}"
+
+    return RENDERER_VERSION
+
+
+def render_letter(
+    letter_text: str, letter_format: LetterFormat, file: BinaryIO
+) -> None:
+    """
+    Render the letter in the requested format into a binary file.
+    """
+
+    RENDERERS[letter_format](split_paragraphs(letter_text), file)
+
+
+def read_legacy_docx(file_path: Path) -> str:
+    """Recover the text of a letter stored only as a DOCX file."""
+
+    return "\n\n".join(paragraph.text for paragraph in Document(file_path).paragraphs)
+
+
+def prepare_letters_dir() -> Path:
+    """Create the letters directory and warm the template cache."""
+
+    letters_dir = Path(settings.letter.output_dir)
+    letters_dir.mkdir(parents=True, exist_ok=True)
+    load_template(settings.letter.template_path)
+
+    return letters_dir
@@ -1,97 +1,222 @@
+import asyncio
+import time
 from datetime import datetime
-from pathlib import Path
+from typing import AsyncIterator, Awaitable, TypeVar
+from uuid import UUID
 
-from baml_client.async_client import b
+from baml_client.async_client import BamlAsyncClient
 from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import UUID5
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
-from integrations.db.session import get_session
+from integrations.db.session import get_session_factory
+from integrations.llm import get_llm_client
+from logger import logger
 from repositories.ner_repository import NERRepository
-from repositories.user_entity_research_repository import NEREntityResearchRepository
 from schemas.recommendation import RecommendationRequest
-from services.vector_store_service import VectorStoreService
-
-
-FEW_SHOT_EXAMPLES_DIR = "./data/few_shot_letters/{recommendation_type}"
+from services.context_budgeter import ContextBudgeter
+from services.few_shot_example_store import (
+    FewShotExampleStore,
+    get_few_shot_example_store,
+)
+from services.vector_store_service import (
+    VectorStoreService,
+    get_vector_store_service,
+)
+from settings import settings
+from utils.tokens import get_tokenizer
+
+T = TypeVar("T")
+
+PRINCIPAL_RETRIEVAL_QUERY = (
+    "Key strengths, achievements, and professional background to recommend."
+)
+GRANTEE_RETRIEVAL_QUERY = "Key achievements, skills, and potential for recommendation."
+# Constant queries, their embeddings are pre-warmed in the application lifespan.
+RETRIEVAL_QUERIES = (PRINCIPAL_RETRIEVAL_QUERY, GRANTEE_RETRIEVAL_QUERY)
+
+
+class LetterStream:
+    """
+    Text deltas of a streamed letter.
+
+    Deltas are emitted only while partial responses extend the text sent so
+    far. BAML partials are not guaranteed to be prefixes of the final parse,
+    so once the iteration ends :attr:`text` holds the final response, which
+    is what should be stored and sent to the client in place of the deltas.
+    """
+
+    def __init__(self, stream) -> None:
+        self.stream = stream
+        self.text: str | None = None
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        emitted = ""
+        async for partial in self.stream:
+            if partial and partial.startswith(emitted) and len(partial) > len(emitted):
+                yield partial[len(emitted) :]
+                emitted = partial
+
+        self.text = await self.stream.get_final_response()
+        if self.text.startswith(emitted) and len(self.text) > len(emitted):
+            yield self.text[len(emitted) :]
 
 
 class RecommendationService:
-    def __init__(self, session: AsyncSession = Depends(get_session)):
-        self.session = session
-        self.research_repository = NEREntityResearchRepository(session)
-        self.entity_repository = NERRepository(session)
-        self.vector_store_service = VectorStoreService()
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = Depends(get_session_factory),
+        vector_store_service: VectorStoreService = Depends(get_vector_store_service),
+        llm_client: BamlAsyncClient = Depends(get_llm_client),
+        few_shot_example_store: FewShotExampleStore = Depends(
+            get_few_shot_example_store
+        ),
+    ):
+        self.session_factory = session_factory
+        self.vector_store_service = vector_store_service
+        self.llm_client = llm_client
+        self.few_shot_example_store = few_shot_example_store
 
     async def generate(self, request: RecommendationRequest):
+        context = await self.assemble_context(request)
+
+        return await self.llm_client.GenerateRecommendationLetter(**context)
+
+    def stream_letter(self, context: dict) -> LetterStream:
+        """
+        Stream the letter for an assembled context.
+
+        :param context: Prompt inputs from :meth:`assemble_context`
+        :return: Iterator of text deltas, holding the final letter once exhausted
+        """
+
+        return LetterStream(
+            self.llm_client.stream.GenerateRecommendationLetter(**context)
+        )
+
+    async def assemble_context(self, request: RecommendationRequest) -> dict:
+        """
+        Collect all prompt inputs for the letter generation.
+
+        Independent lookups run concurrently, the database lookup in its own
+        session, so the stage takes as long as the slowest dependency. Facts
+        and research of both resumes are loaded with a single query. Inputs
+        are then fitted into their token budgets in a worker thread.
+        """
+
         principal_resume_id = request.personalities.principal.resume.file_id
         grantee_resume_id = request.personalities.grantee.resume.file_id
-        circumstances = request.personalities.circumstances or ""
-        directives = request.recommendation.directives or ""
         recommendation_type = request.recommendation.type.value
-
-        principal_resume_facts = await self.entity_repository.find_all_by(
-            resume_id=principal_resume_id, limit=1
+        timings: dict[str, float] = {}
+
+        # Examples are ranked by the request itself, so they're looked up
+        # together with the retrievals instead of after them.
+        few_shot_query = (
+            "\n\n".join(
+                filter(
+                    None,
+                    [
+                        request.recommendation.directives,
+                        request.personalities.circumstances,
+                    ],
+                )
+            ).strip()
+            or GRANTEE_RETRIEVAL_QUERY
         )
-        grantee_resume_facts = await self.entity_repository.find_all_by(
-            resume_id=grantee_resume_id, limit=1
+
+        (
+            resume_contexts,
+            principal_context,
+            grantee_context,
+            few_shot_examples,
+        ) = await asyncio.gather(
+            self._timed(
+                timings,
+                "facts_and_research",
+                self._find_resume_contexts([principal_resume_id, grantee_resume_id]),
+            ),
+            self._timed(
+                timings,
+                "principal_retrieval",
+                self.vector_store_service.retrieve(
+                    query=PRINCIPAL_RETRIEVAL_QUERY,
+                    resume_id=str(principal_resume_id),
+                ),
+            ),
+            self._timed(
+                timings,
+                "grantee_retrieval",
+                self.vector_store_service.retrieve(
+                    query=GRANTEE_RETRIEVAL_QUERY,
+                    resume_id=str(grantee_resume_id),
+                ),
+            ),
+            self._timed(
+                timings,
+                "few_shot_examples",
+                self.few_shot_example_store.get(
+                    recommendation_type,
+                    query=few_shot_query,
+                    k=settings.few_shot.top_k,
+                ),
+            ),
         )
+        logger.info("Recommendation context assembled.", timings_ms=timings)
 
-        if not principal_resume_facts or not grantee_resume_facts:
+        principal = resume_contexts.get(principal_resume_id)
+        grantee = resume_contexts.get(grantee_resume_id)
+        if not principal or not grantee:
             raise ValueError("Resume facts not found in the database.")
 
-        principal_facts = principal_resume_facts[0].facts
-        grantee_facts = grantee_resume_facts[0].facts
+        research_map = {**(principal.research or {}), **(grantee.research or {})}
 
-        principal_researches = list(
-            await self.research_repository.find_all_with_selection_by_resume(
-                resume_id=principal_resume_id
+        def fit_to_budget() -> dict:
+            # Chunks are deduplicated against the full research before it is cut.
+            principal_chunks = budgeter.fit_chunks(
+                "principal_context", principal_context, research_map.values()
             )
-        )
-        grantee_researches = list(
-            await self.research_repository.find_all_with_selection_by_resume(
-                resume_id=grantee_resume_id
+            grantee_chunks = budgeter.fit_chunks(
+                "grantee_context", grantee_context, research_map.values()
             )
-        )
-        research_map = {
-            res.selection.entity: res.research
-            for res in principal_researches + grantee_researches
-            if res.selection is not None
-        }
-
-        principal_context = await self.vector_store_service.retrieve(
-            query="Key strengths, achievements, and professional background to recommend.",
-            resume_id=str(principal_resume_id),
-        )
-
-        grantee_context = await self.vector_store_service.retrieve(
-            query="Key achievements, skills, and potential for recommendation.",
-            resume_id=str(grantee_resume_id),
-        )
-        few_shot_examples = await self.load_few_shot_examples(
-            recommendation_type=recommendation_type
-        )
-
-        return await b.GenerateRecommendationLetter(
-            principal_facts=principal_facts,
-            grantee_facts=grantee_facts,
-            principal_context="\n\n".join(principal_context).strip(),
-            grantee_context="\n\n".join(grantee_context).strip(),
-            recommendation_type=recommendation_type,
-            directives=directives,
-            circumstances=circumstances,
-            entity_research=research_map,
-            few_shot_examples=few_shot_examples,
-            extra={"current_date": datetime.today().strftime("%Y-%m-%d")},
-        )
+            return {
+                "principal_facts": budgeter.fit_facts(
+                    "principal_facts", principal.facts
+                ),
+                "grantee_facts": budgeter.fit_facts("grantee_facts", grantee.facts),
+                "principal_context": "\n\n".join(principal_chunks).strip(),
+                "grantee_context": "\n\n".join(grantee_chunks).strip(),
+                "recommendation_type": recommendation_type,
+                "directives": request.recommendation.directives or "",
+                "circumstances": request.personalities.circumstances or "",
+                "entity_research": budgeter.fit_research(
+                    "entity_research", research_map
+                ),
+                "few_shot_examples": budgeter.fit_examples(
+                    "few_shot_examples", few_shot_examples
+                ),
+                "extra": {"current_date": datetime.today().strftime("%Y-%m-%d")},
+            }
+
+        # Tokenizing oversized resumes takes long enough to stall the event loop.
+        budgeter = ContextBudgeter(settings.prompt_budget, get_tokenizer())
+        context = await asyncio.to_thread(fit_to_budget)
+        logger.info("Recommendation prompt budgeted.", **budgeter.report)
+
+        return context
 
     @staticmethod
-    async def load_few_shot_examples(recommendation_type: str) -> str:
-        examples = []
-        examples_dir = Path(
-            FEW_SHOT_EXAMPLES_DIR.format(recommendation_type=recommendation_type)
-        )
-        for file_path in sorted(examples_dir.glob("*.txt")):
-            with open(file_path, "r", encoding="utf-8") as f:
-                examples.append(f.read().strip())
-
-        return "\n\n---\n\n".join(examples)
+    async def _timed(
+        timings: dict[str, float], stage: str, awaitable: Awaitable[T]
+    ) -> T:
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            timings[stage] = round((time.perf_counter() - started) * 1000, 2)
+
+    async def _find_resume_contexts(self, resume_ids: list[UUID5]) -> dict[UUID, Row]:
+        async with self.session_factory() as session:
+            rows = await NERRepository(session).find_context_by_resumes(resume_ids)
+
+        return {row.resume_id: row for row in rows}
@@ -0,0 +1,93 @@
+import asyncio
+
+from celery.result import AsyncResult
+from fastapi import Depends
+from pydantic import UUID5
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from integrations.celery_app import celery_app
+from integrations.db.session import get_session
+from repositories.file_repository import PARSE_FAILED, FileResumeRepository
+from schemas.files import JobStatusResponse
+from services.vector_store_service import VectorStoreService, get_vector_store_service
+from settings import settings
+from tasks.resume import parse_resume
+
+QUEUED = "QUEUED"
+
+
+class ResumeJobService:
+    """
+    Background resume parsing jobs.
+
+    Job ids are derived from the content-hash resume id. A finished job is
+    returned as is, and the parse status of the resume is claimed with a
+    conditional update, so concurrent requests enqueue a resume only once.
+    Claims older than ``settings.worker.parse_claim_timeout_seconds``, left
+    by a lost message or a crashed worker, can be taken over.
+
+    The worker writes the resume chunks from its own process, so cached
+    state of the resume in this process is dropped once a job succeeds.
+    """
+
+    JOB_ID_PREFIX = "resume-parse-"
+
+    def __init__(
+        self,
+        session: AsyncSession = Depends(get_session),
+        vector_store_service: VectorStoreService = Depends(get_vector_store_service),
+    ):
+        self.session = session
+        self.repository = FileResumeRepository(session)
+        self.vector_store_service = vector_store_service
+
+    @classmethod
+    def get_job_id(cls, file_id: UUID5) -> str:
+        return f"{cls.JOB_ID_PREFIX}{file_id}"
+
+    async def enqueue_parse(self, file_id: UUID5) -> JobStatusResponse:
+        job_id = self.get_job_id(file_id)
+        job_status = await self.get_status(job_id)
+        if job_status.status == "success":
+            return job_status
+
+        claimed = await self.repository.claim_parse(
+            file_id, timeout_seconds=settings.worker.parse_claim_timeout_seconds
+        )
+        # The worker must see the claim, so it's committed before sending.
+        await self.session.commit()
+        if not claimed:
+            return job_status
+
+        try:
+            await asyncio.to_thread(self._send, job_id, str(file_id))
+        except Exception:
+            await self.repository.set_parse_status(file_id, PARSE_FAILED)
+            await self.session.commit()
+            raise
+
+        return await self.get_status(job_id)
+
+    async def get_status(self, job_id: str) -> JobStatusResponse:
+        job_status = await asyncio.to_thread(self._get_status, job_id)
+        if job_status.status == "success" and job_id.startswith(self.JOB_ID_PREFIX):
+            self.vector_store_service.invalidate(job_id[len(self.JOB_ID_PREFIX) :])
+
+        return job_status
+
+    @staticmethod
+    def _send(job_id: str, file_id: str) -> None:
+        celery_app.backend.store_result(job_id, None, QUEUED)
+        parse_resume.apply_async(args=[file_id], task_id=job_id)
+
+    @staticmethod
+    def _get_status(job_id: str) -> JobStatusResponse:
+        result = AsyncResult(job_id, app=celery_app)
+        state = result.state
+
+        return JobStatusResponse(
+            job_id=job_id,
+            status=state.lower(),
+            result=result.result if state == "SUCCESS" else None,
+            error=str(result.result) if state == "FAILURE" else None,
+        )
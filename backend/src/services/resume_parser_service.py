@@ -1,7 +1,12 @@
 import asyncio
 import io
+import math
+import os
+import threading
+import uuid
 from pathlib import Path
 
+
 import aiofiles
 import docx
 import pypdf
@@ -9,8 +14,46 @@ from baml_client.async_client import b
 from baml_client.types import Resume
 from fastapi import HTTPException
 
+from exceptions import ResumeExtractionTimeout
+from integrations.llm_cache import get_llm_result_cache
+from integrations.process_pool import (
+    get_worker_count,
+    recycle_process_pool,
+    run_cpu_bound,
+)
+from settings import settings
 from utils.text import normalize_whitespace
 
+_pdf_readers = threading.local()
+
+
+def _open_pdf(file_content: bytes) -> pypdf.PdfReader:
+    """
+    Open a PDF, reusing the reader of the previous call with the same content.
+
+    Shards of a document scheduled on the same worker share the parsed
+    document. Readers are not thread-safe, so the cache is per thread.
+    """
+
+    cached = getattr(_pdf_readers, "cached", None)
+    if cached is None or cached[0] != file_content:
+        cached = (file_content, pypdf.PdfReader(io.BytesIO(file_content)))
+        _pdf_readers.cached = cached
+
+    return cached[1]
+
+
+def _count_pdf_pages(file_content: bytes) -> int:
+    """Count pages of a PDF file."""
+    return len(_open_pdf(file_content).pages)
+
+
+def _read_pdf_pages(file_content: bytes, start: int, stop: int) -> str:
+    """Read text of the PDF pages in the ``[start, stop)`` range."""
+    reader = _open_pdf(file_content)
+    texts = (reader.pages[i].extract_text() for i in range(start, stop))
+    return "\n".join(filter(None, texts))
+
 
 class ResumeParserService:
     async def get_resume_text(self, file_id: str) -> str:
@@ -23,13 +66,38 @@ class ResumeParserService:
         return text
 
     async def parse_resume(self, file_path: Path) -> str:
-        """Parses resume, extracts text, runs entity recognition, and triggers entity research."""
+        """
+        Extract normalized resume text.
+
+        File names are content-derived ids, so the extracted text is cached
+        next to the upload directory and reused on repeat parses.
+        """
+
+        cache_path = self.get_text_cache_path(file_path.stem)
+        if cache_path.exists():
+            async with aiofiles.open(cache_path, "r", encoding="utf-8") as file:
+                return await file.read()
 
         file_extension = file_path.suffix.lower()
         async with aiofiles.open(file_path, "rb") as file:
             file_content = await file.read()
 
-        return await self._extract_text(file_content, file_extension)
+        text = await self._extract_text(file_content, file_extension)
+        await self._write_text_cache(cache_path, text)
+
+        return text
+
+    @staticmethod
+    def get_text_cache_path(file_id: str) -> Path:
+        return Path(settings.resume.text_cache_dir) / f"{file_id}.txt"
+
+    @staticmethod
+    async def _write_text_cache(cache_path: Path, text: str) -> None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f".{cache_path.name}.{uuid.uuid4().hex}.tmp")
+        async with aiofiles.open(tmp_path, "w", encoding="utf-8") as file:
+            await file.write(text)
+        os.replace(tmp_path, cache_path)
 
     async def _extract_text(self, file_content: bytes, file_extension: str) -> str:
         """Extract text from a given file content based on its extension."""
@@ -46,23 +114,49 @@ class ResumeParserService:
                 f"Unsupported file type: {file_extension}. Only PDF, DOCX, and TXT are allowed."
             )
 
-        return normalize_whitespace(await extract_method(file_content))
+        try:
+            text = await asyncio.wait_for(
+                extract_method(file_content),
+                timeout=settings.extraction.timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            # The extraction keeps running in its worker until killed.
+            recycle_process_pool()
+            raise ResumeExtractionTimeout(
+                f"Resume text extraction timed out after "
+                f"{settings.extraction.timeout_seconds} seconds."
+            )
+
+        return normalize_whitespace(text)
 
     async def _extract_text_from_pdf(self, file_content: bytes) -> str:
-        """Extract text from a PDF file."""
-        reader = pypdf.PdfReader(io.BytesIO(file_content))
-        tasks = [self._extract_page_text(page) for page in reader.pages]
-        extracted_texts = await asyncio.gather(*tasks)
+        """
+        Extract text from a PDF file, decoding page ranges in parallel.
+
+        Pages are split into at most one contiguous range per worker, so the
+        document is opened at most once per worker.
+        """
+        page_count = await run_cpu_bound(_count_pdf_pages, file_content)
+        shard_size = max(
+            settings.extraction.pages_per_shard,
+            math.ceil(page_count / get_worker_count()),
+        )
+        extracted_texts = await asyncio.gather(
+            *(
+                run_cpu_bound(
+                    _read_pdf_pages,
+                    file_content,
+                    start,
+                    min(start + shard_size, page_count),
+                )
+                for start in range(0, page_count, shard_size)
+            )
+        )
         return "\n".join(filter(None, extracted_texts)).strip()
 
-    @staticmethod
-    async def _extract_page_text(page) -> str:
-        """Extract text from a single PDF page."""
-        return page.extract_text() or ""
-
     async def _extract_text_from_docx(self, file_content: bytes) -> str:
         """Extract text from a DOCX file."""
-        return await asyncio.to_thread(self._read_docx, file_content)
+        return await run_cpu_bound(self._read_docx, file_content)
 
     @staticmethod
     def _read_docx(file_content: bytes) -> str:
@@ -79,6 +173,16 @@ class ResumeParserService:
         return file_content.decode("utf-8").strip()
 
     @staticmethod
-    async def extract_facts(text: str) -> Resume:
+    async def extract_facts(text: str, bypass_cache: bool = False) -> Resume:
         """Extract structured information using BAML API."""
-        return await b.ExtractResume(text)
+        cache = get_llm_result_cache()
+        if cache is None:
+            return await b.ExtractResume(text)
+
+        return await cache.get_or_call(
+            "ExtractResume",
+            text,
+            lambda: b.ExtractResume(text),
+            Resume,
+            bypass=bypass_cache,
+        )
@@ -0,0 +1,55 @@
+from fastapi import Depends
+from pydantic import UUID5
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from exceptions import ResumeFileNotFound
+from integrations.db.session import get_session
+from schemas.ner import NERResult
+from services.ner_service import NERService
+from services.resume_parser_service import ResumeParserService
+from services.resume_service import ResumeService
+from services.vector_store_service import (
+    VectorStoreService,
+    get_vector_store_service,
+)
+
+
+class ResumePipelineService:
+    """
+    Full resume parsing pipeline: text extraction, facts extraction,
+    vector store refresh and named entity extraction.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession = Depends(get_session),
+        vector_store_service: VectorStoreService = Depends(get_vector_store_service),
+    ):
+        self.resume_service = ResumeService(session)
+        self.resume_parser_service = ResumeParserService()
+        self.ner_service = NERService(session)
+        self.vector_store_service = vector_store_service
+
+    async def parse(self, file_id: UUID5, bypass_cache: bool = False) -> NERResult:
+        """
+        Run the pipeline for an uploaded resume.
+
+        :raises ResumeFileNotFound: The resume file doesn't exist
+        """
+
+        file_path = await self.resume_service.get_file_path(file_id)
+        if not file_path or not file_path.exists():
+            raise ResumeFileNotFound(file_id)
+
+        text = await self.resume_parser_service.parse_resume(file_path)
+        facts = await self.resume_parser_service.extract_facts(
+            text, bypass_cache=bypass_cache
+        )
+
+        await self.ner_service.store_facts(file_id, facts)
+
+        await self.vector_store_service.refresh_document(
+            text=text, metadata={"resume_id": str(file_id), "type": "resume_text"}
+        )
+
+        return await self.ner_service.extract_entities(file_id, facts, language="ru")
@@ -1,18 +1,33 @@
 from __future__ import annotations
 
 import hashlib
+import os
 import uuid
 from pathlib import Path
+from typing import AsyncIterator
 
-from fastapi import Depends
+import aiofiles
+from fastapi import Depends, UploadFile
 from pydantic.v1 import UUID5
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from exceptions import ResumeTooLarge, UnsupportedResume
 from integrations.db.session import get_session
 from logger import logger
 from models.file import FileResume
 from repositories.file_repository import FileResumeRepository
+from services.resume_parser_service import ResumeParserService
 from settings import settings
+from utils.lru_cache import LRUCache
+
+_file_path_cache: LRUCache[str, Path] = LRUCache(settings.resume.path_cache_size)
+
+
+def get_size_limit_message() -> str:
+    return (
+        f"File is too large. Maximum allowed size is "
+        f"{settings.resume.max_file_size_mb}MB."
+    )
 
 
 class ResumeService:
@@ -21,24 +36,53 @@ class ResumeService:
         self.upload_dir.mkdir(parents=True, exist_ok=True)
         self.file_resume_repository = FileResumeRepository(session)
 
-    async def save_file(
-        self, file_content: bytes, file_extension: str
+    async def save_upload(
+        self, file: UploadFile, file_extension: str
     ) -> tuple[str, bool]:
         """
-        Save file only if it does not exist.
-        """
+        Stream an upload to disk and store it under its content-derived id.
 
-        file_id = await self._generate_file_id(file_content)
-        new_filename = f"{file_id}.{file_extension}"
-        file_path = self.upload_dir / new_filename
+        The file is read in chunks, hashed on the fly and written to a
+        temporary file, which is atomically renamed unless a file with the
+        same content already exists, in the sharded or the legacy flat
+        layout. Reading stops as soon as the size limit is exceeded.
 
-        if file_path.exists():
-            logger.info("Uploaded file exists. Skipping.")
-            return file_id, False
+        :raises UnsupportedResume: The extension is not allowed
+        :raises ResumeTooLarge: The file exceeds the size limit
+        """
 
-        with open(file_path, "wb") as f:
+        if file_extension not in settings.resume.allowed_extensions:
+            raise UnsupportedResume(
+                f"Invalid file type. Only "
+                f"{', '.join(sorted(settings.resume.allowed_extensions))} allowed."
+            )
+
+        max_size = settings.resume.max_file_size_mb * 1024 * 1024
+        chunk_size = settings.resume.upload_chunk_size_kb * 1024
+        content_hash = hashlib.sha256()
+        size = 0
+
+        tmp_path = self.upload_dir / f".{uuid.uuid4().hex}.upload"
+        try:
+            async with aiofiles.open(tmp_path, "wb") as f:
+                while chunk := await file.read(chunk_size):
+                    size += len(chunk)
+                    if size > max_size:
+                        raise ResumeTooLarge(get_size_limit_message())
+                    content_hash.update(chunk)
+                    await f.write(chunk)
+
+            file_id = await self._generate_file_id(content_hash.hexdigest())
+            if await self.get_file_path(file_id):
+                logger.info("Uploaded file exists. Skipping.")
+                return file_id, False
+
+            file_path = self.get_shard_dir(file_id) / f"{file_id}.{file_extension}"
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, file_path)
             logger.info("Uploaded file has been saved.")
-            f.write(file_content)
+        finally:
+            tmp_path.unlink(missing_ok=True)
 
         return file_id, True
 
@@ -64,33 +108,57 @@ class ResumeService:
             )
             await self.file_resume_repository.create_model(model)
 
+    def get_shard_dir(self, file_id: str) -> Path:
+        """
+        Directory of a resume in the sharded layout: ``<upload_dir>/ab/cd/``.
+        """
+
+        return self.upload_dir / file_id[:2] / file_id[2:4]
+
     async def get_file_path(self, file_id: UUID5) -> Path | None:
         """
         Retrieve the file path based on file_id.
+
+        Checks the sharded location for every allowed extension, then the
+        legacy flat layout, so a lookup never scans the upload directory.
         """
 
         file_id_str = str(file_id)
-        for file in self.upload_dir.iterdir():
-            if file.stem == file_id_str:
-                return file
+        if (cached := _file_path_cache.get(file_id_str)) and cached.exists():
+            return cached
+
+        for directory in (self.get_shard_dir(file_id_str), self.upload_dir):
+            for extension in sorted(settings.resume.allowed_extensions):
+                file_path = directory / f"{file_id_str}.{extension}"
+                if file_path.exists():
+                    _file_path_cache.set(file_id_str, file_path)
+                    return file_path
 
         return None
 
-    async def list_resumes(self) -> list[dict]:
-        file_records = await self.file_resume_repository.find_all_by(
-            limit=100,
-            order_by=self.file_resume_repository.get_attr("created_at").desc(),
+    async def list_resumes(
+        self, limit: int = 100, cursor: str | None = None
+    ) -> tuple[list[dict], str | None]:
+        file_records, next_cursor = await self.file_resume_repository.find_page_by(
+            limit=limit, cursor=cursor
         )
 
-        return [
-            {
-                "file_id": str(file.file_id),
-                "filename": file.filename,
-                "file_extension": file.file_extension,
-                "created_at": file.created_at.isoformat() if file.created_at else None,
-            }
-            for file in file_records
-        ]
+        return [self._serialize(file) for file in file_records], next_cursor
+
+    async def stream_resumes(self) -> AsyncIterator[dict]:
+        async for file in self.file_resume_repository.stream_all_by(
+            order_by=self.file_resume_repository.get_attr("created_at").desc()
+        ):
+            yield self._serialize(file)
+
+    @staticmethod
+    def _serialize(file: FileResume) -> dict:
+        return {
+            "file_id": str(file.file_id),
+            "filename": file.filename,
+            "file_extension": file.file_extension,
+            "created_at": file.created_at.isoformat() if file.created_at else None,
+        }
 
     async def delete_resume(self, file_id: UUID5) -> None:
         file_record = await self.file_resume_repository.find_all_by(
@@ -102,14 +170,16 @@ class ResumeService:
         file_path = await self.get_file_path(file_id)
         if file_path and file_path.exists():
             file_path.unlink()
+        _file_path_cache.pop(str(file_id))
+
+        ResumeParserService.get_text_cache_path(str(file_id)).unlink(missing_ok=True)
 
     @staticmethod
-    async def _generate_file_id(file_content: bytes) -> str:
+    async def _generate_file_id(content_hash: str) -> str:
         """
-        Generate a UUID5 based on the SHA-256 hash of file content.
+        Generate a UUID5 based on the SHA-256 hex digest of file content.
         """
 
-        content_hash = hashlib.sha256(file_content).hexdigest()
         return str(
             uuid.uuid5(uuid.UUID(settings.resume.file_uuid_namespace), content_hash)
         )
@@ -39,8 +39,7 @@ class UserEntityService:
             for entity in entity_list
         ]
 
-        for entry in new_entries:
-            await self.ner_entity_selection_repository.create_model(entry)
+        await self.ner_entity_selection_repository.create_many(new_entries)
 
     async def get_user_selections(
         self, resume_id: UUID5
@@ -1,25 +1,115 @@
+import asyncio
 import hashlib
+import json
+from typing import Iterable, Optional
 
+import chromadb
+import httpx
+from fastapi import Request
 from langchain.schema import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Chroma
-from langchain_openai import OpenAIEmbeddings
 
+from integrations.embeddings.cache import CachedEmbeddings, SQLiteEmbeddingStore
+from integrations.embeddings.providers import (
+    create_embeddings,
+    get_collection_name,
+    get_embedding_model_id,
+)
+from logger import logger
+from settings import settings
+from utils.bm25 import BM25Index, reciprocal_rank_fusion
+from utils.lru_cache import LRUCache
 from utils.text import normalize_whitespace
 
 
 class VectorStoreService:
+    """
+    App-scoped vector store.
+
+    Created once per process in the application lifespan and shared between
+    requests through :func:`get_vector_store_service`, so the Chroma store,
+    the embeddings client and its HTTP connection pool are reused.
+    """
+
     def __init__(self):
-        self.embeddings = OpenAIEmbeddings(model="text-embedding-ada-002")
+        config = settings.vector_store
+        limits = httpx.Limits(
+            max_connections=config.http_max_connections,
+            max_keepalive_connections=config.http_max_keepalive_connections,
+        )
+        timeout = httpx.Timeout(config.http_timeout_seconds)
+
+        self.http_client = httpx.Client(limits=limits, timeout=timeout)
+        self.http_async_client = httpx.AsyncClient(limits=limits, timeout=timeout)
+        self.embedding_model_id = get_embedding_model_id(config)
+        self.embeddings = create_embeddings(
+            config,
+            http_client=self.http_client,
+            http_async_client=self.http_async_client,
+        )
+        self.embedding_cache: SQLiteEmbeddingStore | None = None
+        # Hashing embeddings are cheaper to compute than to look up.
+        if config.embedding_cache_enabled and config.embedding_provider != "hashing":
+            self.embedding_cache = SQLiteEmbeddingStore(
+                path=config.embedding_cache_path,
+                max_entries=config.embedding_cache_max_entries,
+            )
+            self.embeddings = CachedEmbeddings(
+                self.embeddings,
+                store=self.embedding_cache,
+                model=self.embedding_model_id,
+            )
+        client = self._create_chroma_client(config)
         self.store = Chroma(
-            embedding_function=self.embeddings, persist_directory="./data/chroma"
+            client=client,
+            collection_name=get_collection_name(config),
+            embedding_function=self.embeddings,
+        )
+        self.collection = client.get_collection(get_collection_name(config))
+        # Bumped by every write of this service, see _get_lexical_index.
+        self.write_version = 0
+        self.lexical_indexes: LRUCache[
+            str, tuple[tuple[int, int], list[str], BM25Index]
+        ] = LRUCache(config.lexical_index_cache_size)
+        self.query_embeddings: LRUCache[str, list[float]] = LRUCache(
+            config.query_embedding_cache_size
         )
         self.splitter = RecursiveCharacterTextSplitter(
-            chunk_size=700,
-            chunk_overlap=70,
+            chunk_size=config.chunk_size,
+            chunk_overlap=config.chunk_overlap,
             separators=["\n\n", "\n", ".", "!", "?", ";", ",", " "],
         )
 
+    @staticmethod
+    def _create_chroma_client(config) -> chromadb.ClientAPI:
+        """
+        Client of the shared Chroma server when configured, otherwise of the
+        embedded store in ``persist_directory`` owned by this process.
+        """
+
+        if config.chroma_server_host:
+            return chromadb.HttpClient(
+                host=config.chroma_server_host, port=config.chroma_server_port
+            )
+
+        return chromadb.PersistentClient(path=config.persist_directory)
+
+    def invalidate(self, resume_id: str) -> None:
+        """
+        Drop cached state of the resume, e.g. after another process wrote it.
+        """
+
+        self.lexical_indexes.pop(resume_id)
+
+    async def aclose(self) -> None:
+        """Release pooled HTTP connections and the embedding cache."""
+
+        await self.http_async_client.aclose()
+        self.http_client.close()
+        if self.embedding_cache is not None:
+            self.embedding_cache.close()
+
     @staticmethod
     async def _get_document_id_prefix(metadata: dict) -> str:
         resume_id = metadata["resume_id"]
@@ -30,39 +120,328 @@ class VectorStoreService:
 
         return f"{resume_id}_{doc_type}{entity_suffix}"
 
+    @staticmethod
+    def _get_chunk_hash(chunk: str, metadata: dict) -> str:
+        payload = json.dumps([chunk, metadata], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
     async def _split_text(self, text: str, metadata: dict) -> list[Document]:
-        chunks = self.splitter.split_text(normalize_whitespace(text))
+        chunks = [
+            chunk.strip(" \n\t●-–")
+            for chunk in self.splitter.split_text(normalize_whitespace(text))
+        ]
         return [
-            Document(page_content=chunk.strip(" \n\t●-–"), metadata=metadata)
-            for chunk in chunks
+            Document(
+                page_content=chunk,
+                metadata={
+                    **metadata,
+                    "chunk_hash": self._get_chunk_hash(chunk, metadata),
+                    "chunk_index": idx,
+                },
+            )
+            for idx, chunk in enumerate(chunks)
         ]
 
+    @staticmethod
+    def _get_chunk_ids(prefix: str, chunks: list[Document]) -> list[str]:
+        """
+        Content-derived chunk ids, so a chunk keeps its id when it moves.
+
+        Repeated chunks of a document get their occurrence number appended.
+        """
+
+        ids, seen = [], {}
+        for chunk in chunks:
+            chunk_hash = chunk.metadata["chunk_hash"]
+            occurrence = seen[chunk_hash] = seen.get(chunk_hash, -1) + 1
+            suffix = f"_{occurrence}" if occurrence else ""
+            ids.append(f"{prefix}_chunk_{chunk_hash[:32]}{suffix}")
+
+        return ids
+
     async def add_document(self, text: str, metadata: dict):
-        documents = await self._split_text(text, metadata)
-        prefix = await self._get_document_id_prefix(metadata)
-        ids = [f"{prefix}_chunk_{i}" for i in range(len(documents))]
+        await self.add_documents([(text, metadata)])
+
+    async def add_documents(self, items: list[tuple[str, dict]]):
+        """
+        Replace the stored chunks of several documents, embedding only new ones.
+
+        Chunks are matched to the stored ones by content hash, not position:
+        chunks no longer produced are deleted, new chunks are embedded and
+        added with a single store call, and moved chunks only get their
+        position updated. Chunks stored before ids were content-derived are
+        replaced, the embedding cache keeps that from reaching the model.
+
+        :param items: Pairs of text and its metadata, ``resume_id`` is required
+        """
 
-        await self.store.aadd_documents(documents, ids=ids)
+        documents: dict[str, tuple[str, list[Document]]] = {}
+        for text, metadata in items:
+            prefix = await self._get_document_id_prefix(metadata)
+            # A document listed twice is stored as its last version.
+            documents[prefix] = (
+                metadata["resume_id"],
+                await self._split_text(text, metadata),
+            )
+
+        manifests = {
+            resume_id: await self._get_chunk_manifest(resume_id)
+            for resume_id in {resume_id for resume_id, _ in documents.values()}
+        }
+
+        added, added_ids, moved_ids, moved_metadatas, removed = [], [], [], [], []
+        for prefix, (resume_id, chunks) in documents.items():
+            manifest = {
+                chunk_id: position
+                for chunk_id, position in manifests[resume_id].items()
+                if chunk_id.startswith(f"{prefix}_chunk_")
+            }
+            ids = self._get_chunk_ids(prefix, chunks)
+            for chunk_id, chunk in zip(ids, chunks):
+                if chunk_id not in manifest:
+                    added.append(chunk)
+                    added_ids.append(chunk_id)
+                elif manifest[chunk_id] != chunk.metadata["chunk_index"]:
+                    moved_ids.append(chunk_id)
+                    moved_metadatas.append(chunk.metadata)
+            removed.extend(set(manifest) - set(ids))
 
-    async def retrieve(self, query: str, resume_id: str, k: int = 5):
-        results = await self.store.asimilarity_search(
-            query, k=k, filter={"resume_id": resume_id}
+        if added:
+            await self.store.aadd_documents(added, ids=added_ids)
+        if moved_ids:
+            await asyncio.to_thread(
+                self.collection.update, ids=moved_ids, metadatas=moved_metadatas
+            )
+        if removed:
+            await asyncio.to_thread(self.store.delete, ids=removed)
+        if added or moved_ids or removed:
+            self.write_version += 1
+
+        logger.debug(
+            "Document chunks refreshed.",
+            documents=len(documents),
+            added=len(added),
+            moved=len(moved_ids),
+            removed=len(removed),
+        )
+
+    async def refresh_document(self, text: str, metadata: dict):
+        """
+        Replace the stored chunks of a document, see :meth:`add_documents`.
+
+        :param text: Document text
+        :param metadata: Document metadata, ``resume_id`` is required
+        """
+
+        await self.add_documents([(text, metadata)])
+
+    async def retrieve(
+        self, query: str, resume_id: str, k: int = 5, mode: Optional[str] = None
+    ) -> list[str]:
+        """
+        Chunks of the resume documents most relevant to the query.
+
+        :param query: Query text
+        :param resume_id: Resume to search in
+        :param k: Number of chunks
+        :param mode: "hybrid", "dense" or "lexical", defaults to the setting.
+            Hybrid retrieval fuses dense and BM25 rankings with reciprocal
+            rank fusion and falls back to BM25 alone when the dense search
+            fails or times out.
+        :return: Chunk texts, most relevant first
+        """
+
+        mode = mode or settings.vector_store.retrieval_mode
+        if mode == "lexical":
+            return await self._retrieve_lexical(query, resume_id, k)
+        if mode == "dense":
+            return await self._retrieve_dense(query, resume_id, k)
+
+        dense, lexical = await asyncio.gather(
+            self._retrieve_dense(query, resume_id, 2 * k),
+            self._retrieve_lexical(query, resume_id, 2 * k),
+            return_exceptions=True,
+        )
+        if isinstance(dense, BaseException) and isinstance(lexical, BaseException):
+            raise dense
+        if isinstance(lexical, BaseException):
+            logger.warning(
+                "Lexical retrieval failed, using dense results.",
+                resume_id=resume_id,
+                error=repr(lexical),
+            )
+            return dense[:k]
+        if isinstance(dense, BaseException):
+            logger.warning(
+                "Dense retrieval failed, using lexical results.",
+                resume_id=resume_id,
+                error=repr(dense),
+            )
+            return lexical[:k]
+
+        fused = reciprocal_rank_fusion([dense, lexical], k=settings.vector_store.rrf_k)
+        return fused[:k]
+
+    async def embed_query(self, query: str) -> list[float]:
+        """
+        Embedding of the query, kept in an in-process LRU cache.
+
+        Keys are whitespace-normalized, so formatting differences of the same
+        query don't reach the embeddings model.
+        """
+
+        key = " ".join(query.split())
+        vector = self.query_embeddings.get(key)
+        if vector is None:
+            vector = await self.embeddings.aembed_query(query)
+            self.query_embeddings.set(key, vector)
+
+        return vector
+
+    async def warm_query_embeddings(self, queries: Iterable[str]) -> None:
+        """
+        Embed known constant queries ahead of the first request.
+
+        The lifespan runs it as a background task. Failures are logged and
+        left to be retried on first use.
+        """
+
+        results = await asyncio.gather(
+            *(self.embed_query(query) for query in queries), return_exceptions=True
+        )
+        errors = [repr(result) for result in results if isinstance(result, Exception)]
+        if errors:
+            logger.warning("Query embeddings warm-up failed.", errors=errors)
+        else:
+            logger.info("Query embeddings warmed up.", queries=len(results))
+
+    async def retrieve_by_vector(
+        self, vector: list[float], resume_id: str, k: int = 5
+    ) -> list[str]:
+        """
+        Chunks of the resume documents nearest to a precomputed query embedding.
+
+        :param vector: Query embedding of the configured model
+        :param resume_id: Resume to search in
+        :param k: Number of chunks
+        :return: Chunk texts, most similar first
+        """
+
+        results = await self.store.asimilarity_search_by_vector(
+            vector, k=k, filter={"resume_id": resume_id}
         )
         return [doc.page_content for doc in results]
 
-    async def get_documents(self, resume_id: str):
-        return await self.store.asimilarity_search(
-            query="", k=100, filter={"resume_id": resume_id}
+    async def _retrieve_dense(self, query: str, resume_id: str, k: int) -> list[str]:
+        async def search() -> list[str]:
+            vector = await self.embed_query(query)
+            return await self.retrieve_by_vector(vector, resume_id, k)
+
+        return await asyncio.wait_for(
+            search(), timeout=settings.vector_store.dense_timeout_seconds
         )
 
-    async def refresh_document(self, text: str, metadata: dict):
-        resume_id = metadata["resume_id"]
-        doc_type = metadata.get("type", "default")
+    async def _retrieve_lexical(self, query: str, resume_id: str, k: int) -> list[str]:
+        documents, index = await self._get_lexical_index(resume_id)
+        # Chunks are indexed normalized, e.g. with camel case words split.
+        return [documents[idx] for idx in index.search(normalize_whitespace(query), k)]
+
+    async def _get_lexical_index(self, resume_id: str) -> tuple[list[str], BM25Index]:
+        """
+        BM25 index over the stored chunks of the resume.
+
+        The cached index is keyed on the collection size and the version
+        bumped by this service's own writes, so a query costs a count
+        instead of reading every chunk. Writes of other processes that keep
+        the size unchanged are picked up through :meth:`invalidate`. On a
+        miss chunks are read from the collection without any embedding call.
+        """
+
+        signature = (await asyncio.to_thread(self.collection.count), self.write_version)
+        cached = self.lexical_indexes.get(resume_id)
+        if cached is not None and cached[0] == signature:
+            return cached[1], cached[2]
+
+        result = await asyncio.to_thread(
+            self.store.get, where={"resume_id": resume_id}, include=["documents"]
+        )
+        documents = result["documents"]
+        index = await asyncio.to_thread(BM25Index, documents)
+        self.lexical_indexes.set(resume_id, (signature, documents, index))
+
+        return documents, index
+
+    @staticmethod
+    def _get_chunk_position(chunk_id: str, metadata: Optional[dict]) -> tuple[str, int]:
+        prefix, _, suffix = chunk_id.rpartition("_chunk_")
+        index = (metadata or {}).get("chunk_index")
+        if index is None:
+            # Chunks stored before positions were recorded have positional ids.
+            index = int(suffix) if suffix.isdigit() else 0
+
+        return prefix, index
+
+    async def get_documents(
+        self, resume_id: str, offset: int = 0, limit: int = 100
+    ) -> tuple[list[Document], Optional[int]]:
+        """
+        List stored chunks of the resume documents in document order.
+
+        Chunks are read from the collection by metadata, without embedding
+        anything: ids are listed with their metadata and ordered by document
+        and chunk position first, then only the requested page is fetched.
+
+        :param resume_id: Resume to list chunks of
+        :param offset: Number of chunks to skip
+        :param limit: Maximum number of chunks
+        :return: Chunks and the offset of the next page, ``None`` on the last page
+        """
+
+        listed = await asyncio.to_thread(
+            self.store.get, where={"resume_id": resume_id}, include=["metadatas"]
+        )
+        positions = {
+            chunk_id: self._get_chunk_position(chunk_id, metadata)
+            for chunk_id, metadata in zip(listed["ids"], listed["metadatas"])
+        }
+        ids = sorted(positions, key=positions.__getitem__)
+        page_ids = ids[offset : offset + limit]
+        if not page_ids:
+            return [], None
+
+        page = await asyncio.to_thread(
+            self.store.get, ids=page_ids, include=["documents", "metadatas"]
+        )
+        documents = {
+            chunk_id: Document(page_content=text, metadata=metadata or {})
+            for chunk_id, text, metadata in zip(
+                page["ids"], page["documents"], page["metadatas"]
+            )
+        }
+        next_offset = offset + limit if offset + limit < len(ids) else None
+
+        return [documents[chunk_id] for chunk_id in page_ids], next_offset
+
+    async def _get_chunk_manifest(self, resume_id: str) -> dict[str, int]:
+        """
+        Stored chunks of the resume documents.
+
+        :param resume_id: Resume the documents belong to
+        :return: Mapping of chunk ids to their position in the document
+        """
+
+        result = await asyncio.to_thread(
+            self.store.get, where={"resume_id": resume_id}, include=["metadatas"]
+        )
+        return {
+            chunk_id: self._get_chunk_position(chunk_id, metadata)[1]
+            for chunk_id, metadata in zip(result["ids"], result["metadatas"])
+        }
 
-        if resume_id and doc_type:
-            prefix = await self._get_document_id_prefix(metadata)
-            ids = [f"{prefix}_chunk_{i}" for i in range(10)]
 
-            self.store.delete(ids=ids)
+def get_vector_store_service(request: Request) -> VectorStoreService:
+    """
+    Dependency returning the vector store created in the application lifespan.
+    """
 
-        await self.add_document(text, metadata)
+    return request.app.state.vector_store_service
@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic import BaseModel, Field, PostgresDsn
 from pydantic_settings import BaseSettings
 
@@ -12,11 +14,113 @@ class Project(BaseModel):
 
 class Resume(BaseModel):
     upload_dir: str = "uploads/resumes"
+    text_cache_dir: str = "uploads/resume_texts"
+    path_cache_size: int = 10_000
     allowed_extensions: set[str] = {"pdf", "docx", "txt"}
     max_file_size_mb: int = 2
+    upload_chunk_size_kb: int = 64
     file_uuid_namespace: str = "f495f8a0-fa6b-44b6-987d-c7277ad67973"
 
 
+class Letter(BaseModel):
+    output_dir: str = "uploads/letters"
+    template_path: Optional[str] = None
+    render_cache_dir: str = "uploads/letter_renders"
+    render_cache_max_mb: int = 256
+
+
+class VectorStore(BaseModel):
+    # An embedded Chroma store is safe for a single process only; set the
+    # server host when the API and the worker share the store.
+    persist_directory: str = "./data/chroma"
+    chroma_server_host: Optional[str] = None
+    chroma_server_port: int = 8000
+    # "openai" calls the API; "onnx" (all-MiniLM-L6-v2) and "hashing" run on CPU.
+    embedding_provider: Literal["openai", "onnx", "hashing"] = "openai"
+    embedding_model: str = "text-embedding-ada-002"
+    # Directory with the extracted ONNX model files; chromadb downloads them
+    # to its cache on first use when unset.
+    onnx_model_dir: Optional[str] = None
+    embedding_batch_size: int = 256
+    hashing_dimensions: int = 1024
+    # Collection derived from the embeddings model when unset; "langchain"
+    # for the default OpenAI model.
+    collection_name: Optional[str] = None
+    chunk_size: int = 700
+    chunk_overlap: int = 70
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_timeout_seconds: float = 30.0
+    embedding_cache_enabled: bool = True
+    embedding_cache_path: str = "./data/embedding_cache.sqlite3"
+    embedding_cache_max_entries: int = 100_000
+    # "hybrid" fuses dense and BM25 results, "dense" or "lexical" use one of them.
+    retrieval_mode: Literal["hybrid", "dense", "lexical"] = "hybrid"
+    dense_timeout_seconds: float = 10.0
+    rrf_k: int = 60
+    lexical_index_cache_size: int = 256
+    query_embedding_cache_size: int = 1024
+
+
+class Extraction(BaseModel):
+    max_workers: int = 2
+    pages_per_shard: int = 4
+    timeout_seconds: float = 60.0
+
+
+class LLMCache(BaseModel):
+    enabled: bool = True
+    path: str = "./data/llm_cache.sqlite3"
+    ttl_seconds: int = 30 * 24 * 60 * 60
+    max_entries: int = 10_000
+
+
+class FewShot(BaseModel):
+    examples_dir: str = "./data/few_shot_letters"
+    check_interval_seconds: float = 5.0
+    # Number of most relevant examples put in the prompt, 0 to use all of them.
+    top_k: int = 0
+
+
+class PromptBudget(BaseModel):
+    enabled: bool = True
+    encoding: str = "o200k_base"
+    principal_facts_tokens: int = 1500
+    grantee_facts_tokens: int = 2500
+    principal_context_tokens: int = 800
+    grantee_context_tokens: int = 1200
+    entity_research_tokens: int = 2000
+    few_shot_examples_tokens: int = 2500
+    # Share of a retrieved chunk's word trigrams already present in the
+    # research text above which the chunk is dropped as a duplicate.
+    dedupe_threshold: float = 0.6
+
+
+class Research(BaseModel):
+    batch_size: int = 10
+    max_concurrency: int = 4
+
+
+class Worker(BaseModel):
+    broker_url: str = "redis://text-generation-assistant-redis:6379/0"
+    result_backend: str = "redis://text-generation-assistant-redis:6379/1"
+    task_always_eager: bool = False
+    result_expires_seconds: int = 86400
+    # A resume queued or processing for longer, e.g. after a crashed worker or
+    # a lost message, can be enqueued again. Must exceed the longest parse.
+    parse_claim_timeout_seconds: int = 1800
+
+
+class Database(BaseModel):
+    echo: bool = False
+    pool_size: int = 10
+    max_overflow: int = 10
+    pool_timeout_seconds: float = 30.0
+    pool_recycle_seconds: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 256
+
+
 class Settings(BaseSettings):
     debug: bool = Field(default=False)
     log_level: str = Field(default="INFO")
@@ -25,7 +129,16 @@ class Settings(BaseSettings):
     database_url: str = Field(
         default="postgresql+asyncpg://text_generation_assistant_user:secret@db/text_generation_assistant"
     )
+    database: Database = Database()
     resume: Resume = Resume()
+    letter: Letter = Letter()
+    vector_store: VectorStore = VectorStore()
+    extraction: Extraction = Extraction()
+    llm_cache: LLMCache = LLMCache()
+    research: Research = Research()
+    few_shot: FewShot = FewShot()
+    prompt_budget: PromptBudget = PromptBudget()
+    worker: Worker = Worker()
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+from uuid import UUID
+
+from celery.signals import worker_process_init, worker_process_shutdown
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from integrations.celery_app import celery_app
+from integrations.db.session import get_engine_options
+from repositories.file_repository import (
+    PARSE_DONE,
+    PARSE_FAILED,
+    PARSE_PROCESSING,
+    FileResumeRepository,
+)
+from services.resume_pipeline_service import ResumePipelineService
+from services.vector_store_service import VectorStoreService
+from settings import settings
+
+T = TypeVar("T")
+
+
+class WorkerState:
+    """
+    Resources of a worker process shared by all of its tasks.
+
+    Tasks run one at a time on a single event loop owned by the process, so
+    the vector store, with its loop-bound HTTP clients, and the database pool
+    are built once per process instead of once per task.
+    """
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._lock = threading.Lock()
+        # A worker process runs one task at a time.
+        self.engine = create_async_engine(
+            settings.database_url, pool_size=1, max_overflow=1, **get_engine_options()
+        )
+        self.async_session = async_sessionmaker(
+            self.engine, class_=AsyncSession, expire_on_commit=False
+        )
+        self.vector_store_service = VectorStoreService()
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        # Eager tasks may be called from several threads of the API process.
+        with self._lock:
+            return self.loop.run_until_complete(coroutine)
+
+    def close(self) -> None:
+        with self._lock:
+            self.loop.run_until_complete(self.vector_store_service.aclose())
+            self.loop.run_until_complete(self.engine.dispose())
+            self.loop.close()
+
+
+_worker_state: Optional[WorkerState] = None
+_worker_state_lock = threading.Lock()
+
+
+def get_worker_state() -> WorkerState:
+    global _worker_state
+    with _worker_state_lock:
+        if _worker_state is None:
+            _worker_state = WorkerState()
+
+        return _worker_state
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs) -> None:
+    """Build the worker resources before the first task arrives."""
+
+    get_worker_state()
+
+
+@worker_process_shutdown.connect
+def close_worker_state(**kwargs) -> None:
+    global _worker_state
+    with _worker_state_lock:
+        state, _worker_state = _worker_state, None
+    if state is not None:
+        state.close()
+
+
+async def _set_parse_status(
+    state: WorkerState, file_id: str, parse_status: str
+) -> None:
+    async with state.async_session() as session:
+        await FileResumeRepository(session).set_parse_status(
+            UUID(file_id), parse_status
+        )
+        await session.commit()
+
+
+async def _parse_resume(state: WorkerState, file_id: str) -> dict:
+    await _set_parse_status(state, file_id, PARSE_PROCESSING)
+
+    try:
+        async with state.async_session() as session:
+            try:
+                service = ResumePipelineService(
+                    session=session,
+                    vector_store_service=state.vector_store_service,
+                )
+                entities = await service.parse(file_id)
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+    except Exception:
+        await _set_parse_status(state, file_id, PARSE_FAILED)
+        raise
+
+    await _set_parse_status(state, file_id, PARSE_DONE)
+
+    return {"entities": entities.model_dump()["entities"]}
+
+
+@celery_app.task(name="resume.parse")
+def parse_resume(file_id: str) -> dict:
+    """Parse an uploaded resume and extract its named entities."""
+
+    state = get_worker_state()
+    return state.run(_parse_resume(state, file_id))
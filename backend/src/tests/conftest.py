@@ -1,5 +1,5 @@
 import pytest_asyncio
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
 from pytest_mock import MockerFixture
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
@@ -41,7 +41,7 @@ async def client():
     :return:
     """
 
-    yield AsyncClient(app=app, base_url=settings.base_url)
+    yield AsyncClient(transport=ASGITransport(app=app), base_url=settings.base_url)
 
 
 @pytest_asyncio.fixture
@@ -0,0 +1,87 @@
+import uuid
+
+import pytest
+import pytest_asyncio
+
+from models.file import FileGeneratedLetter, FileResume
+
+
+@pytest.mark.asyncio
+class TestLetterDownload:
+    """
+    Тестирование скачивания писем с условными запросами.
+    """
+
+    @pytest_asyncio.fixture
+    async def letter_id(self, session) -> uuid.UUID:
+        """
+        Сохраненное письмо.
+
+        :param session: Сессия базы данных
+        :return:
+        """
+
+        resume_id, letter_id = uuid.uuid4(), uuid.uuid4()
+        session.add(FileResume(file_id=resume_id, filename="cv", file_extension="pdf"))
+        await session.flush()
+        session.add(
+            FileGeneratedLetter(
+                letter_id=letter_id,
+                resume_id=resume_id,
+                filename="Letter",
+                file_extension="docx",
+                content="Dear committee,\n\nI recommend her.",
+            )
+        )
+        await session.flush()
+
+        return letter_id
+
+    async def test_not_modified(self, client, letter_id) -> None:
+        """
+        Совпадающий If-None-Match получает 304.
+
+        :return:
+        """
+
+        url = f"/api/v1/recommendation/letter/{letter_id}?format=txt"
+        async with client:
+            response = await client.get(url)
+            assert response.status_code == 200
+            assert "I recommend her." in response.text
+
+            response = await client.get(
+                url, headers={"If-None-Match": response.headers["ETag"]}
+            )
+            assert response.status_code == 304
+
+    async def test_deleted_letter_is_not_found(self, client, letter_id) -> None:
+        """
+        Удаленное письмо получает 404, даже если ETag совпадает.
+
+        :return:
+        """
+
+        url = f"/api/v1/recommendation/letter/{letter_id}?format=txt"
+        async with client:
+            etag = (await client.get(url)).headers["ETag"]
+            response = await client.delete(f"/api/v1/recommendation/letter/{letter_id}")
+            assert response.status_code == 204
+
+            response = await client.get(url, headers={"If-None-Match": etag})
+            assert response.status_code == 404
+
+    async def test_missing_letter_is_not_found(self, client, session) -> None:
+        """
+        Несуществующее письмо получает 404.
+
+        :return:
+        """
+
+        async with client:
+            response = await client.get(
+                f"/api/v1/recommendation/letter/{uuid.uuid4()}",
+                headers={"If-None-Match": "*"},
+            )
+
+        assert response.status_code == 404
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from bootstrap import lifespan
+from main import app
+from services.vector_store_service import VectorStoreService
+from settings import settings
+
+
+@pytest.mark.asyncio
+class TestLifespan:
+    """
+    Тестирование запуска и остановки приложения.
+    """
+
+    async def test_warm_up_does_not_block_startup(self, monkeypatch, tmp_path):
+        """
+        Зависший прогрев эмбеддингов запросов не задерживает запуск и
+        отменяется при остановке.
+
+        :return:
+        """
+
+        monkeypatch.setattr(
+            settings.vector_store, "persist_directory", str(tmp_path / "chroma")
+        )
+        monkeypatch.setattr(settings.vector_store, "embedding_provider", "hashing")
+        monkeypatch.setattr(settings.few_shot, "examples_dir", str(tmp_path / "few"))
+        monkeypatch.setattr(settings.letter, "output_dir", str(tmp_path / "letters"))
+        started, cancelled = asyncio.Event(), asyncio.Event()
+
+        async def hanging_warm_up(self, queries) -> None:
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        monkeypatch.setattr(
+            VectorStoreService, "warm_query_embeddings", hanging_warm_up
+        )
+
+        async with asyncio.timeout(5):
+            async with lifespan(app):
+                await asyncio.wait_for(started.wait(), timeout=1)
+                assert not cancelled.is_set()
+
+        assert cancelled.is_set()
@@ -0,0 +1,70 @@
+import uuid
+
+import pytest
+
+from models.file import FileResume
+from tests.unit.repositories.test_base_repository import make_cursor
+
+ENDPOINTS = [
+    "/api/v1/files/resume",
+    f"/api/v1/recommendation/resume/{uuid.uuid5(uuid.NAMESPACE_URL, 'letters')}/letters",
+]
+
+
+@pytest.mark.asyncio
+class TestPagination:
+    """
+    Тестирование постраничных списков API.
+    """
+
+    async def test_resume_page(self, client, session):
+        """
+        Список резюме возвращается в том же формате, что и список писем.
+
+        :return:
+        """
+
+        for idx in range(3):
+            session.add(
+                FileResume(
+                    file_id=uuid.uuid4(), filename=f"cv {idx}", file_extension="pdf"
+                )
+            )
+        await session.flush()
+
+        response = await client.get("/api/v1/files/resume", params={"limit": 2})
+
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["resumes"]) == 2
+        assert page["next_cursor"]
+
+        response = await client.get(
+            "/api/v1/files/resume", params={"limit": 2, "cursor": page["next_cursor"]}
+        )
+
+        assert response.status_code == 200
+        assert {r["file_id"] for r in page["resumes"]}.isdisjoint(
+            r["file_id"] for r in response.json()["resumes"]
+        )
+
+    @pytest.mark.parametrize("endpoint", ENDPOINTS)
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "garbage",
+            make_cursor(["2026-10-18T12:00:00+03:00", 1]),
+            make_cursor(["2026-10-18T12:00:00", 2**40]),
+        ],
+    )
+    async def test_invalid_cursor(self, client, session, endpoint, cursor):
+        """
+        Поврежденный или подмененный курсор дает ошибку 400, а не 500.
+
+        :return:
+        """
+
+        response = await client.get(endpoint, params={"cursor": cursor})
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor."
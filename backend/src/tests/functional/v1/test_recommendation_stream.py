@@ -0,0 +1,65 @@
+import json
+import uuid
+
+import pytest
+
+from main import app
+from services.letter_export_service import LetterExportService
+from services.recommendation_service import RecommendationService
+from tests.unit.services.test_recommendation_service import get_service
+
+REQUEST = {
+    "personalities": {
+        "principal": {"resume": {"file_id": str(uuid.uuid4())}},
+        "grantee": {"resume": {"file_id": str(uuid.uuid4())}},
+    },
+    "recommendation": {"type": "job"},
+}
+
+
+def parse_events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+
+    return events
+
+
+@pytest.mark.asyncio
+class TestRecommendationStream:
+    """
+    Тестирование потоковой генерации письма через SSE.
+    """
+
+    async def test_stream_saves_final_response(self, client, mocker):
+        """
+        Сохраняется финальный ответ модели, а не склейка приращений.
+
+        :return:
+        """
+
+        service = get_service(["Dear Sir,"], "Dear committee, I recommend her.")
+        mocker.patch.object(service, "assemble_context", return_value={})
+        create_letter = mocker.patch.object(
+            LetterExportService, "create_letter", return_value="letter-id"
+        )
+        app.dependency_overrides[RecommendationService] = lambda: service
+        try:
+            response = await client.post("/api/v1/recommendation/stream", json=REQUEST)
+        finally:
+            app.dependency_overrides.pop(RecommendationService)
+
+        assert response.status_code == 200
+        events = parse_events(response.text)
+        assert events == [
+            ("delta", {"text": "Dear Sir,"}),
+            (
+                "done",
+                {"letter_id": "letter-id", "text": "Dear committee, I recommend her."},
+            ),
+        ]
+        # The client replaces the streamed preview with the saved text.
+        saved_text = create_letter.await_args.args[0]
+        assert saved_text == "Dear committee, I recommend her."
+        assert events[-1][1]["text"] == saved_text
@@ -0,0 +1,181 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from celery.backends.cache import CacheBackend
+from sqlalchemy import select
+
+from integrations.celery_app import celery_app
+from main import app
+from models.file import FileResume
+from repositories.file_repository import PARSE_PROCESSING, PARSE_QUEUED
+from schemas.ner import Entity, NERResult
+from services.resume_job_service import ResumeJobService
+from services.resume_pipeline_service import ResumePipelineService
+from services.resume_service import ResumeService
+from settings import settings
+from services.vector_store_service import VectorStoreService
+from tasks.resume import close_worker_state, parse_resume
+
+
+@pytest.fixture
+def eager_celery(mocker, monkeypatch, tmp_path):
+    """
+    Выполнение задач Celery в процессе теста с результатами в памяти.
+
+    :return:
+    """
+
+    backend = CacheBackend(app=celery_app, url="memory://")
+    mocker.patch.object(
+        type(celery_app), "backend", new_callable=mocker.PropertyMock
+    ).return_value = backend
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    monkeypatch.setattr(
+        settings.vector_store, "persist_directory", str(tmp_path / "chroma")
+    )
+    monkeypatch.setattr(settings.vector_store, "embedding_provider", "hashing")
+    # The lifespan doesn't run in tests, the API side store is a stub.
+    monkeypatch.setattr(
+        app.state,
+        "vector_store_service",
+        mocker.Mock(spec=VectorStoreService),
+        raising=False,
+    )
+
+    yield backend
+
+    # The worker state holds a vector store in this test's directory.
+    close_worker_state()
+
+
+@pytest_asyncio.fixture
+async def resume(request, session, mocker, tmp_path):
+    """
+    Загруженное резюме с файлом на диске.
+
+    :return:
+    """
+
+    # Results of the in-memory backend are shared between tests.
+    file_id = uuid.uuid5(uuid.NAMESPACE_URL, request.node.name)
+    file_path = tmp_path / f"{file_id}.pdf"
+    file_path.write_bytes(b"%PDF-1.4")
+    session.add(FileResume(file_id=file_id, filename="cv", file_extension="pdf"))
+    await session.flush()
+    mocker.patch.object(ResumeService, "get_file_path", return_value=file_path)
+
+    yield file_id
+
+
+@pytest.mark.asyncio
+class TestResumeJobs:
+    """
+    Тестирование фоновых задач разбора резюме.
+    """
+
+    async def test_enqueue_parse_runs_job(
+        self, client, session, eager_celery, resume, mocker
+    ):
+        """
+        Задача разбора выполняется брокером в режиме eager и возвращает сущности.
+
+        :return:
+        """
+
+        parse = mocker.patch.object(
+            ResumePipelineService,
+            "parse",
+            return_value=NERResult(
+                entities={"SKILL": [Entity(label="SKILL", text="Python")]}
+            ),
+        )
+
+        response = await client.post(f"/api/v1/files/resume/{resume}/parse/jobs")
+
+        assert response.status_code == 202
+        job = response.json()
+        assert job["job_id"] == ResumeJobService.get_job_id(resume)
+        assert job["status"] == "success"
+        assert job["result"]["entities"]["SKILL"][0]["text"] == "Python"
+        parse.assert_awaited_once()
+
+        response = await client.get(f"/api/v1/files/jobs/{job['job_id']}")
+
+        assert response.json()["status"] == "success"
+        # Chunks were written by the worker, cached API state is dropped.
+        app.state.vector_store_service.invalidate.assert_called_with(str(resume))
+
+    async def test_enqueue_parse_sends_once(
+        self, client, session, eager_celery, resume, mocker
+    ):
+        """
+        Повторная постановка в очередь не отправляет задачу второй раз.
+
+        :return:
+        """
+
+        send = mocker.patch.object(ResumeJobService, "_send")
+
+        for _ in range(2):
+            response = await client.post(f"/api/v1/files/resume/{resume}/parse/jobs")
+            assert response.status_code == 202
+
+        send.assert_called_once()
+        file = await session.scalar(
+            select(FileResume).where(FileResume.file_id == resume)
+        )
+        await session.refresh(file)
+        assert file.parse_status == PARSE_QUEUED
+
+    async def test_tasks_share_vector_store(self, eager_celery, mocker):
+        """
+        Задачи одного процесса используют одно векторное хранилище.
+
+        :return:
+        """
+
+        parse = mocker.patch.object(
+            ResumePipelineService, "parse", return_value=NERResult(entities={})
+        )
+        init = mocker.spy(VectorStoreService, "__init__")
+
+        for _ in range(3):
+            # Tasks are sent from a worker thread of the API, see ResumeJobService.
+            await asyncio.to_thread(parse_resume.apply, args=[str(uuid.uuid4())])
+
+        assert parse.await_count == 3
+        assert init.call_count == 1
+
+    @pytest.mark.parametrize("parse_status", [PARSE_QUEUED, PARSE_PROCESSING])
+    async def test_stale_claim_is_taken_over(
+        self, client, session, eager_celery, resume, mocker, parse_status
+    ):
+        """
+        Разбор, застрявший в очереди или в работе дольше таймаута, ставится
+        в очередь снова.
+
+        :return:
+        """
+
+        send = mocker.patch.object(ResumeJobService, "_send")
+        file = await session.scalar(
+            select(FileResume).where(FileResume.file_id == resume)
+        )
+        file.parse_status = parse_status
+        file.parse_claimed_at = datetime.now(timezone.utc).replace(
+            tzinfo=None
+        ) - timedelta(seconds=settings.worker.parse_claim_timeout_seconds + 60)
+        await session.flush()
+
+        response = await client.post(f"/api/v1/files/resume/{resume}/parse/jobs")
+
+        assert response.status_code == 202
+        send.assert_called_once()
+        await session.refresh(file)
+        assert file.parse_status == PARSE_QUEUED
+        assert file.parse_claimed_at > datetime.now(timezone.utc).replace(
+            tzinfo=None
+        ) - timedelta(minutes=1)
@@ -0,0 +1,126 @@
+import hashlib
+import io
+import uuid
+
+import pytest
+from fastapi import UploadFile
+
+from exceptions import ResumeTooLarge
+from services.resume_service import ResumeService
+from settings import settings
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    """
+    Временная директория загрузок резюме.
+
+    :return:
+    """
+
+    monkeypatch.setattr(settings.resume, "upload_dir", str(tmp_path))
+
+    yield tmp_path
+
+
+def get_file_id(content: bytes) -> str:
+    return str(
+        uuid.uuid5(
+            uuid.UUID(settings.resume.file_uuid_namespace),
+            hashlib.sha256(content).hexdigest(),
+        )
+    )
+
+
+@pytest.mark.asyncio
+class TestResumeUpload:
+    """
+    Тестирование загрузки резюме.
+    """
+
+    async def test_upload_creates_sharded_file(self, client, session, upload_dir):
+        """
+        Новый файл сохраняется в шардированной директории.
+
+        :return:
+        """
+
+        content = uuid.uuid4().bytes
+        file_id = get_file_id(content)
+
+        response = await client.post(
+            "/api/v1/files/resume", files={"file": ("cv.txt", content)}
+        )
+
+        assert response.status_code == 201
+        assert response.json()["file_id"] == file_id
+        assert (upload_dir / file_id[:2] / file_id[2:4] / f"{file_id}.txt").exists()
+
+    async def test_upload_finds_legacy_duplicate(self, client, session, upload_dir):
+        """
+        Файл, уже лежащий в старой плоской директории, не сохраняется повторно.
+
+        :return:
+        """
+
+        content = uuid.uuid4().bytes
+        file_id = get_file_id(content)
+        (upload_dir / f"{file_id}.txt").write_bytes(content)
+
+        response = await client.post(
+            "/api/v1/files/resume", files={"file": ("cv.txt", content)}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["file_id"] == file_id
+        assert not (upload_dir / file_id[:2]).exists()
+
+    async def test_unsupported_extension(self, client, upload_dir):
+        """
+        Файл с неподдерживаемым расширением отклоняется.
+
+        :return:
+        """
+
+        response = await client.post(
+            "/api/v1/files/resume", files={"file": ("cv.exe", b"binary")}
+        )
+
+        assert response.status_code == 400
+        assert "Invalid file type" in response.json()["detail"]
+
+    async def test_content_length_over_limit(
+        self, client, upload_dir, monkeypatch, mocker
+    ):
+        """
+        Загрузка с заявленным размером больше лимита отклоняется до чтения тела.
+
+        :return:
+        """
+
+        monkeypatch.setattr(settings.resume, "max_file_size_mb", 0)
+        save_upload = mocker.spy(ResumeService, "save_upload")
+
+        response = await client.post(
+            "/api/v1/files/resume", files={"file": ("cv.txt", b"x" * 64 * 1024)}
+        )
+
+        assert response.status_code == 400
+        assert "too large" in response.json()["detail"]
+        save_upload.assert_not_called()
+        assert not any(upload_dir.iterdir())
+
+    async def test_streamed_size_over_limit(self, session, upload_dir, monkeypatch):
+        """
+        Чтение файла без заявленного размера прерывается на превышении лимита.
+
+        :return:
+        """
+
+        monkeypatch.setattr(settings.resume, "max_file_size_mb", 0)
+        file = UploadFile(io.BytesIO(b"resume"), filename="cv.txt")
+
+        with pytest.raises(ResumeTooLarge):
+            await ResumeService(session).save_upload(file, "txt")
+
+        assert not any(upload_dir.iterdir())
@@ -0,0 +1,103 @@
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from integrations.cache_metrics import CacheMetrics
+from integrations.embeddings.cache import CachedEmbeddings, SQLiteEmbeddingStore
+from integrations.embeddings.providers import HashingEmbeddings
+
+CHUNKS = [
+    "Migrated payment services to Kubernetes.",
+    "Tuned Postgres queries of the ledger.",
+    "Mentored four engineers.",
+]
+
+
+class CountingEmbeddings(Embeddings):
+    """
+    Локальные эмбеддинги, считающие обращения к провайдеру.
+    """
+
+    def __init__(self) -> None:
+        self.model = HashingEmbeddings(dimensions=64)
+        self.calls = 0
+        self.texts: list[str] = []
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.calls += 1
+        self.texts.extend(texts)
+        return self.model.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.model.embed_query(text)
+
+
+@pytest.fixture
+def store(tmp_path):
+    """
+    Хранилище эмбеддингов во временном файле.
+
+    :return:
+    """
+
+    store = SQLiteEmbeddingStore(
+        path=str(tmp_path / "embeddings.sqlite3"), max_entries=100
+    )
+    yield store
+    store.close()
+
+
+def get_embeddings(store: SQLiteEmbeddingStore) -> CachedEmbeddings:
+    return CachedEmbeddings(
+        CountingEmbeddings(), store=store, model="counting", metrics=CacheMetrics()
+    )
+
+
+@pytest.mark.asyncio
+class TestCachedEmbeddings:
+    """
+    Тестирование кэша эмбеддингов.
+    """
+
+    async def test_readding_identical_chunks_skips_provider(self, store) -> None:
+        """
+        Повторное добавление тех же фрагментов не обращается к провайдеру.
+
+        :return:
+        """
+
+        embeddings = get_embeddings(store)
+        first = await embeddings.aembed_documents(CHUNKS)
+        assert embeddings.embeddings.calls == 1
+
+        second = await embeddings.aembed_documents(CHUNKS)
+        assert embeddings.embeddings.calls == 1
+        assert second == first
+        assert embeddings.metrics.snapshot() == {
+            "hits": 3,
+            "misses": 3,
+            "hit_ratio": 0.5,
+        }
+
+        # The cache persists across instances, e.g. process restarts.
+        restarted = get_embeddings(store)
+        assert restarted.embed_documents(CHUNKS) == first
+        assert restarted.embeddings.calls == 0
+
+    async def test_only_misses_are_embedded(self, store) -> None:
+        """
+        К провайдеру уходят только отсутствующие в кэше тексты, повторы в
+        пакете один раз; форматирование пробелов не важно.
+
+        :return:
+        """
+
+        embeddings = get_embeddings(store)
+        embeddings.embed_documents(CHUNKS[:1])
+
+        vectors = embeddings.embed_documents(
+            [f"  {CHUNKS[0]}", CHUNKS[1], CHUNKS[1], CHUNKS[2]]
+        )
+
+        assert embeddings.embeddings.texts == [CHUNKS[0], CHUNKS[1], CHUNKS[2]]
+        assert vectors[1] == vectors[2]
+        assert len(vectors) == 4
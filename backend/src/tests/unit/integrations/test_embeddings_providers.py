@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import pytest
+
+from exceptions import EmbeddingModelNotFound
+from integrations.embeddings.providers import (
+    ONNX_MODEL_FILES,
+    create_embeddings,
+    get_collection_name,
+)
+from settings import VectorStore
+
+
+class TestCollectionName:
+    """
+    Тестирование выбора коллекции Chroma по модели эмбеддингов.
+    """
+
+    def test_default_model_keeps_legacy_collection(self) -> None:
+        """
+        Модель OpenAI по умолчанию использует прежнюю коллекцию.
+
+        :return:
+        """
+
+        assert get_collection_name(VectorStore()) == "langchain"
+
+    def test_other_models(self) -> None:
+        """
+        Остальные модели получают собственные коллекции.
+
+        :return:
+        """
+
+        assert (
+            get_collection_name(VectorStore(embedding_model="text-embedding-3-small"))
+            == "resume_chunks_text-embedding-3-small"
+        )
+        assert (
+            get_collection_name(VectorStore(embedding_provider="hashing"))
+            == "resume_chunks_hashing-1024"
+        )
+        assert (
+            get_collection_name(VectorStore(embedding_provider="onnx"))
+            == "resume_chunks_onnx-all-MiniLM-L6-v2"
+        )
+
+    def test_explicit_collection(self) -> None:
+        """
+        Явно заданная коллекция имеет приоритет.
+
+        :return:
+        """
+
+        assert (
+            get_collection_name(
+                VectorStore(embedding_provider="hashing", collection_name="resumes")
+            )
+            == "resumes"
+        )
+
+
+class TestOnnxModelDir:
+    """
+    Тестирование локальной директории модели ONNX.
+    """
+
+    def test_model_read_from_dir(self, tmp_path) -> None:
+        """
+        Модель читается из заданной директории, а не из кэша chromadb.
+
+        :return:
+        """
+
+        model_dir = tmp_path / "onnx"
+        model_dir.mkdir()
+        for name in ONNX_MODEL_FILES:
+            (model_dir / name).touch()
+
+        embeddings = create_embeddings(
+            VectorStore(embedding_provider="onnx", onnx_model_dir=str(model_dir))
+        )
+
+        path = Path(
+            embeddings.model.DOWNLOAD_PATH, embeddings.model.EXTRACTED_FOLDER_NAME
+        )
+        assert path == model_dir
+
+    def test_missing_model(self, tmp_path) -> None:
+        """
+        Отсутствующие файлы модели приводят к понятной ошибке без загрузки.
+
+        :return:
+        """
+
+        (tmp_path / "model.onnx").touch()
+
+        with pytest.raises(EmbeddingModelNotFound, match="tokenizer.json"):
+            create_embeddings(
+                VectorStore(embedding_provider="onnx", onnx_model_dir=str(tmp_path))
+            )
@@ -0,0 +1,97 @@
+import pytest
+from pydantic import BaseModel
+
+from integrations.cache_metrics import CacheMetrics
+from integrations.llm_cache import LLMResultCache, get_prompt_fingerprint
+
+
+class Facts(BaseModel):
+    name: str
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """
+    Кэш результатов LLM во временном файле.
+
+    :return:
+    """
+
+    cache = LLMResultCache(
+        path=str(tmp_path / "llm_cache.sqlite3"),
+        ttl_seconds=60,
+        max_entries=10,
+        metrics=CacheMetrics(),
+    )
+    yield cache
+    cache.close()
+
+
+@pytest.mark.asyncio
+class TestLLMResultCache:
+    """
+    Тестирование кэша результатов LLM.
+    """
+
+    async def test_fingerprint_covers_function_sources(self, mocker):
+        """
+        Отпечаток промпта меняется вместе с функцией, ее типами и клиентом,
+        но не с другими функциями.
+
+        :return:
+        """
+
+        files = {
+            "resume.baml": "class Resume {\n  name string\n}\n"
+            "function ExtractResume(text: string) -> Resume {\n"
+            '  client Fast\n  prompt #"{{ ctx.output_format }}"#\n}\n',
+            "letter.baml": "class Letter {\n  text string\n}\n"
+            "function WriteLetter(text: string) -> Letter {\n"
+            '  client Fast\n  prompt #"{{ text }}"#\n}\n',
+            "clients.baml": "client<llm> Fast {\n  provider openai\n"
+            "  retry_policy Retry\n}\n"
+            "retry_policy Retry {\n  max_retries 2\n}\n",
+        }
+        mocker.patch("integrations.llm_cache.get_baml_files", return_value=files)
+
+        def fingerprint() -> tuple[str, str]:
+            get_prompt_fingerprint.cache_clear()
+            return get_prompt_fingerprint("ExtractResume")
+
+        client, initial = fingerprint()
+        files["letter.baml"] = files["letter.baml"].replace(
+            "text string", "body string"
+        )
+        _, unrelated = fingerprint()
+        files["resume.baml"] = files["resume.baml"].replace(
+            "name string", "name string\n  email string"
+        )
+        _, output_type = fingerprint()
+        files["clients.baml"] = files["clients.baml"].replace(
+            "max_retries 2", "max_retries 3"
+        )
+        _, retry_policy = fingerprint()
+        get_prompt_fingerprint.cache_clear()
+
+        assert client == "Fast"
+        assert unrelated == initial
+        assert len({initial, output_type, retry_policy}) == 3
+
+    async def test_invalid_entry_is_a_miss(self, cache, mocker):
+        """
+        Запись, не проходящая валидацию, удаляется и считается промахом.
+
+        :return:
+        """
+
+        mocker.patch.object(LLMResultCache, "make_key", return_value="key")
+        cache.set("key", "ExtractResume", '{"title": "stale"}')
+
+        async def call() -> Facts:
+            return Facts(name="Ada")
+
+        result = await cache.get_or_call("ExtractResume", "text", call, Facts)
+
+        assert result == Facts(name="Ada")
+        assert cache.metrics.snapshot() == {"hits": 0, "misses": 1, "hit_ratio": 0.0}
+        assert cache.get("key") == result.model_dump_json()
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from exceptions import ResumeExtractionTimeout
+from integrations import process_pool
+from services.resume_parser_service import ResumeParserService
+from settings import settings
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """
+    Пул процессов из одного процесса, закрываемый после теста.
+
+    :return:
+    """
+
+    monkeypatch.setattr(settings.extraction, "max_workers", 1)
+    process_pool.shutdown_process_pool()
+
+    yield process_pool.get_process_pool()
+
+    process_pool.shutdown_process_pool()
+
+
+@pytest.mark.asyncio
+class TestProcessPool:
+    """
+    Тестирование пула процессов для CPU-bound задач.
+    """
+
+    async def test_recycle_replaces_pool(self, pool, mocker):
+        """
+        Пул заменяется новым, а старый закрывается без ожидания с отменой задач.
+
+        :return:
+        """
+
+        shutdown = mocker.spy(pool, "shutdown")
+
+        process_pool.recycle_process_pool()
+
+        shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+        assert process_pool.get_process_pool() is not pool
+        assert process_pool.get_process_pool() is not None
+
+    async def test_extraction_timeout(self, monkeypatch, mocker):
+        """
+        Таймаут извлечения текста приводит к доменной ошибке и замене пула.
+
+        :return:
+        """
+
+        async def slow_extraction(file_content: bytes) -> str:
+            await asyncio.sleep(1)
+            return ""
+
+        monkeypatch.setattr(settings.extraction, "timeout_seconds", 0.01)
+        recycle = mocker.patch("services.resume_parser_service.recycle_process_pool")
+        service = ResumeParserService()
+        monkeypatch.setattr(service, "_extract_text_from_txt", slow_extraction)
+
+        with pytest.raises(ResumeExtractionTimeout):
+            await service._extract_text(b"text", ".txt")
+
+        recycle.assert_called_once()
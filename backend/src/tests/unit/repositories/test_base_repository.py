@@ -0,0 +1,265 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from integrations.db.metrics import StatementCounter
+from models.file import FileResume
+from models.ner import NEREntitySelection
+from repositories.user_entity_repository import NEREntitySelectionRepository
+from tests.unit.repositories.test_repository_base import TestRepositoryBase
+from utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+SELECTIONS = 10
+
+
+def make_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+@pytest.mark.asyncio
+class TestBaseRepository(TestRepositoryBase):
+    """
+    Тестирование общих методов базового репозитория.
+    """
+
+    @pytest_asyncio.fixture
+    async def resume_id(self, session) -> uuid.UUID:
+        """
+        Резюме без выбранных сущностей.
+
+        :param session: Сессия базы данных
+        :return:
+        """
+
+        resume_id = uuid.uuid4()
+        session.add(
+            FileResume(file_id=resume_id, filename="cv.pdf", file_extension="pdf")
+        )
+        await session.flush()
+
+        return resume_id
+
+    async def test_create_many(self, session, resume_id) -> None:
+        """
+        Несколько записей создаются одним запросом.
+
+        :param session: Сессия базы данных
+        :param resume_id: Идентификатор резюме
+        :return:
+        """
+
+        repository = NEREntitySelectionRepository(session)
+
+        with StatementCounter(session.bind) as counter:
+            ids = await repository.create_many(
+                [
+                    {
+                        "resume_id": resume_id,
+                        "entity": f"Company {idx}",
+                        "entity_type": "organization",
+                    }
+                    for idx in range(SELECTIONS)
+                ]
+            )
+
+        assert counter.count == 1
+        assert len(ids) == SELECTIONS
+        rows = (
+            await session.scalars(
+                select(NEREntitySelection)
+                .where(NEREntitySelection.id.in_(ids))
+                .order_by(NEREntitySelection.id)
+            )
+        ).all()
+        assert [row.entity for row in rows] == [
+            f"Company {idx}" for idx in range(SELECTIONS)
+        ]
+
+    async def test_update_many(self, session, resume_id) -> None:
+        """
+        Записи обновляются разными значениями одним запросом по первичному ключу.
+
+        :param session: Сессия базы данных
+        :param resume_id: Идентификатор резюме
+        :return:
+        """
+
+        repository = NEREntitySelectionRepository(session)
+        ids = await repository.create_many(
+            [
+                {
+                    "resume_id": resume_id,
+                    "entity": f"Company {idx}",
+                    "entity_type": "organization",
+                }
+                for idx in range(SELECTIONS)
+            ]
+        )
+        # Every other record is updated, the rest must stay untouched.
+        updated_ids = ids[::2]
+
+        with StatementCounter(session.bind) as counter:
+            result = await repository.update_many(
+                [
+                    {"id": pk, "entity": f"Renamed {pk}", "researched": True}
+                    for pk in updated_ids
+                ]
+            )
+
+        assert counter.count == 1
+        assert result == updated_ids
+        rows = (
+            await session.scalars(
+                select(NEREntitySelection).where(NEREntitySelection.id.in_(ids))
+            )
+        ).all()
+        for row in rows:
+            await session.refresh(row)
+            if row.id in updated_ids:
+                await self.assert_object(
+                    row, {"entity": f"Renamed {row.id}", "researched": True}
+                )
+            else:
+                await self.assert_object(row, {"researched": False})
+                assert row.entity.startswith("Company")
+
+    async def test_update_many_without_rows(self, session) -> None:
+        """
+        Пустой набор строк не выполняет запросов.
+
+        :param session: Сессия базы данных
+        :return:
+        """
+
+        with StatementCounter(session.bind) as counter:
+            result = await NEREntitySelectionRepository(session).update_many([])
+
+        assert counter.count == 0
+        assert result == []
+
+    async def create_selections(self, session, resume_id) -> list[int]:
+        return await NEREntitySelectionRepository(session).create_many(
+            [
+                {
+                    "resume_id": resume_id,
+                    "entity": f"Company {idx}",
+                    "entity_type": "organization",
+                }
+                for idx in range(SELECTIONS)
+            ]
+        )
+
+    async def test_find_page_by(self, session, resume_id) -> None:
+        """
+        Страницы идут от новых записей к старым без пропусков и повторов.
+
+        :param session: Сессия базы данных
+        :param resume_id: Идентификатор резюме
+        :return:
+        """
+
+        ids = await self.create_selections(session, resume_id)
+        repository = NEREntitySelectionRepository(session)
+
+        pages, cursor = [], None
+        while True:
+            rows, cursor = await repository.find_page_by(
+                limit=3, cursor=cursor, resume_id=resume_id
+            )
+            pages.append([row.id for row in rows])
+            if cursor is None:
+                break
+
+        assert [len(page) for page in pages] == [3, 3, 3, 1]
+        # Rows created in one statement share created_at, the id breaks ties.
+        assert sum(pages, []) == sorted(ids, reverse=True)
+
+    async def test_find_page_by_exact_pages(self, session, resume_id) -> None:
+        """
+        Полная последняя страница не возвращает курсор.
+
+        :param session: Сессия базы данных
+        :param resume_id: Идентификатор резюме
+        :return:
+        """
+
+        await self.create_selections(session, resume_id)
+
+        rows, cursor = await NEREntitySelectionRepository(session).find_page_by(
+            limit=SELECTIONS, resume_id=resume_id
+        )
+
+        assert len(rows) == SELECTIONS
+        assert cursor is None
+
+    async def test_stream_all_by(self, session, resume_id) -> None:
+        """
+        Потоковое чтение возвращает все записи в заданном порядке.
+
+        :param session: Сессия базы данных
+        :param resume_id: Идентификатор резюме
+        :return:
+        """
+
+        ids = await self.create_selections(session, resume_id)
+        repository = NEREntitySelectionRepository(session)
+
+        streamed = [
+            row.id
+            async for row in repository.stream_all_by(
+                order_by=repository.get_attr("id").desc(),
+                batch_size=3,
+                resume_id=resume_id,
+            )
+        ]
+
+        assert streamed == sorted(ids, reverse=True)
+
+
+class TestCursor:
+    """
+    Тестирование кодирования курсоров постраничной выборки.
+    """
+
+    def test_round_trip(self) -> None:
+        """
+        Декодированный курсор совпадает с закодированной позицией.
+
+        :return:
+        """
+
+        created_at = datetime(2026, 10, 18, 12, 30, 15, 123456)
+
+        assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "not a cursor",
+            "%%%",
+            make_cursor({"created_at": "2026-10-18"}),
+            make_cursor(["2026-10-18T12:00:00"]),
+            make_cursor(["yesterday", 1]),
+            make_cursor([None, 1]),
+            make_cursor(["2026-10-18T12:00:00", "one"]),
+            make_cursor(["2026-10-18T12:00:00+03:00", 1]),
+            make_cursor(["2026-10-18T12:00:00", -1]),
+            make_cursor(["2026-10-18T12:00:00", 2**40]),
+            base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+        ],
+    )
+    def test_invalid_cursor(self, cursor: str) -> None:
+        """
+        Поврежденный или подмененный курсор отклоняется.
+
+        :param cursor: Курсор
+        :return:
+        """
+
+        with pytest.raises(InvalidCursor):
+            decode_cursor(cursor)
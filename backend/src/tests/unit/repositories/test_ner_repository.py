@@ -0,0 +1,111 @@
+import uuid
+
+import pytest
+import pytest_asyncio
+
+from integrations.db.metrics import StatementCounter
+from models.file import FileResume
+from models.ner import NEREntity, NEREntityResearch, NEREntitySelection
+from repositories.ner_repository import NERRepository
+from tests.unit.repositories.test_repository_base import TestRepositoryBase
+
+RESUMES = 5
+ENTITIES_PER_RESUME = 20
+
+
+@pytest.mark.asyncio
+class TestNERRepository(TestRepositoryBase):
+    """
+    Тестирование репозитория сущностей резюме.
+    """
+
+    @pytest_asyncio.fixture
+    async def resume_ids(self, session) -> list[uuid.UUID]:
+        """
+        Резюме с фактами и исследованиями сущностей.
+
+        :param session: Сессия базы данных
+        :return:
+        """
+
+        resume_ids = [uuid.uuid4() for _ in range(RESUMES)]
+        for resume_id in resume_ids:
+            session.add(
+                FileResume(file_id=resume_id, filename="cv.pdf", file_extension="pdf")
+            )
+            session.add(
+                NEREntity(
+                    resume_id=resume_id,
+                    facts={"name": str(resume_id)},
+                    entities={},
+                )
+            )
+            for idx in range(ENTITIES_PER_RESUME):
+                selection = NEREntitySelection(
+                    resume_id=resume_id,
+                    entity=f"Company {idx}",
+                    entity_type="organization",
+                    researched=True,
+                )
+                session.add(selection)
+                await session.flush()
+                session.add(
+                    NEREntityResearch(
+                        resume_id=resume_id,
+                        entity_id=selection.id,
+                        research=f"Research {idx}",
+                    )
+                )
+        await session.flush()
+
+        return resume_ids
+
+    async def test_find_context_by_resumes(self, session, resume_ids) -> None:
+        """
+        Контекст нескольких резюме загружается одним запросом.
+
+        :param session: Сессия базы данных
+        :param resume_ids: Идентификаторы резюме
+        :return:
+        """
+
+        with StatementCounter(session.bind) as counter:
+            rows = await NERRepository(session).find_context_by_resumes(resume_ids)
+
+        assert counter.count == 1
+        assert len(rows) == RESUMES
+        for row in rows:
+            await self.assert_object(row, {"facts": {"name": str(row.resume_id)}})
+            assert row.research == {
+                f"Company {idx}": f"Research {idx}"
+                for idx in range(ENTITIES_PER_RESUME)
+            }
+
+    async def test_find_context_by_resumes_without_research(
+        self, session, resume_ids
+    ) -> None:
+        """
+        Резюме без исследований и неизвестные резюме.
+
+        :param session: Сессия базы данных
+        :param resume_ids: Идентификаторы резюме
+        :return:
+        """
+
+        resume_id = uuid.uuid4()
+        session.add(
+            FileResume(file_id=resume_id, filename="cv.pdf", file_extension="pdf")
+        )
+        session.add(NEREntity(resume_id=resume_id, facts=None, entities={}))
+        await session.flush()
+
+        with StatementCounter(session.bind) as counter:
+            rows = await NERRepository(session).find_context_by_resumes(
+                [resume_id, uuid.uuid4()]
+            )
+
+        assert counter.count == 1
+        assert len(rows) == 1
+        await self.assert_object(
+            rows[0], {"resume_id": resume_id, "facts": None, "research": None}
+        )
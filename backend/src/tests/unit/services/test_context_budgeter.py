@@ -0,0 +1,252 @@
+import pytest
+import tiktoken
+
+from services.context_budgeter import ContextBudgeter
+from services.few_shot_example_store import EXAMPLES_SEPARATOR
+from settings import PromptBudget
+from utils.tokens import ELLIPSIS, Tokenizer
+
+BUDGET = PromptBudget(
+    principal_facts_tokens=300,
+    principal_context_tokens=200,
+    entity_research_tokens=250,
+    few_shot_examples_tokens=150,
+)
+SENTENCE = "Designed and shipped low-latency payment services for Ünïcode users. "
+
+
+def byte_encoding() -> tiktoken.Encoding:
+    """
+    Байтовая кодировка tiktoken, доступная без загрузки файлов кодировок.
+
+    :return:
+    """
+
+    return tiktoken.Encoding(
+        name="bytes",
+        pat_str=r"\S+|\s+",
+        mergeable_ranks={bytes([idx]): idx for idx in range(256)},
+        special_tokens={},
+    )
+
+
+@pytest.fixture(params=["estimate", "tiktoken"])
+def tokenizer(request) -> Tokenizer:
+    """
+    Токенизатор с оценкой по символам и с кодировкой tiktoken.
+
+    :return:
+    """
+
+    tokenizer = Tokenizer("unavailable-encoding")
+    if request.param == "tiktoken":
+        tokenizer.encoding = byte_encoding()
+
+    return tokenizer
+
+
+def make_facts(experiences: int) -> dict:
+    """
+    Факты синтетического резюме с длинной сводкой и опытом работы.
+
+    :param experiences: Количество мест работы
+    :return:
+    """
+
+    return {
+        "name": "Jane Doe",
+        "summary": SENTENCE * 200,
+        "experience": [
+            {
+                "job_title": f"Engineer {idx}",
+                "company": f"Company {idx}",
+                "start_date": "2010",
+                "end_date": "2012",
+                "responsibilities": [SENTENCE * 3 for _ in range(10)],
+            }
+            for idx in range(experiences)
+        ],
+    }
+
+
+class TestTokenizer:
+    """
+    Тестирование обрезки текста по бюджету токенов.
+    """
+
+    @pytest.mark.parametrize("max_tokens", [1, 2, 3, 5, 17, 100, 999])
+    def test_truncate_fits_budget(self, tokenizer, max_tokens) -> None:
+        """
+        Обрезанный текст вместе с многоточием укладывается в бюджет.
+
+        :return:
+        """
+
+        truncated = tokenizer.truncate(SENTENCE * 100, max_tokens)
+
+        assert tokenizer.count(truncated) <= max_tokens
+        if truncated:
+            assert truncated.endswith(ELLIPSIS)
+
+    def test_truncate_keeps_short_text(self, tokenizer) -> None:
+        """
+        Текст в пределах бюджета не меняется.
+
+        :return:
+        """
+
+        assert tokenizer.truncate(SENTENCE, 1000) == SENTENCE
+
+
+class TestContextBudgeter:
+    """
+    Тестирование подгонки входов промпта под бюджеты на больших резюме.
+    """
+
+    def test_fit_facts(self, tokenizer) -> None:
+        """
+        Сводка занимает не больше половины бюджета, опыт идет по порядку.
+
+        :return:
+        """
+
+        budgeter = ContextBudgeter(BUDGET, tokenizer)
+        facts = make_facts(50)
+        fitted = budgeter.fit_facts("principal_facts", facts)
+
+        summary_tokens = tokenizer.count(fitted["summary"])
+        experience_tokens = sum(
+            tokenizer.count(budgeter._render_experience(item))
+            for item in fitted["experience"]
+        )
+        assert summary_tokens <= BUDGET.principal_facts_tokens // 2
+        assert summary_tokens + experience_tokens <= BUDGET.principal_facts_tokens
+        assert budgeter.tokens_after["principal_facts"] == (
+            summary_tokens + experience_tokens
+        )
+        assert fitted["experience"]
+        assert [item["company"] for item in fitted["experience"]] == [
+            item["company"] for item in facts["experience"][: len(fitted["experience"])]
+        ]
+        assert fitted["name"] == "Jane Doe"
+
+    def test_fit_facts_truncates_first_experience(self, tokenizer) -> None:
+        """
+        Если не помещается даже первое место работы, у него отбрасываются
+        последние обязанности.
+
+        :return:
+        """
+
+        budgeter = ContextBudgeter(BUDGET, tokenizer)
+        facts = make_facts(1)
+        facts["experience"][0]["responsibilities"] = ["Ran on-call rotations."] * 100
+        fitted = budgeter.fit_facts("principal_facts", facts)
+
+        [experience] = fitted["experience"]
+        assert 0 < len(experience["responsibilities"]) < 100
+        assert len(facts["experience"][0]["responsibilities"]) == 100
+        assert budgeter.tokens_after["principal_facts"] <= BUDGET.principal_facts_tokens
+
+    def test_fit_facts_drops_oversized_first_experience(self, tokenizer) -> None:
+        """
+        Первое место работы, не помещающееся даже без обязанностей,
+        отбрасывается, и бюджет не превышается.
+
+        :return:
+        """
+
+        budgeter = ContextBudgeter(BUDGET, tokenizer)
+        facts = make_facts(2)
+        facts["experience"][0]["job_title"] = SENTENCE * 50
+        fitted = budgeter.fit_facts("principal_facts", facts)
+
+        assert fitted["experience"] == []
+        assert budgeter.tokens_after["principal_facts"] == tokenizer.count(
+            fitted["summary"]
+        )
+        assert budgeter.tokens_after["principal_facts"] <= BUDGET.principal_facts_tokens
+
+    def test_fit_chunks(self, tokenizer) -> None:
+        """
+        Дубликаты исследований отбрасываются, менее релевантные фрагменты
+        отбрасываются по бюджету.
+
+        :return:
+        """
+
+        budgeter = ContextBudgeter(BUDGET, tokenizer)
+        research = "Acme builds rockets for interplanetary cargo delivery missions."
+        chunks = [research] + [
+            f"Chunk {idx}: led team {idx} through migration {idx}. " * 2
+            for idx in range(30)
+        ]
+        kept = budgeter.fit_chunks("principal_context", chunks, [research])
+
+        assert len(kept) > 1
+        assert research not in kept
+        assert kept == chunks[1 : len(kept) + 1]
+        assert sum(map(tokenizer.count, kept)) <= BUDGET.principal_context_tokens
+
+    def test_fit_chunks_truncates_first_chunk(self, tokenizer) -> None:
+        """
+        Самый релевантный фрагмент обрезается, если не помещается целиком.
+
+        :return:
+        """
+
+        budgeter = ContextBudgeter(BUDGET, tokenizer)
+        kept = budgeter.fit_chunks("principal_context", [SENTENCE * 100])
+
+        assert len(kept) == 1
+        assert tokenizer.count(kept[0]) <= BUDGET.principal_context_tokens
+
+    def test_fit_research(self, tokenizer) -> None:
+        """
+        Короткие исследования сохраняются целиком, длинные обрезаются поровну.
+
+        :return:
+        """
+
+        budgeter = ContextBudgeter(BUDGET, tokenizer)
+        research = {
+            "Short": "Founded in 1999.",
+            "Long": SENTENCE * 100,
+            "Longer": SENTENCE * 200,
+        }
+        fitted = budgeter.fit_research("entity_research", research)
+
+        assert fitted["Short"] == research["Short"]
+        assert list(fitted) == list(research)
+        assert (
+            sum(map(tokenizer.count, fitted.values())) <= BUDGET.entity_research_tokens
+        )
+
+    def test_fit_examples(self, tokenizer) -> None:
+        """
+        Последние примеры отбрасываются, первый обрезается при необходимости.
+
+        :return:
+        """
+
+        budgeter = ContextBudgeter(BUDGET, tokenizer)
+        short = EXAMPLES_SEPARATOR.join(["Example one.", SENTENCE * 50])
+        assert budgeter.fit_examples("few_shot_examples", short) == "Example one."
+
+        fitted = budgeter.fit_examples("few_shot_examples", SENTENCE * 50)
+        assert 0 < tokenizer.count(fitted) <= BUDGET.few_shot_examples_tokens
+
+    def test_disabled(self, tokenizer) -> None:
+        """
+        Отключенный бюджет оставляет входы без изменений.
+
+        :return:
+        """
+
+        budgeter = ContextBudgeter(PromptBudget(enabled=False), tokenizer)
+        facts = make_facts(50)
+        chunks = [SENTENCE * 100]
+
+        assert budgeter.fit_facts("principal_facts", facts) is facts
+        assert budgeter.fit_chunks("principal_context", chunks) == chunks
+        assert budgeter.report["tokens_saved"] == 0
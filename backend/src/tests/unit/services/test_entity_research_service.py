@@ -0,0 +1,154 @@
+import asyncio
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from models.file import FileResume
+from models.ner import NEREntityResearch, NEREntitySelection
+from services.entity_research_service import EntityResearchService
+from settings import settings
+
+ENTITIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli"]
+FAILING_ENTITY = "Initech"
+
+
+class FakeResearcher:
+    """
+    Клиент LLM, исследующий сущности с ошибкой на заданной сущности.
+    """
+
+    def __init__(self, failing_entity: str) -> None:
+        self.failing_entity = failing_entity
+        self.batches: list[list[str]] = []
+        self.running = 0
+        self.max_running = 0
+
+    async def ResearchEntities(self, batch: list[str]) -> dict[str, str]:
+        self.batches.append(batch)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(0.01)
+            if self.failing_entity in batch:
+                raise RuntimeError("Research failed.")
+            # Entities outside of the batch are ignored.
+            return {
+                **{entity: f"Research of {entity}." for entity in batch},
+                "Unrequested": "Research.",
+            }
+        finally:
+            self.running -= 1
+
+
+class RecordingVectorStore:
+    """
+    Векторное хранилище, запоминающее добавленные документы.
+    """
+
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    async def add_documents(self, items: list[tuple[str, dict]]) -> None:
+        self.calls.append([metadata["entity"] for _, metadata in items])
+
+
+@pytest_asyncio.fixture
+async def resume_id(session) -> uuid.UUID:
+    """
+    Резюме с выбранными сущностями.
+
+    :return:
+    """
+
+    resume_id = uuid.uuid4()
+    session.add(FileResume(file_id=resume_id, filename="cv", file_extension="pdf"))
+    await session.flush()
+    session.add_all(
+        NEREntitySelection(resume_id=resume_id, entity=entity, entity_type="ORG")
+        for entity in ENTITIES
+    )
+    await session.flush()
+
+    yield resume_id
+
+
+@pytest.mark.asyncio
+class TestEntityResearchService:
+    """
+    Тестирование пакетного исследования сущностей.
+    """
+
+    async def test_research_batches(self, session, resume_id, monkeypatch):
+        """
+        Сущности исследуются пакетами с ограничением параллельности, каждый
+        успешный пакет сохраняется один раз, а сущности упавшего пакета
+        остаются неисследованными.
+
+        :return:
+        """
+
+        monkeypatch.setattr(settings.research, "batch_size", 2)
+        monkeypatch.setattr(settings.research, "max_concurrency", 2)
+        researcher = FakeResearcher(FAILING_ENTITY)
+        vector_store = RecordingVectorStore()
+        service = EntityResearchService(
+            session=session, vector_store_service=vector_store, llm_client=researcher
+        )
+
+        research = await service.research_entities(resume_id)
+
+        assert sorted(map(sorted, researcher.batches)) == sorted(
+            sorted(ENTITIES[i : i + 2]) for i in range(0, len(ENTITIES), 2)
+        )
+        assert researcher.max_running == 2
+        failed_batch = next(b for b in researcher.batches if FAILING_ENTITY in b)
+        researched = [entity for entity in ENTITIES if entity not in failed_batch]
+        assert research == {entity: f"Research of {entity}." for entity in researched}
+        # Each successful batch is written once, when it completes.
+        assert sorted(map(sorted, vector_store.calls)) == sorted(
+            sorted(b) for b in researcher.batches if b is not failed_batch
+        )
+
+        rows = (
+            await session.scalars(
+                select(NEREntityResearch).where(
+                    NEREntityResearch.resume_id == resume_id
+                )
+            )
+        ).all()
+        assert len(rows) == len(researched)
+        selections = (
+            await session.scalars(
+                select(NEREntitySelection).where(
+                    NEREntitySelection.resume_id == resume_id
+                )
+            )
+        ).all()
+        for selection in selections:
+            await session.refresh(selection)
+        assert {s.entity for s in selections if s.researched} == set(researched)
+
+    async def test_failed_entities_are_retried(self, session, resume_id, monkeypatch):
+        """
+        Повторный вызов исследует только сущности упавшего пакета.
+
+        :return:
+        """
+
+        monkeypatch.setattr(settings.research, "batch_size", 2)
+        service = EntityResearchService(
+            session=session,
+            vector_store_service=RecordingVectorStore(),
+            llm_client=FakeResearcher(FAILING_ENTITY),
+        )
+        await service.research_entities(resume_id)
+
+        researcher = FakeResearcher(failing_entity="")
+        service.llm_client = researcher
+        research = await service.research_entities(resume_id)
+
+        assert len(researcher.batches) == 1
+        assert FAILING_ENTITY in researcher.batches[0]
+        assert set(research) == set(ENTITIES)
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from services.few_shot_example_store import EXAMPLES_SEPARATOR, FewShotExampleStore
+
+
+class KeywordEmbeddings(Embeddings):
+    """
+    Эмбеддинги по вхождению ключевых слов; текст без них дает нулевой вектор.
+    """
+
+    KEYWORDS = ("python", "design", "sales")
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [
+            [float(keyword in text.lower()) for keyword in self.KEYWORDS]
+            for text in texts
+        ]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+
+def write_examples(tmp_path, examples: dict[str, str]) -> None:
+    type_dir = tmp_path / "job"
+    type_dir.mkdir(exist_ok=True)
+    for name, text in examples.items():
+        (type_dir / name).write_text(text, encoding="utf-8")
+
+
+@pytest.mark.asyncio
+class TestFewShotExampleStore:
+    """
+    Тестирование хранилища примеров писем.
+    """
+
+    async def test_reload_serves_previous_examples(self, tmp_path, mocker):
+        """
+        Во время перезагрузки читатели получают прежние примеры.
+
+        :return:
+        """
+
+        write_examples(tmp_path, {"1.txt": "Old example"})
+        store = FewShotExampleStore(str(tmp_path), check_interval_seconds=3600)
+        await store.reload()
+        write_examples(tmp_path, {"1.txt": "New example"})
+
+        started, release = threading.Event(), threading.Event()
+        read_changed = store._read_changed
+
+        def slow_read_changed(loaded):
+            started.set()
+            release.wait(5)
+            return read_changed(loaded)
+
+        mocker.patch.object(store, "_read_changed", side_effect=slow_read_changed)
+        reload = asyncio.create_task(store.reload())
+        await asyncio.to_thread(started.wait, 5)
+
+        assert await store.get("job") == "Old example"
+
+        release.set()
+        assert await reload == {"enrollment": 0, "job": 1, "visa": 0}
+        assert await store.get("job") == "New example"
+
+    async def test_select_similar_with_zero_vectors(self, tmp_path):
+        """
+        Нулевые векторы примеров и запроса не дают NaN при ранжировании.
+
+        :return:
+        """
+
+        write_examples(
+            tmp_path,
+            {
+                "1.txt": "Built Python services",
+                "2.txt": "Nothing relevant here",
+                "3.txt": "Led design reviews",
+            },
+        )
+        store = FewShotExampleStore(
+            str(tmp_path), check_interval_seconds=3600, embeddings=KeywordEmbeddings()
+        )
+        await store.reload()
+
+        assert await store.get("job", query="Python developer", k=1) == (
+            "Built Python services"
+        )
+        assert await store.get("job", query="Unrelated query", k=2) == (
+            EXAMPLES_SEPARATOR.join(["Built Python services", "Nothing relevant here"])
+        )
+        assert not np.isnan(store._examples["job"].vectors).any()
@@ -0,0 +1,28 @@
+import io
+
+import docx
+
+from services.letter_renderer import load_template
+
+
+class TestDocxTemplate:
+    """
+    Тестирование рендеринга писем в DOCX.
+    """
+
+    def test_render_strips_invalid_xml_characters(self) -> None:
+        """
+        Символы, недопустимые в XML 1.0, удаляются, документ остается корректным.
+
+        :return:
+        """
+
+        file = io.BytesIO()
+        load_template().render(
+            ["Dear\x00 committee,", "Tab\tkept \x01\x08\x0b\x0c\x1f\ufffe<&>", "Bye"],
+            file,
+        )
+
+        document = docx.Document(io.BytesIO(file.getvalue()))
+        texts = [paragraph.text for paragraph in document.paragraphs][-3:]
+        assert texts == ["Dear committee,", "Tab\tkept <&>", "Bye"]
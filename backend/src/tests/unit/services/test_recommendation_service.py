@@ -0,0 +1,165 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from schemas.recommendation import RecommendationRequest, RecommendationType
+from services.recommendation_service import RecommendationService
+
+
+class FakeLetterStream:
+    """
+    Поток BAML с заданными частичными ответами и итоговым ответом.
+    """
+
+    def __init__(self, partials: list[str], final: str) -> None:
+        self.partials = partials
+        self.final = final
+
+    async def __aiter__(self):
+        for partial in self.partials:
+            yield partial
+
+    async def get_final_response(self) -> str:
+        return self.final
+
+
+class FakeStreamingClient:
+    """
+    Клиент LLM, возвращающий заданный поток письма.
+    """
+
+    def __init__(self, stream: FakeLetterStream) -> None:
+        self.stream = self
+        self._letter_stream = stream
+
+    def GenerateRecommendationLetter(self, **kwargs) -> FakeLetterStream:
+        return self._letter_stream
+
+
+def get_service(partials: list[str], final: str) -> RecommendationService:
+    return RecommendationService(
+        session_factory=None,
+        vector_store_service=None,
+        llm_client=FakeStreamingClient(FakeLetterStream(partials, final)),
+        few_shot_example_store=None,
+    )
+
+
+@pytest.mark.asyncio
+class TestRecommendationServiceStream:
+    """
+    Тестирование потоковой генерации письма.
+    """
+
+    async def test_stream_letter_emits_deltas(self):
+        """
+        Частичные ответы превращаются в приращения текста.
+
+        :return:
+        """
+
+        letter_stream = get_service(
+            ["Dear", "Dear committee,", "Dear committee, I"],
+            "Dear committee, I recommend her.",
+        ).stream_letter({})
+
+        deltas = [delta async for delta in letter_stream]
+
+        assert deltas == ["Dear", " committee,", " I", " recommend her."]
+        assert letter_stream.text == "Dear committee, I recommend her."
+
+    async def test_stream_letter_keeps_final_response(self):
+        """
+        Итоговый текст берется из финального ответа, даже если частичные
+        ответы не являются его префиксами.
+
+        :return:
+        """
+
+        letter_stream = get_service(
+            ["Dear Sir,", "Dear Sir, I"], "Dear committee, I recommend her."
+        ).stream_letter({})
+
+        deltas = [delta async for delta in letter_stream]
+
+        assert "".join(deltas) == "Dear Sir, I"
+        assert letter_stream.text == "Dear committee, I recommend her."
+
+
+class BlockingVectorStore:
+    """
+    Векторное хранилище, отвечающее только после начала выбора примеров.
+    """
+
+    def __init__(self, few_shot_started: asyncio.Event) -> None:
+        self.few_shot_started = few_shot_started
+
+    async def retrieve(self, query: str, resume_id: str) -> list[str]:
+        await asyncio.wait_for(self.few_shot_started.wait(), timeout=1)
+        return [f"Context of {resume_id}."]
+
+
+class RecordingFewShotStore:
+    """
+    Хранилище примеров, запоминающее запросы.
+    """
+
+    def __init__(self, started: asyncio.Event) -> None:
+        self.started = started
+        self.queries: list[str] = []
+
+    async def get(self, recommendation_type: str, query: str, k: int) -> str:
+        self.started.set()
+        self.queries.append(query)
+        return "Example."
+
+
+@pytest.mark.asyncio
+class TestRecommendationServiceContext:
+    """
+    Тестирование сборки контекста письма.
+    """
+
+    async def test_few_shot_examples_run_with_retrieval(self, mocker):
+        """
+        Примеры выбираются одновременно с поиском по резюме, по тексту запроса.
+
+        :return:
+        """
+
+        principal_id, grantee_id = uuid.uuid4(), uuid.uuid4()
+        request = RecommendationRequest.model_validate(
+            {
+                "personalities": {
+                    "principal": {"resume": {"file_id": str(principal_id)}},
+                    "grantee": {"resume": {"file_id": str(grantee_id)}},
+                    "circumstances": "Visa application.",
+                },
+                "recommendation": {
+                    "type": next(iter(RecommendationType)).value,
+                    "directives": "Stress leadership.",
+                },
+            }
+        )
+        started = asyncio.Event()
+        few_shot_store = RecordingFewShotStore(started)
+        service = RecommendationService(
+            session_factory=None,
+            vector_store_service=BlockingVectorStore(started),
+            llm_client=None,
+            few_shot_example_store=few_shot_store,
+        )
+        row = SimpleNamespace(facts={}, research=None)
+        mocker.patch.object(
+            service,
+            "_find_resume_contexts",
+            return_value={principal_id: row, grantee_id: row},
+        )
+
+        context = await service.assemble_context(request)
+
+        assert context["few_shot_examples"] == "Example."
+        assert context["grantee_context"] == f"Context of {grantee_id}."
+        assert few_shot_store.queries == ["Stress leadership.\n\nVisa application."]
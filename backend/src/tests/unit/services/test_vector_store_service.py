@@ -0,0 +1,465 @@
+import time
+
+import pytest
+import pytest_asyncio
+from langchain_core.embeddings import Embeddings
+
+from integrations.embeddings.providers import HashingEmbeddings
+from services.vector_store_service import VectorStoreService
+from settings import settings
+
+RESUME_ID = "resume"
+CHUNKS = {
+    "kubernetes": "Migrated payment services to Kubernetes and cut deploys to minutes.",
+    "postgres": "Tuned Postgres queries, halving the p99 latency of the ledger.",
+    "mentoring": "Mentored four engineers and ran the on-call rotation of the team.",
+    "terraform": "Automated cloud infrastructure with Terraform modules and CI/CD.",
+}
+
+
+class CountingEmbeddings(Embeddings):
+    """
+    Локальные эмбеддинги, считающие обращения к модели.
+    """
+
+    def __init__(self) -> None:
+        self.model = HashingEmbeddings(dimensions=256)
+        self.embedded_documents = 0
+        self.embedded_queries = 0
+        self.query_error: Exception | None = None
+        self.query_delay = 0.0
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.embedded_documents += len(texts)
+        return self.model.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        self.embedded_queries += 1
+        time.sleep(self.query_delay)
+        if self.query_error is not None:
+            raise self.query_error
+        return self.model.embed_query(text)
+
+
+@pytest_asyncio.fixture
+async def service(tmp_path, monkeypatch) -> VectorStoreService:
+    """
+    Векторное хранилище во временной директории со счетчиком эмбеддингов.
+
+    :return:
+    """
+
+    monkeypatch.setattr(
+        settings.vector_store, "persist_directory", str(tmp_path / "chroma")
+    )
+    monkeypatch.setattr(settings.vector_store, "embedding_provider", "hashing")
+    service = VectorStoreService()
+    service.embeddings = service.store._embedding_function = CountingEmbeddings()
+
+    yield service
+
+    await service.aclose()
+
+
+async def add_chunks(service: VectorStoreService, resume_id: str = RESUME_ID) -> None:
+    await service.add_documents(
+        [
+            (text, {"resume_id": resume_id, "type": name})
+            for name, text in CHUNKS.items()
+        ]
+    )
+
+
+@pytest.mark.asyncio
+class TestHybridRetrieval:
+    """
+    Тестирование гибридного поиска и его деградации до BM25.
+    """
+
+    async def test_hybrid(self, service) -> None:
+        """
+        Гибридный поиск находит фрагменты по совпадению терминов.
+
+        :return:
+        """
+
+        await add_chunks(service)
+        await add_chunks(service, resume_id="other")
+
+        chunks = await service.retrieve("Postgres latency", RESUME_ID, k=2)
+
+        assert chunks[0] == CHUNKS["postgres"]
+        assert len(chunks) == 2
+        assert service.embeddings.embedded_queries == 1
+
+    async def test_lexical_needs_no_embeddings(self, service) -> None:
+        """
+        Лексический поиск не обращается к модели эмбеддингов.
+
+        :return:
+        """
+
+        await add_chunks(service)
+
+        chunks = await service.retrieve("Terraform", RESUME_ID, k=1, mode="lexical")
+
+        assert chunks == [CHUNKS["terraform"]]
+        assert service.embeddings.embedded_queries == 0
+
+    async def test_fallback_on_dense_error(self, service) -> None:
+        """
+        При ошибке плотного поиска используются результаты BM25.
+
+        :return:
+        """
+
+        await add_chunks(service)
+        service.embeddings.query_error = RuntimeError("embeddings unavailable")
+
+        chunks = await service.retrieve("Mentored engineers", RESUME_ID, k=3)
+
+        assert chunks == await service.retrieve(
+            "Mentored engineers", RESUME_ID, k=3, mode="lexical"
+        )
+        assert chunks[0] == CHUNKS["mentoring"]
+
+    async def test_fallback_on_dense_timeout(self, service, monkeypatch) -> None:
+        """
+        При превышении времени плотного поиска используются результаты BM25.
+
+        :return:
+        """
+
+        await add_chunks(service)
+        monkeypatch.setattr(settings.vector_store, "dense_timeout_seconds", 0.05)
+        service.embeddings.query_delay = 0.5
+
+        chunks = await service.retrieve("Kubernetes", RESUME_ID, k=1)
+
+        assert chunks == [CHUNKS["kubernetes"]]
+
+    async def test_both_failed(self, service, mocker) -> None:
+        """
+        Ошибка пробрасывается, если недоступны оба вида поиска.
+
+        :return:
+        """
+
+        await add_chunks(service)
+        service.embeddings.query_error = RuntimeError("embeddings unavailable")
+        mocker.patch.object(
+            service, "_get_lexical_index", side_effect=RuntimeError("store down")
+        )
+
+        with pytest.raises(RuntimeError, match="embeddings unavailable"):
+            await service.retrieve("Kubernetes", RESUME_ID)
+
+
+@pytest.mark.asyncio
+class TestQueryEmbeddingCache:
+    """
+    Тестирование кеша эмбеддингов запросов.
+    """
+
+    async def test_warmed_queries_are_not_embedded_again(self, service) -> None:
+        """
+        Прогретые запросы не обращаются к модели, в том числе при другом
+        форматировании пробелов.
+
+        :return:
+        """
+
+        await add_chunks(service)
+        await service.warm_query_embeddings(["Key achievements", "Team  skills"])
+        assert service.embeddings.embedded_queries == 2
+
+        await service.retrieve("Key achievements", RESUME_ID, mode="dense")
+        await service.retrieve(" Team skills\n", RESUME_ID, mode="dense")
+
+        assert service.embeddings.embedded_queries == 2
+
+        await service.retrieve("Other query", RESUME_ID, mode="dense")
+
+        assert service.embeddings.embedded_queries == 3
+
+    async def test_failed_warm_up_is_retried(self, service) -> None:
+        """
+        Неудачный прогрев не мешает и повторяется при первом запросе.
+
+        :return:
+        """
+
+        service.embeddings.query_error = RuntimeError("embeddings unavailable")
+        await service.warm_query_embeddings(["Key achievements"])
+        assert len(service.query_embeddings) == 0
+
+        service.embeddings.query_error = None
+        await service.embed_query("Key achievements")
+        await service.embed_query("Key achievements")
+
+        assert service.embeddings.embedded_queries == 2
+        assert len(service.query_embeddings) == 1
+
+
+@pytest.mark.asyncio
+class TestLexicalIndexCache:
+    """
+    Тестирование кэша лексических индексов резюме.
+    """
+
+    async def test_cached_index_skips_reading_chunks(self, service, mocker) -> None:
+        """
+        Повторный запрос использует кэшированный индекс без чтения фрагментов.
+
+        :return:
+        """
+
+        await add_chunks(service)
+        await service.retrieve("Terraform", RESUME_ID, k=1, mode="lexical")
+        get = mocker.spy(service.store, "get")
+
+        chunks = await service.retrieve("Postgres", RESUME_ID, k=1, mode="lexical")
+
+        assert chunks == [CHUNKS["postgres"]]
+        get.assert_not_called()
+
+    async def test_own_write_rebuilds_index(self, service) -> None:
+        """
+        Запись через сервис сбрасывает кэшированный индекс.
+
+        :return:
+        """
+
+        await add_chunks(service)
+        await service.retrieve("Terraform", RESUME_ID, k=1, mode="lexical")
+        await service.refresh_document(
+            "Led the Kafka migration of the event pipeline.",
+            {"resume_id": RESUME_ID, "type": "kubernetes"},
+        )
+
+        chunks = await service.retrieve("Kafka", RESUME_ID, k=1, mode="lexical")
+
+        assert chunks == ["Led the Kafka migration of the event pipeline."]
+
+    async def test_invalidate_picks_up_other_writers(self, service) -> None:
+        """
+        Запись другим процессом того же числа фрагментов видна после
+        сброса кэша резюме.
+
+        :return:
+        """
+
+        await add_chunks(service)
+        await service.retrieve("Terraform", RESUME_ID, k=1, mode="lexical")
+        writer = VectorStoreService()
+        writer.store._embedding_function = CountingEmbeddings()
+        await writer.refresh_document(
+            "Led the Kafka migration of the event pipeline.",
+            {"resume_id": RESUME_ID, "type": "kubernetes"},
+        )
+        await writer.aclose()
+
+        stale = await service.retrieve("Kafka", RESUME_ID, k=1, mode="lexical")
+        service.invalidate(RESUME_ID)
+        fresh = await service.retrieve("Kafka", RESUME_ID, k=1, mode="lexical")
+
+        assert stale != fresh
+        assert fresh == ["Led the Kafka migration of the event pipeline."]
+
+
+def make_text(sentences: int) -> str:
+    return " ".join(
+        f"Sentence {idx} is about delivering project {idx} on time and on budget."
+        for idx in range(sentences)
+    )
+
+
+@pytest.mark.asyncio
+class TestRefreshDocument:
+    """
+    Тестирование обновления фрагментов документа по манифесту.
+    """
+
+    METADATA = {"resume_id": RESUME_ID, "type": "resume_text"}
+
+    async def assert_stored(self, service: VectorStoreService, text: str) -> None:
+        """
+        В хранилище ровно фрагменты текста, в порядке документа.
+
+        :param service: Векторное хранилище
+        :param text: Текст документа
+        :return:
+        """
+
+        expected = await service._split_text(text, self.METADATA)
+        stored, _ = await service.get_documents(RESUME_ID)
+        assert [doc.page_content for doc in stored] == [
+            doc.page_content for doc in expected
+        ]
+
+    async def refresh(self, service: VectorStoreService, text: str) -> int:
+        """
+        Обновление документа.
+
+        :param service: Векторное хранилище
+        :param text: Текст документа
+        :return: Количество фрагментов, отправленных в модель эмбеддингов
+        """
+
+        embedded = service.embeddings.embedded_documents
+        await service.refresh_document(text, self.METADATA)
+        await self.assert_stored(service, text)
+
+        return service.embeddings.embedded_documents - embedded
+
+    async def test_unchanged(self, service) -> None:
+        """
+        Неизмененный документ не эмбеддится повторно.
+
+        :return:
+        """
+
+        text = make_text(40)
+        chunks = await service._split_text(text, self.METADATA)
+        assert len(chunks) > 3
+
+        assert await self.refresh(service, text) == len(chunks)
+        assert await self.refresh(service, text) == 0
+
+    async def test_grow(self, service) -> None:
+        """
+        При дописывании текста эмбеддятся только измененные и новые фрагменты.
+
+        :return:
+        """
+
+        await self.refresh(service, make_text(40))
+        before = await service._split_text(make_text(40), self.METADATA)
+        after = await service._split_text(make_text(60), self.METADATA)
+        stored = {chunk.page_content for chunk in before}
+        changed = sum(1 for chunk in after if chunk.page_content not in stored)
+
+        assert await self.refresh(service, make_text(60)) == changed
+        assert 0 < changed < len(after)
+
+    async def test_prepend(self, service) -> None:
+        """
+        При добавлении текста в начало сдвинутые фрагменты не эмбеддятся
+        повторно.
+
+        :return:
+        """
+
+        text = make_text(40)
+        await self.refresh(service, text)
+        prefix = "Summary of the delivered projects, written for the reviewer."
+
+        assert await self.refresh(service, f"{prefix}\n\n{text}") == 1
+
+    async def test_shrink(self, service) -> None:
+        """
+        При сокращении текста лишние фрагменты удаляются без эмбеддинга
+        оставшихся.
+
+        :return:
+        """
+
+        await self.refresh(service, make_text(60))
+        before = await service._split_text(make_text(60), self.METADATA)
+        after = await service._split_text(make_text(40), self.METADATA)
+        assert len(after) < len(before)
+
+        # Only the last chunk may end differently; the rest are kept as is.
+        assert await self.refresh(service, make_text(40)) <= 1
+        assert len(service.store.get(where={"resume_id": RESUME_ID})["ids"]) == len(
+            after
+        )
+
+    async def test_add_documents_removes_stale_chunks(self, service) -> None:
+        """
+        Повторное добавление документа заменяет его фрагменты, включая лишние
+        с конца.
+
+        :return:
+        """
+
+        metadata = {**self.METADATA, "type": "entity_research", "entity": "ACME"}
+        await service.add_documents([(make_text(60), metadata)])
+        await service.add_documents([(make_text(20), metadata)])
+
+        stored = service.store.get(where={"resume_id": RESUME_ID})["documents"]
+        expected = await service._split_text(make_text(20), metadata)
+        assert sorted(stored) == sorted(chunk.page_content for chunk in expected)
+
+    async def test_legacy_positional_chunks_replaced(self, service) -> None:
+        """
+        Фрагменты со старыми позиционными идентификаторами заменяются.
+
+        :return:
+        """
+
+        text = make_text(40)
+        chunks = await service._split_text(text, self.METADATA)
+        prefix = await service._get_document_id_prefix(self.METADATA)
+        for chunk in chunks:
+            chunk.metadata.pop("chunk_index")
+        service.store.add_documents(
+            chunks, ids=[f"{prefix}_chunk_{idx}" for idx in range(len(chunks))]
+        )
+
+        await self.refresh(service, text)
+
+        ids = service.store.get(where={"resume_id": RESUME_ID})["ids"]
+        assert len(ids) == len(chunks)
+        assert f"{prefix}_chunk_0" not in ids
+
+
+@pytest.mark.asyncio
+class TestGetDocuments:
+    """
+    Тестирование постраничного получения фрагментов резюме.
+    """
+
+    async def test_paging_without_embeddings(self, service) -> None:
+        """
+        Страницы идут в порядке документа и не обращаются к модели эмбеддингов.
+
+        :return:
+        """
+
+        text = make_text(100)
+        metadata = {"resume_id": RESUME_ID, "type": "resume_text"}
+        await service.add_document(text, metadata)
+        await add_chunks(service, resume_id="other")
+        expected = [
+            doc.page_content for doc in await service._split_text(text, metadata)
+        ]
+        assert len(expected) > 10
+        embedded = service.embeddings.embedded_documents
+
+        pages, offset = [], 0
+        while offset is not None:
+            documents, offset = await service.get_documents(
+                RESUME_ID, offset=offset, limit=3
+            )
+            pages.append(documents)
+
+        assert [doc.page_content for page in pages for doc in page] == expected
+        assert all(len(page) == 3 for page in pages[:-1])
+        assert all(
+            doc.metadata["resume_id"] == RESUME_ID for page in pages for doc in page
+        )
+        assert service.embeddings.embedded_documents == embedded
+        assert service.embeddings.embedded_queries == 0
+
+    async def test_past_the_end(self, service) -> None:
+        """
+        Страница за концом списка и неизвестное резюме пусты.
+
+        :return:
+        """
+
+        await add_chunks(service)
+
+        assert await service.get_documents(RESUME_ID, offset=100) == ([], None)
+        assert await service.get_documents("unknown") == ([], None)
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+
+from services.few_shot_example_store import (
+    FewShotExampleStore,
+    get_few_shot_example_store,
+)
+
+router = APIRouter()
+
+
+@router.post("/few-shot-examples/reload")
+async def reload_few_shot_examples(
+    few_shot_example_store: FewShotExampleStore = Depends(get_few_shot_example_store),
+):
+    """Re-read few-shot letter examples from disk."""
+
+    return {"data": await few_shot_example_store.reload()}
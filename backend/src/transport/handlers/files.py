@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Optional
 
 from fastapi import (
     APIRouter,
@@ -6,20 +7,33 @@ from fastapi import (
     UploadFile,
     File,
     HTTPException,
+    Query,
     Response,
     status,
 )
 from fastapi.openapi.models import Tag
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from pydantic import UUID5
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
-from schemas.files import FileUploadResponse
+from exceptions import (
+    ResumeExtractionTimeout,
+    ResumeFileNotFound,
+    ResumeTooLarge,
+    UnsupportedResume,
+)
+from integrations.db.session import get_session_factory
+from schemas.files import FileUploadResponse, JobStatusResponse
 from services.ner_service import NERService
-from services.resume_parser_service import ResumeParserService
+from services.resume_job_service import ResumeJobService
+from services.resume_pipeline_service import ResumePipelineService
 from services.resume_service import ResumeService
 from services.user_entity_service import UserEntityService
-from services.vector_store_service import VectorStoreService
-from settings import settings
+from services.vector_store_service import (
+    VectorStoreService,
+    get_vector_store_service,
+)
+from utils.pagination import InvalidCursor, to_ndjson
 
 router = APIRouter()
 
@@ -30,9 +44,41 @@ tag_files = Tag(
 )
 
 
-@router.get("/resume", response_model=list[dict])
-async def list_uploaded_resumes(resume_service: ResumeService = Depends()):
-    return await resume_service.list_resumes()
+@router.get("/resume", response_model=dict)
+async def list_uploaded_resumes(
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    resume_service: ResumeService = Depends(),
+):
+    """
+    List uploaded resumes, newest first.
+
+    ``next_cursor`` is ``null`` on the last page.
+    """
+    try:
+        resumes, next_cursor = await resume_service.list_resumes(
+            limit=limit, cursor=cursor
+        )
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        )
+
+    return {"resumes": resumes, "next_cursor": next_cursor}
+
+
+@router.get("/resume/export")
+async def export_resumes(
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+) -> StreamingResponse:
+    """Export all uploaded resumes as NDJSON."""
+
+    async def resumes():
+        async with session_factory() as session:
+            async for resume in ResumeService(session).stream_resumes():
+                yield resume
+
+    return StreamingResponse(to_ndjson(resumes()), media_type="application/x-ndjson")
 
 
 @router.post(
@@ -42,22 +88,10 @@ async def upload_resume(
     file: UploadFile = File(...), resume_service: ResumeService = Depends()
 ) -> JSONResponse:
     file_extension = Path(file.filename).suffix.lower().lstrip(".")
-    if file_extension not in settings.resume.allowed_extensions:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid file type. Only {', '.join(settings.resume.allowed_extensions)} allowed.",
-        )
-
-    file_content = await file.read()
-    file_size_mb = len(file_content) / (1024 * 1024)
-
-    if file_size_mb > settings.resume.max_file_size_mb:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File is too large. Maximum allowed size is {settings.resume.max_file_size_mb}MB.",
-        )
-
-    file_id, created = await resume_service.save_file(file_content, file_extension)
+    try:
+        file_id, created = await resume_service.save_upload(file, file_extension)
+    except (UnsupportedResume, ResumeTooLarge) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
     if created:
         await resume_service.save_file_metadata(
             file_id, Path(file.filename).stem, file_extension
@@ -92,45 +126,61 @@ async def delete_resume(
 @router.post("/resume/{file_id}/parse", response_model=dict)
 async def parse_resume(
     file_id: UUID5,
-    resume_service: ResumeService = Depends(),
-    resume_parser_service: ResumeParserService = Depends(),
-    ner_service: NERService = Depends(),
-    vector_store_service: VectorStoreService = Depends(),
+    bypass_cache: bool = False,
+    resume_pipeline_service: ResumePipelineService = Depends(),
 ):
-    file_path = await resume_service.get_file_path(file_id)
-    if not file_path or not file_path.exists():
+    try:
+        entities = await resume_pipeline_service.parse(
+            file_id, bypass_cache=bypass_cache
+        )
+    except ResumeFileNotFound:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Resume file not found."
         )
+    except ResumeExtractionTimeout:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Resume text extraction timed out.",
+        )
+
+    return {
+        "entities": entities.entities,
+    }
 
-    text = await resume_parser_service.parse_resume(file_path)
-    facts = await resume_parser_service.extract_facts(text)
 
-    await ner_service.store_facts(file_id, facts)
+@router.post(
+    "/resume/{file_id}/parse/jobs",
+    response_model=JobStatusResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def enqueue_resume_parsing(
+    file_id: UUID5,
+    resume_service: ResumeService = Depends(),
+    resume_job_service: ResumeJobService = Depends(),
+) -> JobStatusResponse:
+    file_path = await resume_service.get_file_path(file_id)
+    if not file_path or not file_path.exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Resume file not found."
+        )
 
-    await vector_store_service.refresh_document(
-        text=text, metadata={"resume_id": str(file_id), "type": "resume_text"}
-    )
+    return await resume_job_service.enqueue_parse(file_id)
 
-    entities = await ner_service.extract_entities(
-        file_id,
-        facts,
-        language="ru",
-    )
 
-    return {
-        "entities": entities.entities,
-    }
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(
+    job_id: str,
+    resume_job_service: ResumeJobService = Depends(),
+) -> JobStatusResponse:
+    return await resume_job_service.get_status(job_id)
 
 
 @router.get("/resume/{file_id}/entities", response_model=dict)
 async def parse_resume(
     file_id: UUID5,
-    resume_service: ResumeService = Depends(),
     ner_service: NERService = Depends(),
-    resume_parser_service: ResumeParserService = Depends(),
-    vector_store_service: VectorStoreService = Depends(),
     user_entity_service: UserEntityService = Depends(),
+    resume_pipeline_service: ResumePipelineService = Depends(),
 ):
     if entities := await ner_service.get_entities(file_id):
         selections = await user_entity_service.get_user_selections(file_id)
@@ -145,21 +195,17 @@ async def parse_resume(
 
         return {"entities": entities, "selected": selected_map}
 
-    file_path = await resume_service.get_file_path(file_id)
-    if not file_path or not file_path.exists():
+    try:
+        entities = await resume_pipeline_service.parse(file_id)
+    except ResumeFileNotFound:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Resume file not found"
+            status_code=status.HTTP_404_NOT_FOUND, detail="Resume file not found."
+        )
+    except ResumeExtractionTimeout:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Resume text extraction timed out.",
         )
-
-    text = await resume_parser_service.parse_resume(file_path)
-    facts = await resume_parser_service.extract_facts(text)
-
-    await ner_service.store_facts(file_id, facts)
-    await vector_store_service.refresh_document(
-        text=text, metadata={"resume_id": str(file_id), "type": "resume_text"}
-    )
-
-    entities = await ner_service.extract_entities(file_id, facts, language="ru")
 
     return {"entities": entities.entities, "selected": {}}
 
@@ -167,10 +213,20 @@ async def parse_resume(
 @router.get("/resume/{file_id}/context", response_model=dict)
 async def get_resume_context(
     file_id: UUID5,
-    vector_store_service: VectorStoreService = Depends(),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=500),
+    vector_store_service: VectorStoreService = Depends(get_vector_store_service),
 ):
-    documents = await vector_store_service.get_documents(str(file_id))
+    """
+    List stored chunks of the resume in document order.
+
+    ``next_offset`` is ``null`` on the last page.
+    """
+    documents, next_offset = await vector_store_service.get_documents(
+        str(file_id), offset=offset, limit=limit
+    )
 
     return {
         "chunks": [doc.page_content for doc in documents],
+        "next_offset": next_offset,
     }
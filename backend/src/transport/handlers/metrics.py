@@ -0,0 +1,28 @@
+from fastapi import APIRouter
+
+from integrations.cache_metrics import embedding_cache_metrics, llm_cache_metrics
+from integrations.db.metrics import pool_metrics
+from integrations.db.session import engine
+
+router = APIRouter()
+
+
+@router.get("/db-pool")
+async def get_db_pool_metrics():
+    """Database connection pool usage and checkout wait time."""
+
+    return {"data": pool_metrics.snapshot(engine.pool)}
+
+
+@router.get("/embedding-cache")
+async def get_embedding_cache_metrics():
+    """Embedding cache hits and misses since the process started."""
+
+    return {"data": embedding_cache_metrics.snapshot()}
+
+
+@router.get("/llm-cache")
+async def get_llm_cache_metrics():
+    """LLM result cache hits and misses since the process started."""
+
+    return {"data": llm_cache_metrics.snapshot()}
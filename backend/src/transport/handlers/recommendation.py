@@ -1,12 +1,19 @@
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Response
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import UUID5
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
-from schemas.recommendation import RecommendationRequest
+from integrations.db.session import get_session_factory
+from logger import logger
+from schemas.recommendation import LetterFormat, RecommendationRequest
 from services.recommendation_service import RecommendationService
 from services.letter_export_service import LetterExportService
+from services.letter_renderer import MEDIA_TYPES
+from utils.pagination import InvalidCursor, to_ndjson
+from utils.sse import format_sse_event
 
 router = APIRouter()
 
@@ -18,27 +25,95 @@ async def generate_recommendation(
     letter_service: LetterExportService = Depends(),
 ):
     letter_text = await recommendation_service.generate(request)
-    letter_id = await letter_service.create_file(letter_text)
-    await letter_service.save_file_metadata(
-        letter_id=letter_id,
+    letter_id = await letter_service.create_letter(
+        letter_text,
         resume_id=str(request.personalities.grantee.resume.file_id),
         filename=f"Recommendation Letter for {request.recommendation.type.value.capitalize()}",
-        file_extension="docx",
     )
 
     return {"letter_id": letter_id}
 
 
+@router.post("/stream")
+async def stream_recommendation(
+    request: RecommendationRequest,
+    recommendation_service: RecommendationService = Depends(),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+) -> StreamingResponse:
+    """
+    Generate a letter streaming its text as Server-Sent Events.
+
+    Emits ``delta`` events with text fragments, then a ``done`` event with the
+    ``letter_id`` and the ``text`` of the saved letter, or an ``error`` event.
+    Deltas are a preview: the ``done`` text replaces them, since the final
+    response may differ from the streamed partials.
+    """
+
+    context = await recommendation_service.assemble_context(request)
+
+    async def events():
+        try:
+            letter_stream = recommendation_service.stream_letter(context)
+            async for delta in letter_stream:
+                yield format_sse_event("delta", {"text": delta})
+
+            # Request-scoped sessions are closed before a streaming body runs.
+            async with session_factory() as session:
+                letter_service = LetterExportService(session=session)
+                letter_id = await letter_service.create_letter(
+                    letter_stream.text,
+                    resume_id=str(request.personalities.grantee.resume.file_id),
+                    filename=f"Recommendation Letter for {request.recommendation.type.value.capitalize()}",
+                )
+                await session.commit()
+        except Exception as exc:
+            logger.exception("Letter streaming failed.", error=str(exc))
+            yield format_sse_event("error", {"detail": "Letter generation failed."})
+            return
+
+        yield format_sse_event(
+            "done", {"letter_id": letter_id, "text": letter_stream.text}
+        )
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/letter/{file_id}")
 async def get_recommendation(
     file_id: UUID,
+    letter_format: LetterFormat = Query(default=LetterFormat.docx, alias="format"),
+    if_none_match: Optional[str] = Header(default=None),
     letter_service: LetterExportService = Depends(),
 ):
-    if file_path := await letter_service.get_file_path(str(file_id)):
+    """
+    Download the letter rendered as DOCX, PDF, Markdown or plain text.
+
+    Responses carry an ETag; a matching ``If-None-Match`` gets a 304 without
+    loading the letter text or rendering it. Missing letters get a 404.
+    """
+
+    etag = await letter_service.get_etag(str(file_id), letter_format)
+    if etag is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="File not found."
+        )
+
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match and etag in (
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if file_path := await letter_service.render(str(file_id), letter_format):
         return FileResponse(
             file_path,
-            filename=file_path.name,
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            filename=f"{file_id}.{letter_format.value}",
+            media_type=MEDIA_TYPES[letter_format],
+            headers=headers,
         )
 
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found.")
@@ -57,9 +132,40 @@ async def delete_letter(
 @router.get("/resume/{resume_id}/letters")
 async def list_generated_letters(
     resume_id: UUID5,
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: Optional[str] = None,
     letter_service: LetterExportService = Depends(),
 ):
     """
-    List all generated letters associated with the grantee resume.
+    List generated letters associated with the grantee resume, newest first.
+
+    ``next_cursor`` is ``null`` on the last page.
+    """
+    try:
+        letters, next_cursor = await letter_service.list_letters_by_resume(
+            resume_id, limit=limit, cursor=cursor
+        )
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        )
+
+    return {"letters": letters, "next_cursor": next_cursor}
+
+
+@router.get("/resume/{resume_id}/letters/export")
+async def export_generated_letters(
+    resume_id: UUID5,
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+) -> StreamingResponse:
+    """
+    Export all generated letters associated with the grantee resume as NDJSON.
     """
-    return {"letters": await letter_service.list_letters_by_resume(resume_id)}
+
+    async def letters():
+        async with session_factory() as session:
+            letter_service = LetterExportService(session=session)
+            async for letter in letter_service.stream_letters_by_resume(resume_id):
+                yield letter
+
+    return StreamingResponse(to_ndjson(letters()), media_type="application/x-ndjson")
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
 from pydantic import UUID5
 
 from services.entity_research_service import EntityResearchService
@@ -14,3 +16,19 @@ async def research_entities(
     """Research selected entities."""
 
     return {"data": await research_service.research_entities(resume_id=resume_id)}
+
+
+@router.get("/resume/{resume_id}")
+async def get_research(
+    resume_id: UUID5,
+    limit: Optional[int] = Query(default=None, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+    research_service: EntityResearchService = Depends(),
+):
+    """Retrieve researched entities."""
+
+    return {
+        "data": await research_service.get_research(
+            resume_id=resume_id, limit=limit, offset=offset
+        )
+    }
@@ -0,0 +1,71 @@
+import math
+import re
+from collections import Counter
+
+# Keeps technology names such as "c++", "c#", "node.js" and "ci/cd" whole.
+_TOKEN_PATTERN = re.compile(r"\w[\w+#./-]*[\w+#]|\w")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """Okapi BM25 ranking over a small in-memory corpus."""
+
+    def __init__(self, documents: list[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_frequencies = [Counter(tokenize(document)) for document in documents]
+        self.lengths = [sum(tf.values()) for tf in self.term_frequencies]
+        self.average_length = sum(self.lengths) / len(documents) if documents else 0.0
+
+        document_frequencies = Counter(
+            term for tf in self.term_frequencies for term in tf
+        )
+        total = len(documents)
+        self.idf = {
+            term: math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for term, df in document_frequencies.items()
+        }
+
+    def search(self, query: str, k: int) -> list[int]:
+        """
+        Indices of the ``k`` best matching documents, best first.
+
+        Documents sharing no term with the query are not returned.
+        """
+
+        terms = [term for term in set(tokenize(query)) if term in self.idf]
+        if not terms:
+            return []
+
+        scores = []
+        for idx, tf in enumerate(self.term_frequencies):
+            norm = self.k1 * (
+                1 - self.b + self.b * self.lengths[idx] / self.average_length
+            )
+            score = sum(
+                self.idf[term] * tf[term] * (self.k1 + 1) / (tf[term] + norm)
+                for term in terms
+                if term in tf
+            )
+            if score > 0:
+                scores.append((score, idx))
+
+        return [idx for _, idx in sorted(scores, key=lambda item: -item[0])[:k]]
+
+
+def reciprocal_rank_fusion(rankings: list[list[str]], k: int = 60) -> list[str]:
+    """
+    Fuse several rankings of the same items, best first.
+
+    Each item scores ``sum(1 / (k + rank))`` over the rankings it appears in.
+    """
+
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1 / (k + rank)
+
+    return sorted(scores, key=lambda item: -scores[item])
@@ -0,0 +1,52 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import AsyncIterator
+
+
+# Keys are compared to INTEGER primary keys, larger values can't be bound.
+_MAX_PRIMARY_KEY = 2**31 - 1
+
+
+class InvalidCursor(ValueError):
+    """The cursor wasn't produced by :func:`encode_cursor`."""
+
+
+def encode_cursor(created_at: datetime, primary_key: int) -> str:
+    """Encode a keyset position as an opaque URL-safe cursor."""
+
+    payload = json.dumps([created_at.isoformat(), primary_key]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor produced by :func:`encode_cursor`.
+
+    Tampered cursors are rejected as well when their values can't be
+    compared to the keyset columns, e.g. a timezone-aware timestamp or a key
+    out of the column range.
+
+    :raises InvalidCursor: The cursor is malformed
+    """
+
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        raw_created_at, raw_primary_key = json.loads(payload)
+        created_at = datetime.fromisoformat(raw_created_at)
+        primary_key = int(raw_primary_key)
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise InvalidCursor("Invalid cursor.") from exc
+
+    if created_at.tzinfo is not None or not 0 <= primary_key <= _MAX_PRIMARY_KEY:
+        raise InvalidCursor("Invalid cursor.")
+
+    return created_at, primary_key
+
+
+async def to_ndjson(items: AsyncIterator[dict]) -> AsyncIterator[str]:
+    """Serialize items as newline-delimited JSON."""
+
+    async for item in items:
+        yield json.dumps(item, ensure_ascii=False) + "\n"
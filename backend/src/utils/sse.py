@@ -0,0 +1,8 @@
+import json
+from typing import Any
+
+
+def format_sse_event(event: str, data: Any) -> str:
+    """Format a Server-Sent Events message with a JSON payload."""
+
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
@@ -0,0 +1,78 @@
+import math
+from functools import lru_cache
+from typing import Optional
+
+import tiktoken
+
+from logger import logger
+from settings import settings
+
+# Characters per token of English text, used when the encoding is unavailable.
+CHARS_PER_TOKEN = 4
+ELLIPSIS = "…"
+
+
+class Tokenizer:
+    """
+    Local token counter for prompt budgeting.
+
+    Uses the tiktoken encoding of the generation model. tiktoken downloads
+    encodings on first use, so when it can't be loaded (e.g. offline) token
+    counts fall back to the characters-per-token estimate.
+    """
+
+    def __init__(self, encoding_name: str) -> None:
+        self.encoding: Optional[tiktoken.Encoding] = None
+        try:
+            self.encoding = tiktoken.get_encoding(encoding_name)
+        # Unknown encodings raise ValueError or KeyError and corrupted
+        # downloads ValueError; failed downloads raise requests errors, which
+        # are OSErrors, as are cache directory errors.
+        except (ValueError, KeyError, OSError) as exc:
+            logger.warning(
+                "Tokenizer encoding unavailable, estimating token counts.",
+                encoding=encoding_name,
+                error=str(exc),
+            )
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.encoding is None:
+            return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Cut the text to at most ``max_tokens`` tokens, marking the cut.
+
+        Tokens of the ellipsis marking the cut count towards ``max_tokens``.
+        """
+
+        if self.count(text) <= max_tokens:
+            return text
+
+        keep = max_tokens - self.count(ELLIPSIS)
+        if keep <= 0:
+            return ""
+        if self.encoding is None:
+            truncated = text[: keep * CHARS_PER_TOKEN]
+            truncated = truncated.rsplit(" ", 1)[0] or truncated
+            return truncated.rstrip() + ELLIPSIS
+
+        tokens = self.encoding.encode(text, disallowed_special=())
+        while keep > 0:
+            # Tokens re-merge across the cut and a cut inside a character
+            # decodes to U+FFFD, so the result is counted again.
+            truncated = self.encoding.decode(tokens[:keep]).rstrip() + ELLIPSIS
+            if self.count(truncated) <= max_tokens:
+                return truncated
+            keep -= 1
+
+        return ""
+
+
+@lru_cache
+def get_tokenizer() -> Tokenizer:
+    return Tokenizer(settings.prompt_budget.encoding)
@@ -0,0 +1,7 @@
+"""
+Celery worker entry point.
+
+    celery -A worker worker --loglevel=INFO
+"""
+
+from integrations.celery_app import celery_app  # noqa: F401
@@ -4,5 +4,5 @@ import config from "../config.js";
 
 export async function listResumes() {
   const response = await axios.get(`${config.API_BASE_URL}/files/resume`);
-  return response.data;
+  return response.data.resumes;
 }
@@ -23,7 +23,7 @@ export default function LetterGenerationPage() {
 
     useEffect(() => {
         axios.get(`${config.API_BASE_URL}/files/resume`)
-            .then(res => setResumes(res.data))
+            .then(res => setResumes(res.data.resumes))
             .catch(err => console.error('Failed to fetch resumes', err));
     }, []);
 
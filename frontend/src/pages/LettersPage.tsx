@@ -40,7 +40,7 @@ export default function LettersPage() {
     useEffect(() => {
         axios.get(`${config.API_BASE_URL}/files/resume`)
             .then(res => {
-                const resumeList = res.data;
+                const resumeList = res.data.resumes;
                 setResumes(resumeList);
 
                 const resumeId = searchParams.get('resume');
@@ -35,7 +35,7 @@ export default function ResumesPage() {
         const fetchResumes = async () => {
             try {
                 const response = await axios.get(`${config.API_BASE_URL}/files/resume`);
-                setResumes(response.data);
+                setResumes(response.data.resumes);
             } catch (err) {
                 setError('Failed to load resumes');
             } finally {